@@ -12,7 +12,7 @@ from PyQt6 import QtCore, QtGui, QtWidgets
 class Ui_InputDialog(object):
     def setupUi(self, InputDialog):
         InputDialog.setObjectName("InputDialog")
-        InputDialog.resize(415, 297)
+        InputDialog.resize(415, 417)
         self.gridLayout = QtWidgets.QGridLayout(InputDialog)
         self.gridLayout.setObjectName("gridLayout")
         self.horizontalLayout_3 = QtWidgets.QHBoxLayout()
@@ -59,9 +59,15 @@ class Ui_InputDialog(object):
         self.patternEdit = QtWidgets.QLineEdit(parent=InputDialog)
         self.patternEdit.setObjectName("patternEdit")
         self.formLayout.setWidget(2, QtWidgets.QFormLayout.ItemRole.FieldRole, self.patternEdit)
+        self.exclude_lable = QtWidgets.QLabel(parent=InputDialog)
+        self.exclude_lable.setObjectName("exclude_lable")
+        self.formLayout.setWidget(3, QtWidgets.QFormLayout.ItemRole.LabelRole, self.exclude_lable)
+        self.excludeEdit = QtWidgets.QLineEdit(parent=InputDialog)
+        self.excludeEdit.setObjectName("excludeEdit")
+        self.formLayout.setWidget(3, QtWidgets.QFormLayout.ItemRole.FieldRole, self.excludeEdit)
         self.path_lable_3 = QtWidgets.QLabel(parent=InputDialog)
         self.path_lable_3.setObjectName("path_lable_3")
-        self.formLayout.setWidget(3, QtWidgets.QFormLayout.ItemRole.LabelRole, self.path_lable_3)
+        self.formLayout.setWidget(4, QtWidgets.QFormLayout.ItemRole.LabelRole, self.path_lable_3)
         self.widget_2 = QtWidgets.QWidget(parent=InputDialog)
         self.widget_2.setObjectName("widget_2")
         self.yes_recursiveRadioButton = QtWidgets.QRadioButton(parent=self.widget_2)
@@ -72,37 +78,96 @@ class Ui_InputDialog(object):
         self.no_recursiveRadioButton.setCheckable(True)
         self.no_recursiveRadioButton.setChecked(True)
         self.no_recursiveRadioButton.setObjectName("no_recursiveRadioButton")
-        self.formLayout.setWidget(3, QtWidgets.QFormLayout.ItemRole.FieldRole, self.widget_2)
+        self.formLayout.setWidget(4, QtWidgets.QFormLayout.ItemRole.FieldRole, self.widget_2)
         self.path_lable_4 = QtWidgets.QLabel(parent=InputDialog)
         self.path_lable_4.setObjectName("path_lable_4")
-        self.formLayout.setWidget(4, QtWidgets.QFormLayout.ItemRole.LabelRole, self.path_lable_4)
+        self.formLayout.setWidget(5, QtWidgets.QFormLayout.ItemRole.LabelRole, self.path_lable_4)
         self.day_spinBox = QtWidgets.QSpinBox(parent=InputDialog)
         self.day_spinBox.setMaximum(1000)
         self.day_spinBox.setSingleStep(30)
         self.day_spinBox.setObjectName("day_spinBox")
-        self.formLayout.setWidget(4, QtWidgets.QFormLayout.ItemRole.FieldRole, self.day_spinBox)
+        self.formLayout.setWidget(5, QtWidgets.QFormLayout.ItemRole.FieldRole, self.day_spinBox)
         self.path_lable_5 = QtWidgets.QLabel(parent=InputDialog)
         self.path_lable_5.setObjectName("path_lable_5")
-        self.formLayout.setWidget(5, QtWidgets.QFormLayout.ItemRole.LabelRole, self.path_lable_5)
+        self.formLayout.setWidget(6, QtWidgets.QFormLayout.ItemRole.LabelRole, self.path_lable_5)
         self.size_spinBox = QtWidgets.QSpinBox(parent=InputDialog)
         self.size_spinBox.setMaximum(999999999)
         self.size_spinBox.setSingleStep(100)
         self.size_spinBox.setObjectName("size_spinBox")
-        self.formLayout.setWidget(5, QtWidgets.QFormLayout.ItemRole.FieldRole, self.size_spinBox)
+        self.formLayout.setWidget(6, QtWidgets.QFormLayout.ItemRole.FieldRole, self.size_spinBox)
         self.path_lable_6 = QtWidgets.QLabel(parent=InputDialog)
         self.path_lable_6.setObjectName("path_lable_6")
-        self.formLayout.setWidget(6, QtWidgets.QFormLayout.ItemRole.LabelRole, self.path_lable_6)
+        self.formLayout.setWidget(7, QtWidgets.QFormLayout.ItemRole.LabelRole, self.path_lable_6)
+        self.number_horizontalLayout = QtWidgets.QHBoxLayout()
+        self.number_horizontalLayout.setObjectName("number_horizontalLayout")
         self.number_spinBox = QtWidgets.QSpinBox(parent=InputDialog)
         self.number_spinBox.setMaximum(1000)
         self.number_spinBox.setSingleStep(10)
         self.number_spinBox.setObjectName("number_spinBox")
-        self.formLayout.setWidget(6, QtWidgets.QFormLayout.ItemRole.FieldRole, self.number_spinBox)
+        self.number_horizontalLayout.addWidget(self.number_spinBox)
+        self.number_perDirCheckBox = QtWidgets.QCheckBox(parent=InputDialog)
+        self.number_perDirCheckBox.setObjectName("number_perDirCheckBox")
+        self.number_horizontalLayout.addWidget(self.number_perDirCheckBox)
+        self.formLayout.setLayout(7, QtWidgets.QFormLayout.ItemRole.FieldRole, self.number_horizontalLayout)
+        self.quota_label = QtWidgets.QLabel(parent=InputDialog)
+        self.quota_label.setObjectName("quota_label")
+        self.formLayout.setWidget(8, QtWidgets.QFormLayout.ItemRole.LabelRole, self.quota_label)
+        self.quota_horizontalLayout = QtWidgets.QHBoxLayout()
+        self.quota_horizontalLayout.setObjectName("quota_horizontalLayout")
+        self.quota_spinBox = QtWidgets.QSpinBox(parent=InputDialog)
+        self.quota_spinBox.setMaximum(999999999)
+        self.quota_spinBox.setSingleStep(1024)
+        self.quota_spinBox.setObjectName("quota_spinBox")
+        self.quota_horizontalLayout.addWidget(self.quota_spinBox)
+        self.free_spinBox = QtWidgets.QSpinBox(parent=InputDialog)
+        self.free_spinBox.setMaximum(999999999)
+        self.free_spinBox.setSingleStep(1024)
+        self.free_spinBox.setObjectName("free_spinBox")
+        self.quota_horizontalLayout.addWidget(self.free_spinBox)
+        self.formLayout.setLayout(8, QtWidgets.QFormLayout.ItemRole.FieldRole, self.quota_horizontalLayout)
+        self.throttle_label = QtWidgets.QLabel(parent=InputDialog)
+        self.throttle_label.setObjectName("throttle_label")
+        self.formLayout.setWidget(9, QtWidgets.QFormLayout.ItemRole.LabelRole, self.throttle_label)
+        self.throttle_horizontalLayout = QtWidgets.QHBoxLayout()
+        self.throttle_horizontalLayout.setObjectName("throttle_horizontalLayout")
+        self.maxOps_spinBox = QtWidgets.QSpinBox(parent=InputDialog)
+        self.maxOps_spinBox.setMaximum(1000000)
+        self.maxOps_spinBox.setSingleStep(100)
+        self.maxOps_spinBox.setObjectName("maxOps_spinBox")
+        self.throttle_horizontalLayout.addWidget(self.maxOps_spinBox)
+        self.maxBytes_spinBox = QtWidgets.QSpinBox(parent=InputDialog)
+        self.maxBytes_spinBox.setMaximum(999999)
+        self.maxBytes_spinBox.setSingleStep(100)
+        self.maxBytes_spinBox.setObjectName("maxBytes_spinBox")
+        self.throttle_horizontalLayout.addWidget(self.maxBytes_spinBox)
+        self.formLayout.setLayout(9, QtWidgets.QFormLayout.ItemRole.FieldRole, self.throttle_horizontalLayout)
         self.path_lable_7 = QtWidgets.QLabel(parent=InputDialog)
         self.path_lable_7.setObjectName("path_lable_7")
-        self.formLayout.setWidget(7, QtWidgets.QFormLayout.ItemRole.LabelRole, self.path_lable_7)
+        self.formLayout.setWidget(10, QtWidgets.QFormLayout.ItemRole.LabelRole, self.path_lable_7)
         self.timeEdit = QtWidgets.QLineEdit(parent=InputDialog)
         self.timeEdit.setObjectName("timeEdit")
-        self.formLayout.setWidget(7, QtWidgets.QFormLayout.ItemRole.FieldRole, self.timeEdit)
+        self.formLayout.setWidget(10, QtWidgets.QFormLayout.ItemRole.FieldRole, self.timeEdit)
+        self.path_lable_8 = QtWidgets.QLabel(parent=InputDialog)
+        self.path_lable_8.setObjectName("path_lable_8")
+        self.formLayout.setWidget(11, QtWidgets.QFormLayout.ItemRole.LabelRole, self.path_lable_8)
+        self.option_horizontalLayout = QtWidgets.QHBoxLayout()
+        self.option_horizontalLayout.setObjectName("option_horizontalLayout")
+        self.emptyDirCheckBox = QtWidgets.QCheckBox(parent=InputDialog)
+        self.emptyDirCheckBox.setObjectName("emptyDirCheckBox")
+        self.option_horizontalLayout.addWidget(self.emptyDirCheckBox)
+        self.incrementalCheckBox = QtWidgets.QCheckBox(parent=InputDialog)
+        self.incrementalCheckBox.setObjectName("incrementalCheckBox")
+        self.option_horizontalLayout.addWidget(self.incrementalCheckBox)
+        self.watchCheckBox = QtWidgets.QCheckBox(parent=InputDialog)
+        self.watchCheckBox.setObjectName("watchCheckBox")
+        self.option_horizontalLayout.addWidget(self.watchCheckBox)
+        self.idleIoCheckBox = QtWidgets.QCheckBox(parent=InputDialog)
+        self.idleIoCheckBox.setObjectName("idleIoCheckBox")
+        self.option_horizontalLayout.addWidget(self.idleIoCheckBox)
+        self.fastDeleteCheckBox = QtWidgets.QCheckBox(parent=InputDialog)
+        self.fastDeleteCheckBox.setObjectName("fastDeleteCheckBox")
+        self.option_horizontalLayout.addWidget(self.fastDeleteCheckBox)
+        self.formLayout.setLayout(11, QtWidgets.QFormLayout.ItemRole.FieldRole, self.option_horizontalLayout)
         self.gridLayout.addLayout(self.formLayout, 0, 0, 2, 1)
 
         self.retranslateUi(InputDialog)
@@ -117,7 +182,10 @@ class Ui_InputDialog(object):
         self.path_lable.setText(_translate("InputDialog", "目录路径(必填):"))
         self.fileSelectButton.setText(_translate("InputDialog", "..."))
         self.path_lable_2.setText(_translate("InputDialog", "文件类型(必填):"))
+        self.patternEdit.setToolTip(_translate("InputDialog", "多个规则用;分隔，例如 *.log;*.tmp"))
         self.patternEdit.setText(_translate("InputDialog", "*"))
+        self.exclude_lable.setText(_translate("InputDialog", "排除类型(可选):"))
+        self.excludeEdit.setToolTip(_translate("InputDialog", "多个规则用;分隔，匹配的文件不删除，匹配的目录不再进入"))
         self.path_lable_3.setText(_translate("InputDialog", "递归子目录(必选):"))
         self.yes_recursiveRadioButton.setText(_translate("InputDialog", "是"))
         self.no_recursiveRadioButton.setText(_translate("InputDialog", "否"))
@@ -127,8 +195,31 @@ class Ui_InputDialog(object):
         self.size_spinBox.setSuffix(_translate("InputDialog", "M"))
         self.path_lable_6.setText(_translate("InputDialog", "保留数量(可选):"))
         self.number_spinBox.setSuffix(_translate("InputDialog", "个"))
+        self.number_perDirCheckBox.setText(_translate("InputDialog", "按目录分别保留"))
+        self.quota_label.setText(_translate("InputDialog", "空间配额(可选):"))
+        self.quota_spinBox.setToolTip(_translate("InputDialog", "匹配文件的总大小超过配额时，从最旧的文件开始删除；设置后不再使用天数、大小和数量条件"))
+        self.quota_spinBox.setSuffix(_translate("InputDialog", "M"))
+        self.free_spinBox.setToolTip(_translate("InputDialog", "磁盘剩余空间小于该值时，从最旧的文件开始删除"))
+        self.free_spinBox.setPrefix(_translate("InputDialog", "剩余空间 "))
+        self.free_spinBox.setSuffix(_translate("InputDialog", "M"))
+        self.throttle_label.setText(_translate("InputDialog", "删除限速(可选):"))
+        self.maxOps_spinBox.setToolTip(_translate("InputDialog", "每秒最多删除的文件数，0为不限制"))
+        self.maxOps_spinBox.setSuffix(_translate("InputDialog", "个/秒"))
+        self.maxBytes_spinBox.setToolTip(_translate("InputDialog", "每秒最多释放的空间，0为不限制"))
+        self.maxBytes_spinBox.setSuffix(_translate("InputDialog", "M/秒"))
         self.path_lable_7.setText(_translate("InputDialog", "定时参数(可选):"))
         self.timeEdit.setText(_translate("InputDialog", "0 0 0 * * *"))
+        self.path_lable_8.setText(_translate("InputDialog", "其他选项(可选):"))
+        self.emptyDirCheckBox.setToolTip(_translate("InputDialog", "删除匹配到的空目录，以及删除文件后变为空的上级目录"))
+        self.emptyDirCheckBox.setText(_translate("InputDialog", "删除空目录"))
+        self.incrementalCheckBox.setToolTip(_translate("InputDialog", "使用元数据索引，只重新扫描有变化的目录"))
+        self.incrementalCheckBox.setText(_translate("InputDialog", "增量扫描"))
+        self.watchCheckBox.setToolTip(_translate("InputDialog", "定时任务运行期间监听目录变化，触发时直接删除，不再扫描"))
+        self.watchCheckBox.setText(_translate("InputDialog", "实时监听"))
+        self.idleIoCheckBox.setToolTip(_translate("InputDialog", "扫描和删除使用最低的磁盘IO优先级(Linux为idle调度类，Windows为后台模式)，减少对同一磁盘上其他程序的影响"))
+        self.idleIoCheckBox.setText(_translate("InputDialog", "低IO优先级"))
+        self.fastDeleteCheckBox.setToolTip(_translate("InputDialog", "匹配的目录整个移动到同一磁盘上的回收目录，任务立即完成，由后台线程清理；目录按修改时间计算天数和保留数量，不能同时使用大小和空间配额"))
+        self.fastDeleteCheckBox.setText(_translate("InputDialog", "快速删除目录"))
 
 
 if __name__ == "__main__":
@@ -86,6 +86,10 @@ class Ui_MainWindow(object):
         self.fmdtButton.setMinimumSize(QtCore.QSize(60, 30))
         self.fmdtButton.setObjectName("fmdtButton")
         self.task_horizontalLayout2.addWidget(self.fmdtButton)
+        self.profileButton = QtWidgets.QToolButton(parent=self.tab)
+        self.profileButton.setMinimumSize(QtCore.QSize(60, 30))
+        self.profileButton.setObjectName("profileButton")
+        self.task_horizontalLayout2.addWidget(self.profileButton)
         self.startTaskButton = QtWidgets.QToolButton(parent=self.tab)
         self.startTaskButton.setMinimumSize(QtCore.QSize(60, 30))
         self.startTaskButton.setObjectName("startTaskButton")
@@ -136,6 +140,76 @@ class Ui_MainWindow(object):
         self.sched_table.setHorizontalHeaderItem(3, item)
         self.gridLayout_4.addWidget(self.sched_table, 1, 0, 1, 1)
         self.tabWidget.addTab(self.schedule_tag, "")
+        self.history_tag = QtWidgets.QWidget()
+        self.history_tag.setObjectName("history_tag")
+        self.gridLayout_5 = QtWidgets.QGridLayout(self.history_tag)
+        self.gridLayout_5.setObjectName("gridLayout_5")
+        self.history_horizontalLayout = QtWidgets.QHBoxLayout()
+        self.history_horizontalLayout.setObjectName("history_horizontalLayout")
+        self.history_refreshButton = QtWidgets.QToolButton(parent=self.history_tag)
+        self.history_refreshButton.setMinimumSize(QtCore.QSize(60, 30))
+        self.history_refreshButton.setObjectName("history_refreshButton")
+        self.history_horizontalLayout.addWidget(self.history_refreshButton)
+        self.history_allButton = QtWidgets.QToolButton(parent=self.history_tag)
+        self.history_allButton.setMinimumSize(QtCore.QSize(60, 30))
+        self.history_allButton.setObjectName("history_allButton")
+        self.history_horizontalLayout.addWidget(self.history_allButton)
+        self.gridLayout_5.addLayout(self.history_horizontalLayout, 0, 0, 1, 1)
+        self.history_summaryTable = QtWidgets.QTableWidget(parent=self.history_tag)
+        self.history_summaryTable.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.history_summaryTable.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
+        self.history_summaryTable.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.history_summaryTable.setObjectName("history_summaryTable")
+        self.history_summaryTable.setColumnCount(9)
+        self.history_summaryTable.setRowCount(0)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_summaryTable.setHorizontalHeaderItem(0, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_summaryTable.setHorizontalHeaderItem(1, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_summaryTable.setHorizontalHeaderItem(2, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_summaryTable.setHorizontalHeaderItem(3, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_summaryTable.setHorizontalHeaderItem(4, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_summaryTable.setHorizontalHeaderItem(5, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_summaryTable.setHorizontalHeaderItem(6, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_summaryTable.setHorizontalHeaderItem(7, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_summaryTable.setHorizontalHeaderItem(8, item)
+        self.gridLayout_5.addWidget(self.history_summaryTable, 1, 0, 1, 1)
+        self.history_table = QtWidgets.QTableWidget(parent=self.history_tag)
+        self.history_table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.history_table.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
+        self.history_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.history_table.setObjectName("history_table")
+        self.history_table.setColumnCount(10)
+        self.history_table.setRowCount(0)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_table.setHorizontalHeaderItem(0, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_table.setHorizontalHeaderItem(1, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_table.setHorizontalHeaderItem(2, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_table.setHorizontalHeaderItem(3, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_table.setHorizontalHeaderItem(4, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_table.setHorizontalHeaderItem(5, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_table.setHorizontalHeaderItem(6, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_table.setHorizontalHeaderItem(7, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_table.setHorizontalHeaderItem(8, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.history_table.setHorizontalHeaderItem(9, item)
+        self.gridLayout_5.addWidget(self.history_table, 2, 0, 1, 1)
+        self.tabWidget.addTab(self.history_tag, "")
         self.tab_2 = QtWidgets.QWidget()
         self.tab_2.setObjectName("tab_2")
         self.gridLayout_3 = QtWidgets.QGridLayout(self.tab_2)
@@ -186,6 +260,7 @@ class Ui_MainWindow(object):
         self.delButton.setText(_translate("MainWindow", "删 除"))
         self.fmdButton.setText(_translate("MainWindow", "手动删除"))
         self.fmdtButton.setText(_translate("MainWindow", "手动删除测试"))
+        self.profileButton.setText(_translate("MainWindow", "性能分析"))
         self.startTaskButton.setText(_translate("MainWindow", "定时删除"))
         self.autoStartCheckBox.setText(_translate("MainWindow", "开机启动"))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab), _translate("MainWindow", "任务列表"))
@@ -202,6 +277,47 @@ class Ui_MainWindow(object):
         item = self.sched_table.horizontalHeaderItem(3)
         item.setText(_translate("MainWindow", "下次运行时间"))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.schedule_tag), _translate("MainWindow", "任务定时"))
+        self.history_refreshButton.setText(_translate("MainWindow", "刷 新"))
+        self.history_allButton.setText(_translate("MainWindow", "全部记录"))
+        item = self.history_summaryTable.horizontalHeaderItem(0)
+        item.setText(_translate("MainWindow", "任务名称"))
+        item = self.history_summaryTable.horizontalHeaderItem(1)
+        item.setText(_translate("MainWindow", "运行次数"))
+        item = self.history_summaryTable.horizontalHeaderItem(2)
+        item.setText(_translate("MainWindow", "平均耗时(秒)"))
+        item = self.history_summaryTable.horizontalHeaderItem(3)
+        item.setText(_translate("MainWindow", "最近耗时(秒)"))
+        item = self.history_summaryTable.horizontalHeaderItem(4)
+        item.setText(_translate("MainWindow", "删除文件数"))
+        item = self.history_summaryTable.horizontalHeaderItem(5)
+        item.setText(_translate("MainWindow", "删除目录数"))
+        item = self.history_summaryTable.horizontalHeaderItem(6)
+        item.setText(_translate("MainWindow", "释放空间"))
+        item = self.history_summaryTable.horizontalHeaderItem(7)
+        item.setText(_translate("MainWindow", "错误数"))
+        item = self.history_summaryTable.horizontalHeaderItem(8)
+        item.setText(_translate("MainWindow", "最近运行时间"))
+        item = self.history_table.horizontalHeaderItem(0)
+        item.setText(_translate("MainWindow", "任务名称"))
+        item = self.history_table.horizontalHeaderItem(1)
+        item.setText(_translate("MainWindow", "触发方式"))
+        item = self.history_table.horizontalHeaderItem(2)
+        item.setText(_translate("MainWindow", "开始时间"))
+        item = self.history_table.horizontalHeaderItem(3)
+        item.setText(_translate("MainWindow", "耗时(秒)"))
+        item = self.history_table.horizontalHeaderItem(4)
+        item.setText(_translate("MainWindow", "扫描数"))
+        item = self.history_table.horizontalHeaderItem(5)
+        item.setText(_translate("MainWindow", "删除文件数"))
+        item = self.history_table.horizontalHeaderItem(6)
+        item.setText(_translate("MainWindow", "删除目录数"))
+        item = self.history_table.horizontalHeaderItem(7)
+        item.setText(_translate("MainWindow", "释放空间"))
+        item = self.history_table.horizontalHeaderItem(8)
+        item.setText(_translate("MainWindow", "错误数"))
+        item = self.history_table.horizontalHeaderItem(9)
+        item.setText(_translate("MainWindow", "备注"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.history_tag), _translate("MainWindow", "运行记录"))
         self.log_clearButton.setText(_translate("MainWindow", "清理日志"))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_2), _translate("MainWindow", "任务日志"))
 
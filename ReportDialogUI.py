@@ -0,0 +1,84 @@
+# Form implementation generated from reading ui file '.\ui\ReportDialog.ui'
+#
+# Created by: PyQt6 UI code generator 6.4.2
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic6 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+
+class Ui_ReportDialog(object):
+    def setupUi(self, ReportDialog):
+        ReportDialog.setObjectName("ReportDialog")
+        ReportDialog.resize(760, 520)
+        self.gridLayout = QtWidgets.QGridLayout(ReportDialog)
+        self.gridLayout.setObjectName("gridLayout")
+        self.summaryLabel = QtWidgets.QLabel(parent=ReportDialog)
+        self.summaryLabel.setText("")
+        self.summaryLabel.setWordWrap(True)
+        self.summaryLabel.setObjectName("summaryLabel")
+        self.gridLayout.addWidget(self.summaryLabel, 0, 0, 1, 1)
+        self.reportTable = QtWidgets.QTableWidget(parent=ReportDialog)
+        self.reportTable.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.reportTable.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.reportTable.setObjectName("reportTable")
+        self.reportTable.setColumnCount(5)
+        self.reportTable.setRowCount(0)
+        item = QtWidgets.QTableWidgetItem()
+        self.reportTable.setHorizontalHeaderItem(0, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.reportTable.setHorizontalHeaderItem(1, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.reportTable.setHorizontalHeaderItem(2, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.reportTable.setHorizontalHeaderItem(3, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.reportTable.setHorizontalHeaderItem(4, item)
+        self.reportTable.verticalHeader().setVisible(False)
+        self.gridLayout.addWidget(self.reportTable, 1, 0, 1, 1)
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.widget = QtWidgets.QWidget(parent=ReportDialog)
+        self.widget.setObjectName("widget")
+        self.horizontalLayout.addWidget(self.widget)
+        self.exportButton = QtWidgets.QPushButton(parent=ReportDialog)
+        self.exportButton.setObjectName("exportButton")
+        self.horizontalLayout.addWidget(self.exportButton)
+        self.closeButton = QtWidgets.QPushButton(parent=ReportDialog)
+        self.closeButton.setObjectName("closeButton")
+        self.horizontalLayout.addWidget(self.closeButton)
+        self.horizontalLayout.setStretch(0, 6)
+        self.horizontalLayout.setStretch(1, 2)
+        self.horizontalLayout.setStretch(2, 2)
+        self.gridLayout.addLayout(self.horizontalLayout, 2, 0, 1, 1)
+
+        self.retranslateUi(ReportDialog)
+        QtCore.QMetaObject.connectSlotsByName(ReportDialog)
+
+    def retranslateUi(self, ReportDialog):
+        _translate = QtCore.QCoreApplication.translate
+        ReportDialog.setWindowTitle(_translate("ReportDialog", "测试报告"))
+        item = self.reportTable.horizontalHeaderItem(0)
+        item.setText(_translate("ReportDialog", "分类"))
+        item = self.reportTable.horizontalHeaderItem(1)
+        item.setText(_translate("ReportDialog", "名称"))
+        item = self.reportTable.horizontalHeaderItem(2)
+        item.setText(_translate("ReportDialog", "文件数"))
+        item = self.reportTable.horizontalHeaderItem(3)
+        item.setText(_translate("ReportDialog", "大小"))
+        item = self.reportTable.horizontalHeaderItem(4)
+        item.setText(_translate("ReportDialog", "修改时间"))
+        self.exportButton.setText(_translate("ReportDialog", "导 出"))
+        self.closeButton.setText(_translate("ReportDialog", "关 闭"))
+
+
+if __name__ == "__main__":
+    import sys
+    app = QtWidgets.QApplication(sys.argv)
+    ReportDialog = QtWidgets.QDialog()
+    ui = Ui_ReportDialog()
+    ui.setupUi(ReportDialog)
+    ReportDialog.show()
+    sys.exit(app.exec())
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""文件删除性能测试
+
+生成可复现的测试目录树，分别以测试模式和真实删除模式运行各个删除接口，输出每秒处理文件数、系统调用次数和峰值内存
+
+例如：
+
+    python benchmark.py --files 100000 --depth 3 --fanout 8
+    python benchmark.py --modes delete_files delete_files_number --days 30 --number 10 --recursive
+    python benchmark.py --startup
+"""
+
+import os
+import sys
+import time
+import json
+import random
+import shutil
+import logging
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+
+from file_delete import FileDelete
+
+MODES = ("delete_files", "delete_files_number", "get_days_files")
+# 只读取文件信息、不删除的接口，只运行一次
+READ_ONLY_MODES = ("get_days_files",)
+# 冷启动测试导入的模块，以及这些模块不应加载的依赖
+STARTUP_MODULES = ("file_delete", "task_manage", "cli")
+HEAVY_MODULES = ("PyQt6", "apscheduler", "win32com", "sqlite3", "resource_rc")
+# 冷启动耗时上限(毫秒)，tests/test_startup.py使用同一个值
+STARTUP_BUDGET_MS = 100
+
+
+def make_tree(root: str, files: int, depth: int=2, fanout: int=4, seed: int=0,
+              max_days: int=60, mtime_dist: str="uniform", max_size: int=0, size_dist: str="zero") -> list:
+    """生成测试目录树
+
+    Args:
+        root (str): 生成的目录
+        files (int): 文件数量
+        depth (int, optional): 子目录层数. Defaults to 2.
+        fanout (int, optional): 每个目录的子目录数. Defaults to 4.
+        seed (int, optional): 随机数种子，相同参数生成相同的目录树. Defaults to 0.
+        max_days (int, optional): 文件修改时间的最大天数. Defaults to 60.
+        mtime_dist (str, optional): 修改时间分布，uniform或exp. Defaults to "uniform".
+        max_size (int, optional): 文件最大字节数，使用稀疏文件不占用磁盘. Defaults to 0.
+        size_dist (str, optional): 大小分布，zero、uniform或lognormal. Defaults to "zero".
+
+    Returns:
+        list: 生成的文件路径
+    """
+    rng = random.Random(seed)
+    dirs = [root]
+    level = [root]
+    for _ in range(depth):
+        next_level = []
+        for parent in level:
+            for index in range(fanout):
+                next_level.append(os.path.join(parent, f"d{index}"))
+        dirs.extend(next_level)
+        level = next_level
+    for dir_path in dirs:
+        os.makedirs(dir_path, exist_ok=True)
+
+    now = time.time()
+    paths = []
+    for index in range(files):
+        dir_path = dirs[rng.randrange(len(dirs))]
+        ext = rng.choice((".log", ".log", ".tmp", ".bak"))
+        path = os.path.join(dir_path, f"f{index}{ext}")
+        if mtime_dist == "exp":
+            age = min(rng.expovariate(3.0 / max_days), max_days)
+        else:
+            age = rng.uniform(0, max_days)
+        if size_dist == "uniform":
+            size = rng.randint(0, max_size)
+        elif size_dist == "lognormal":
+            size = min(int(rng.lognormvariate(10, 2)), max_size)
+        else:
+            size = 0
+        with open(path, "wb") as f:
+            if size:
+                f.truncate(size)
+        mtime = now - age * 86400
+        os.utime(path, (mtime, mtime))
+        paths.append(path)
+    return paths
+
+
+class SyscallCounter():
+    """统计os模块中文件相关调用的次数，包括DirEntry.stat()"""
+    NAMES = ("stat", "lstat", "scandir", "listdir", "remove", "rmdir")
+
+    def __init__(self) -> None:
+        self.counts = dict.fromkeys(self.NAMES + ("entry_stat",), 0)
+        self.originals = {}
+
+    def __enter__(self):
+        for name in self.NAMES:
+            original = getattr(os, name)
+            self.originals[name] = original
+            setattr(os, name, self._wrap(name, original))
+        return self
+
+    def __exit__(self, *args):
+        for name, original in self.originals.items():
+            setattr(os, name, original)
+
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def _wrap(self, name, original):
+        counts = self.counts
+        if name == "scandir":
+            def scandir(*args, **kwargs):
+                counts["scandir"] += 1
+                return _CountingScandir(original(*args, **kwargs), counts)
+            return scandir
+
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            return original(*args, **kwargs)
+        return wrapper
+
+
+class _CountingEntry():
+    __slots__ = ("_entry", "_counts", "name", "path")
+
+    def __init__(self, entry, counts) -> None:
+        self._entry = entry
+        self._counts = counts
+        self.name = entry.name
+        self.path = entry.path
+
+    def is_dir(self, **kwargs):
+        return self._entry.is_dir(**kwargs)
+
+    def is_file(self, **kwargs):
+        return self._entry.is_file(**kwargs)
+
+    def stat(self, **kwargs):
+        self._counts["entry_stat"] += 1
+        return self._entry.stat(**kwargs)
+
+
+class _CountingScandir():
+    def __init__(self, it, counts) -> None:
+        self.it = it
+        self.counts = counts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.it.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return _CountingEntry(next(self.it), self.counts)
+
+    def close(self):
+        self.it.close()
+
+
+def run_mode(mode: str, root: str, args, test: bool) -> tuple:
+    """运行一次，返回(扫描的条目数, 匹配数)"""
+    file_delete = FileDelete()
+    if mode == "delete_files":
+        result = file_delete.delete_files(root, args.pattern, args.recursive, args.days, args.size,
+                                          args.empty_dir, test, args.workers, args.delete_workers)
+        return result.scanned, result.matched
+    if mode == "delete_files_number":
+        result = file_delete.delete_files_number(root, args.pattern, args.number, args.days, test,
+                                                 args.delete_workers, recursive=args.recursive,
+                                                 workers=args.workers)
+        return result.scanned, result.matched
+    # get_days_files需要文件列表，与其他接口一样取整个目录树中的文件
+    files = [os.path.join(dir_path, name) for dir_path, _, names in os.walk(root) for name in names]
+    return len(files), len(file_delete.get_days_files(files, args.days or 0))
+
+
+def bench(mode: str, args, test: bool) -> dict:
+    """运行一次计时，再运行一次统计系统调用和峰值内存；真实删除模式每次运行前重新生成目录树"""
+    tree_args = (args.files, args.depth, args.fanout, args.seed, args.max_days,
+                 args.mtime_dist, args.max_size, args.size_dist)
+    root = os.path.join(args.dir, "tree")
+    if os.path.exists(root):
+        shutil.rmtree(root)
+    make_tree(root, *tree_args)
+
+    start = time.perf_counter()
+    scanned, matched = run_mode(mode, root, args, test)
+    elapsed = time.perf_counter() - start
+
+    if not test:
+        shutil.rmtree(root)
+        make_tree(root, *tree_args)
+    with SyscallCounter() as counter:
+        tracemalloc.start()
+        run_mode(mode, root, args, test)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    shutil.rmtree(root)
+    return {
+        "mode": mode,
+        "test": test,
+        "files": args.files,
+        "scanned": scanned,
+        "matched": matched,
+        "seconds": round(elapsed, 4),
+        "files_per_sec": round(scanned / elapsed) if elapsed else 0,
+        "syscalls": counter.total(),
+        "syscall_detail": {name: count for name, count in counter.counts.items() if count},
+        "peak_kb": round(peak / 1024),
+    }
+
+
+def bench_startup(module: str, repeat: int=5) -> dict:
+    """在新的解释器进程中导入模块，取多次运行中最短的进程耗时，并检查导入的模块"""
+    code = (f"import sys; import {module}; "
+            f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))")
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    heavy = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", code], cwd=cwd, check=True,
+                                capture_output=True, text=True).stdout
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        heavy = output.strip()
+    return {"module": module, "ms": round(best * 1000, 1), "heavy": heavy.split(",") if heavy else []}
+
+
+def check_startup(args) -> int:
+    """冷启动测试，超过args.startup_budget毫秒或加载了图形界面、定时器等依赖时返回1"""
+    results = [bench_startup(module, args.startup_repeat) for module in STARTUP_MODULES]
+    failed = [item for item in results if item["ms"] > args.startup_budget or item["heavy"]]
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print(f"{'module':<16}{'ms':>8}  heavy imports")
+        for item in results:
+            print(f"{item['module']:<16}{item['ms']:>8}  {','.join(item['heavy']) or '-'}")
+        print(f"budget: {args.startup_budget}ms, {'FAIL' if failed else 'OK'}")
+    return 1 if failed else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="文件删除性能测试")
+    parser.add_argument("--files", type=int, default=10000, help="文件数量")
+    parser.add_argument("--depth", type=int, default=2, help="子目录层数")
+    parser.add_argument("--fanout", type=int, default=4, help="每个目录的子目录数")
+    parser.add_argument("--seed", type=int, default=0, help="随机数种子")
+    parser.add_argument("--max-days", type=int, default=60, help="文件修改时间的最大天数")
+    parser.add_argument("--mtime-dist", choices=("uniform", "exp"), default="uniform", help="修改时间分布")
+    parser.add_argument("--max-size", type=int, default=0, help="文件最大字节数")
+    parser.add_argument("--size-dist", choices=("zero", "uniform", "lognormal"), default="zero", help="文件大小分布")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES), help="测试的接口")
+    parser.add_argument("--pattern", default="**", help="文件匹配规则")
+    parser.add_argument("--recursive", action="store_true", help="递归子目录")
+    parser.add_argument("--days", type=int, default=30, help="保留天数")
+    parser.add_argument("--size", type=int, default=0, help="保留大小(M)")
+    parser.add_argument("--number", type=int, default=10, help="保留数量")
+    parser.add_argument("--empty-dir", action="store_true", help="删除空目录")
+    parser.add_argument("--workers", type=int, default=1, help="同时列出的目录数")
+    parser.add_argument("--delete-workers", type=int, default=1, help="删除线程数")
+    parser.add_argument("--no-delete", action="store_true", help="只运行测试模式")
+    parser.add_argument("--dir", default=None, help="生成测试目录树的位置，默认为临时目录")
+    parser.add_argument("--json", action="store_true", help="以JSON格式输出")
+    parser.add_argument("--startup", action="store_true", help="只测试冷启动耗时和导入的模块")
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET_MS, help="冷启动耗时上限(毫秒)")
+    parser.add_argument("--startup-repeat", type=int, default=5, help="冷启动测试次数")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.startup:
+        return check_startup(args)
+    logging.getLogger("logger").disabled = True
+    tmp_dir = None
+    if args.dir is None:
+        tmp_dir = tempfile.mkdtemp(prefix="file_delete_bench_")
+        args.dir = tmp_dir
+    try:
+        results = []
+        for mode in args.modes:
+            for test in ((True,) if args.no_delete or mode in READ_ONLY_MODES else (True, False)):
+                results.append(bench(mode, args, test))
+    finally:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    print(f"{'mode':<22}{'run':<8}{'matched':>9}{'seconds':>10}{'files/s':>11}{'syscalls':>10}{'peak KB':>10}")
+    for item in results:
+        run = "-" if item["mode"] in READ_ONLY_MODES else "test" if item["test"] else "delete"
+        print(f"{item['mode']:<22}{run:<8}{item['matched']:>9}{item['seconds']:>10}"
+              f"{item['files_per_sec']:>11}{item['syscalls']:>10}{item['peak_kb']:>10}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""文件定时删除工具命令行入口，不加载图形界面，适合在服务器上运行
+
+例如：
+
+    python cli.py list
+    python cli.py run --task 5f1c2d7e9a8b4c3d8e6f0a1b2c3d4e5f --dry-run
+    python cli.py run --task 5f1c2d7e9a8b4c3d8e6f0a1b2c3d4e5f --dry-run --report-out report.csv
+    python cli.py run --task 5f1c2d7e9a8b4c3d8e6f0a1b2c3d4e5f --dry-run --profile --profile-out task.prof
+    python cli.py daemon
+"""
+
+import sys
+import logging
+import argparse
+import threading
+
+from task_manage import taskManager,ConfigManage,ConfigStore,create_scheduler
+from file_delete import check_task
+from run_history import TRIGGER_CLI
+from logger_conf import init_logger
+
+STATUS_TEXT = {0: "未启动", 1: "运行中", 2: "暂停"}
+
+
+def find_task(config_manage: ConfigManage, task: str):
+    """按任务id查找任务，找不到时按名称查找"""
+    task_data = config_manage.get_task(task)
+    if task_data is not None:
+        return task_data
+    matched = [item for item in config_manage.get_config("tasks") if item.get("name") == task]
+    if len(matched) == 1:
+        return matched[0]
+    return None
+
+
+def list_tasks(args) -> int:
+    for task in ConfigManage().get_config("tasks"):
+        status = STATUS_TEXT.get(task.get("status"), "未启动")
+        print(f"{task['id']}  {status}  {task.get('trigger_args') or ''}  {task.get('name')}")
+    return 0
+
+
+def run_task(args) -> int:
+    task = find_task(ConfigManage(), args.task)
+    if task is None:
+        logging.getLogger("logger").error("任务不存在: %s", args.task)
+        return 2
+    error = check_task(task)
+    if error:
+        logging.getLogger("logger").error("任务%s配置有误: %s", task.get("name"), error)
+        return 2
+    result = taskManager.start_delete_task(task, test=args.dry_run, trigger=TRIGGER_CLI,
+                                           profile=args.profile or bool(args.profile_out),
+                                           profile_file=args.profile_out,
+                                           report_file=args.report_out)
+    if task.get("fast_delete") and not args.dry_run:
+        # 回收目录在后台线程中清理，退出前等待清理完成
+        from trash import TRASH_PURGER
+        TRASH_PURGER.join()
+    return 1 if result.failed else 0
+
+
+def run_daemon(args) -> int:
+    """启动定时器，运行状态为"运行中"的任务按定时参数执行，直到收到SIGINT或SIGTERM"""
+    import signal
+
+    logger = logging.getLogger("logger")
+    stop_event = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+
+    scheduler = create_scheduler()
+    scheduler.start()
+    taskManager.load_sched_job(scheduler)
+    logger.info("定时任务已启动，共%s个任务", len(scheduler.get_jobs()))
+    while not stop_event.wait(1):
+        pass
+    logger.info("正在停止定时任务")
+    scheduler.shutdown(wait=True)
+    ConfigStore.flush_all()
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="文件定时删除工具命令行")
+    parser.add_argument("--config", default=None, help="配置文件路径，默认为程序目录下的config.json")
+    parser.add_argument("--quiet", action="store_true", help="不在终端输出日志")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="列出任务")
+    list_parser.set_defaults(func=list_tasks)
+
+    run_parser = subparsers.add_parser("run", help="立即运行一个任务")
+    run_parser.add_argument("--task", required=True, help="任务id或名称")
+    run_parser.add_argument("--dry-run", action="store_true", help="测试模式，只输出匹配的文件，不删除")
+    run_parser.add_argument("--report-out", default=None, help="测试模式下把汇总报告保存到该文件，扩展名为.csv时保存为CSV，否则为JSON")
+    run_parser.add_argument("--profile", action="store_true", help="统计扫描、过滤、删除等各阶段的耗时并输出到日志")
+    run_parser.add_argument("--profile-out", default=None, help="同时用cProfile记录调用并保存到该文件，可用snakeviz或pstats查看")
+    run_parser.set_defaults(func=run_task)
+
+    daemon_parser = subparsers.add_parser("daemon", help="在前台运行定时任务")
+    daemon_parser.set_defaults(func=run_daemon)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.config:
+        ConfigManage.default_file = args.config
+    logger = init_logger()
+    if not args.quiet:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+        logger.addHandler(handler)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1 @@
-pyinstaller main.py -n file_delete -p logger_conf.py  -p file_delete.py -p MainWindowUI.py -p InputDialogUI.py  -p .venv\Lib\site-packages\PyQt6\Qt6\bin -i icon.ico -w --onefile
\ No newline at end of file
+pyinstaller main.py -n file_delete -p logger_conf.py  -p file_delete.py -p file_scan.py -p file_index.py -p file_watch.py -p task_manage.py -p path_lock.py -p shared_scan.py -p run_history.py -p metrics.py -p profiler.py -p dry_run_report.py -p external_sort.py -p throttle.py -p trash.py -p MainWindowUI.py -p InputDialogUI.py -p ReportDialogUI.py  -p .venv\Lib\site-packages\PyQt6\Qt6\bin -i icon.ico -w --onefile
\ No newline at end of file
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import csv
+import json
+import time
+import random
+import logging
+
+logger = logging.getLogger('logger')
+
+# 文件修改时间分布，(上限天数, 名称)，最后一项为超过所有上限
+AGE_BUCKETS = ((1, "1天内"), (7, "1-7天"), (30, "7-30天"), (90, "30-90天"), (365, "90-365天"), (None, "1年以上"))
+# 文件大小分布，(上限字节数, 名称)
+SIZE_BUCKETS = ((1024, "1K以下"), (1024**2, "1K-1M"), (100 * 1024**2, "1M-100M"), (1024**3, "100M-1G"), (None, "1G以上"))
+# 文件直接位于root_path下时使用的顶层目录名称
+ROOT_DIR_NAME = "."
+
+
+def _bucket(buckets: tuple, value: float) -> str:
+    for bound, name in buckets:
+        if bound is None or value < bound:
+            return name
+    return buckets[-1][1]
+
+
+class DryRunReport():
+    """测试模式的汇总报告，代替逐个文件写日志
+
+    统计匹配的文件数、目录数和总大小，按root_path下的顶层目录汇总文件数和大小，
+    生成修改时间和大小的分布，并用蓄水池抽样保留最多sample_size个路径，内存占用与匹配的文件数无关
+    """
+    def __init__(self, root_path: str, sample_size: int=1000, now: float=None, seed=None) -> None:
+        """
+        Args:
+            root_path (str): 任务的匹配目录
+            sample_size (int, optional): 保留的样例路径数. Defaults to 1000.
+            now (float, optional): 计算文件天数使用的当前时间戳，默认为创建时间. Defaults to None.
+            seed (optional): 抽样使用的随机数种子. Defaults to None.
+        """
+        self.root_path = os.path.abspath(root_path)
+        self.sample_size = max(sample_size or 0, 0)
+        self.now = time.time() if now is None else now
+        self.random = random.Random(seed)
+        self.files = 0
+        self.dirs = 0
+        self.bytes = 0
+        self.oldest = None
+        self.newest = None
+        self.top_dirs = {}
+        self.age_histogram = dict.fromkeys((name for _, name in AGE_BUCKETS), 0)
+        self.size_histogram = dict.fromkeys((name for _, name in SIZE_BUCKETS), 0)
+        # [(路径, 是否为目录, 大小, 修改时间)]
+        self.samples = []
+        self.seen = 0
+
+    def add(self, record):
+        """统计一个将被删除的文件或目录记录"""
+        self.seen += 1
+        if record.is_dir:
+            self.dirs += 1
+        else:
+            self.files += 1
+            self.bytes += record.size
+            self.oldest = record.mtime if self.oldest is None else min(self.oldest, record.mtime)
+            self.newest = record.mtime if self.newest is None else max(self.newest, record.mtime)
+            self.age_histogram[_bucket(AGE_BUCKETS, (self.now - record.mtime) / 86400)] += 1
+            self.size_histogram[_bucket(SIZE_BUCKETS, record.size)] += 1
+            top = self.top_dirs.setdefault(self.top_dir(record.path), [0, 0])
+            top[0] += 1
+            top[1] += record.size
+        self._sample((record.path, record.is_dir, record.size, record.mtime))
+
+    def top_dir(self, path: str) -> str:
+        """路径所在的root_path下的顶层目录名称"""
+        rel_path = os.path.relpath(os.path.abspath(path), self.root_path)
+        parts = rel_path.split(os.sep, 1)
+        return parts[0] if len(parts) > 1 else ROOT_DIR_NAME
+
+    def _sample(self, item: tuple):
+        """蓄水池抽样(Algorithm R)，每条记录被保留的概率相同"""
+        if len(self.samples) < self.sample_size:
+            self.samples.append(item)
+            return
+        index = self.random.randrange(self.seen)
+        if index < self.sample_size:
+            self.samples[index] = item
+
+    def to_dict(self) -> dict:
+        return {
+            "root_path": self.root_path,
+            "generated": self.now,
+            "files": self.files,
+            "dirs": self.dirs,
+            "bytes": self.bytes,
+            "oldest": self.oldest,
+            "newest": self.newest,
+            "top_dirs": [{"name": name, "files": files, "bytes": size}
+                         for name, (files, size) in sorted(self.top_dirs.items(), key=lambda item: -item[1][1])],
+            "age_histogram": [{"name": name, "files": count} for name, count in self.age_histogram.items()],
+            "size_histogram": [{"name": name, "files": count} for name, count in self.size_histogram.items()],
+            "samples": [{"path": path, "is_dir": is_dir, "size": size, "mtime": mtime}
+                        for path, is_dir, size, mtime in sorted(self.samples)],
+        }
+
+    def rows(self) -> list:
+        """报告的表格形式，每行为(分类, 名称, 文件数, 字节数, 修改时间)，用于导出CSV和界面显示"""
+        data = self.to_dict()
+        rows = [
+            ("总计", "文件", data["files"], data["bytes"], ""),
+            ("总计", "目录", data["dirs"], "", ""),
+        ]
+        rows.extend(("顶层目录", item["name"], item["files"], item["bytes"], "") for item in data["top_dirs"])
+        rows.extend(("修改时间", item["name"], item["files"], "", "") for item in data["age_histogram"])
+        rows.extend(("文件大小", item["name"], item["files"], "", "") for item in data["size_histogram"])
+        rows.extend(("样例", item["path"] + (os.sep if item["is_dir"] else ""), "", item["size"],
+                     time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(item["mtime"])) if item["mtime"] else "")
+                    for item in data["samples"])
+        return rows
+
+    def save(self, file: str):
+        """保存报告，扩展名为.csv时保存为CSV，否则保存为JSON"""
+        if os.path.splitext(file)[1].lower() == ".csv":
+            # utf-8-sig便于Excel识别中文
+            with open(file, "w", encoding="utf-8-sig", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(("分类", "名称", "文件数", "字节数", "修改时间"))
+                writer.writerows(self.rows())
+        else:
+            with open(file, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        logger.info("测试报告已保存: %s", file)
+
+    def summary(self, top: int=10) -> str:
+        """写入日志的文字摘要"""
+        lines = [f"将删除文件{self.files}个, 目录{self.dirs}个, 共{self.bytes}字节"]
+        if self.files:
+            lines.append("修改时间: " + time.strftime("%Y-%m-%d", time.localtime(self.oldest)) +
+                         " ~ " + time.strftime("%Y-%m-%d", time.localtime(self.newest)))
+            lines.append("按修改时间: " + ", ".join(f"{name} {count}" for name, count in self.age_histogram.items() if count))
+            lines.append("按大小: " + ", ".join(f"{name} {count}" for name, count in self.size_histogram.items() if count))
+            top_dirs = sorted(self.top_dirs.items(), key=lambda item: -item[1][1])
+            lines.append("顶层目录(按大小):")
+            lines.extend(f"  {name}: {files}个, {size}字节" for name, (files, size) in top_dirs[:top])
+            if len(top_dirs) > top:
+                lines.append(f"  其余{len(top_dirs) - top}个目录省略")
+        if self.samples:
+            lines.append(f"样例路径({len(self.samples)}/{self.seen}):")
+            lines.extend(f"  {path}" for path, _, _, _ in sorted(self.samples)[:top])
+            if len(self.samples) > top:
+                lines.append(f"  其余{len(self.samples) - top}个样例见导出的报告")
+        return "\n".join(lines)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import heapq
+import pickle
+import shutil
+import tempfile
+import logging
+from typing import Iterator
+
+logger = logging.getLogger('logger')
+
+# 写入临时文件时每次序列化的条目数
+CHUNK_SIZE = 1000
+
+
+def _read_run(file: str) -> Iterator[tuple]:
+    """按块读取一个已排序的临时文件"""
+    with open(file, 'rb') as f:
+        while True:
+            try:
+                chunk = pickle.load(f)
+            except EOFError:
+                return
+            yield from chunk
+
+
+class ExternalSorter():
+    """内存占用有上限的排序
+
+    条目先放入内存缓冲区，超过max_items个时排序后写入临时目录中的一个有序文件，
+    最后用heapq.merge把各个有序文件和内存中剩余的条目合并，按顺序逐个产出；
+    条目不超过max_items个时不写临时文件。条目必须可以pickle并且可以比较大小
+    """
+    def __init__(self, max_items: int=100000, tmp_dir: str=None) -> None:
+        """
+        Args:
+            max_items (int, optional): 内存中最多保存的条目数. Defaults to 100000.
+            tmp_dir (str, optional): 临时文件所在的目录，默认为系统临时目录. Defaults to None.
+        """
+        self.max_items = max(max_items or 1, 1)
+        self.tmp_dir = tmp_dir
+        self.buffer = []
+        self.runs = []
+        self.run_dir = None
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def add(self, item):
+        self.buffer.append(item)
+        self.count += 1
+        if len(self.buffer) >= self.max_items:
+            self._spill()
+
+    def sorted(self) -> Iterator:
+        """按从小到大的顺序产出所有条目"""
+        self.buffer.sort()
+        if not self.runs:
+            return iter(self.buffer)
+        return heapq.merge(*(_read_run(file) for file in self.runs), self.buffer)
+
+    def close(self):
+        """删除临时文件"""
+        self.buffer = []
+        self.runs = []
+        if self.run_dir is not None:
+            shutil.rmtree(self.run_dir, ignore_errors=True)
+            self.run_dir = None
+
+    def _spill(self):
+        self.buffer.sort()
+        if self.run_dir is None:
+            self.run_dir = tempfile.mkdtemp(prefix='file_delete_sort_', dir=self.tmp_dir)
+        file = os.path.join(self.run_dir, f'run_{len(self.runs)}.pickle')
+        with open(file, 'wb') as f:
+            for start in range(0, len(self.buffer), CHUNK_SIZE):
+                pickle.dump(self.buffer[start:start + CHUNK_SIZE], f, pickle.HIGHEST_PROTOCOL)
+        self.runs.append(file)
+        logger.debug("排序缓冲区已满，写入临时文件: %s", file)
+        self.buffer = []
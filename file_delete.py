@@ -2,33 +2,562 @@
 # -*- coding: utf-8 -*-
 
 import os
-import glob
-from typing import Tuple
-from datetime import datetime
+import stat
+import time
+import heapq
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Iterator, TYPE_CHECKING
 import logging
 
+from file_scan import FileScanner, FileRecord
+
+if TYPE_CHECKING:
+    from file_index import FileIndex
+
 logger = logging.getLogger('logger')
 
+
+class DeleteResult():
+    """一次删除任务的运行结果"""
+    def __init__(self) -> None:
+        self.scanned = 0      # 扫描的目录条目数
+        self.matched = 0      # 匹配的文件和目录数
+        self.deleted = 0      # 删除成功数，包括目录
+        self.dirs_deleted = 0  # 删除的目录数
+        self.failed = 0       # 删除失败数
+        self.bytes_freed = 0  # 释放的字节数
+        self.elapsed = 0.0    # 耗时(秒)
+        self.delete_elapsed = 0.0  # 其中删除文件和目录的耗时(秒)，其余为扫描和过滤
+        self.cancelled = False  # 是否被取消
+        self.profile = None   # 性能分析模式下各阶段的耗时[(阶段, 说明, 秒, 次数)]
+        self.report = None    # 测试模式的汇总报告DryRunReport
+        self.error = None     # 任务异常结束时的异常信息
+        self.quota_excess = None  # 配额模式下需要释放的字节数
+
+    def __str__(self) -> str:
+        text = (f"扫描{self.scanned}个, 匹配{self.matched}个, 删除{self.deleted}个, 失败{self.failed}个, "
+                f"释放{self.bytes_freed}字节, 耗时{self.elapsed:.2f}秒")
+        if self.cancelled:
+            text += ", 已取消"
+        if self.error:
+            text += f", 运行失败: {self.error}"
+        return text
+
+
+def _delete_path(record: FileRecord):
+    """删除文件或空目录，返回异常，成功时返回None"""
+    try:
+        if record.is_dir:
+            os.rmdir(record.path)
+        else:
+            os.remove(record.path)
+    except OSError as e:
+        return e
+    return None
+
+
+# 限速等待期间任务被取消，没有删除的记录
+_CANCELLED = object()
+
+
+def check_task(task: dict) -> str:
+    """检查任务中不能同时使用的条件，返回错误信息，没有问题时返回空字符串"""
+    if task.get("fast_delete") and (task.get("size") or task.get("quota") or task.get("free_space")):
+        # 目录的大小需要遍历整个目录才能得到，快速删除时扫描不进入匹配的目录
+        return "快速删除目录时不能使用文件大小和空间配额条件"
+    return ""
+
+
+def dir_is_empty(path: str) -> bool:
+    """目录是否为空，读到第一个条目就停止"""
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is None
+    except OSError:
+        return False
+
+
+class _Progress():
+    """按时间间隔调用进度回调，避免每个文件都通知界面"""
+    def __init__(self, callback, result: DeleteResult, interval: float=0.2) -> None:
+        self.callback = callback
+        self.result = result
+        self.interval = interval
+        self.last = 0.0
+
+    def __call__(self, force: bool=False):
+        now = time.monotonic()
+        if force or now - self.last >= self.interval:
+            self.last = now
+            self.callback(self.result)
+
+
+def _named_stage(name: str, stage):
+    """给过滤阶段加上性能分析使用的名称"""
+    def named(records):
+        return stage(records)
+    named.stage_name = name
+    return named
+
+
+class DeleteExecutor():
+    """批量删除执行器，候选文件按批次在有限的线程池上删除，结果累计到DeleteResult
+
+    track_dirs为True时记录删除过条目的目录，用于之后自底向上清理空目录；
+    cancel_event被设置后不再删除尚未开始的批次，progress在每批删除后调用；
+    测试模式下候选记录汇总到report，log_files为True时同时逐个写日志；
+    指定throttle时每个文件删除前按限速等待，idle_io为True时删除线程使用最低的IO优先级；
+    指定trash时目录移动到回收目录(快速删除)，不要求目录为空
+    """
+    def __init__(self, result: DeleteResult, workers: int=1, batch_size: int=100, test: bool=False, track_dirs: bool=False,
+                 cancel_event=None, progress=None, profiler=None, report=None, log_files: bool=False,
+                 throttle=None, idle_io: bool=False, trash=None) -> None:
+        self.result = result
+        self.trash = trash
+        self.throttle = throttle
+        self.report = report
+        self.log_files = log_files or report is None
+        self.profiler = profiler
+        self.cancel_event = cancel_event
+        self.progress = progress
+        self.workers = workers or 1
+        self.batch_size = max(batch_size or 1, 1)
+        self.test = test
+        self.track_dirs = track_dirs
+        self.touched_dirs = set()
+        self.batch = []
+        self.pool = None
+        if self.workers > 1 and not test:
+            initializer = None
+            if idle_io:
+                from throttle import set_idle_io_priority
+                initializer = set_idle_io_priority
+            self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='delete', initializer=initializer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def submit(self, record: FileRecord):
+        self.result.matched += 1
+        self.batch.append(record)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        batch, self.batch = self.batch, []
+        if not batch or self.cancelled:
+            return
+        start = time.perf_counter()
+        try:
+            self._delete_batch(batch)
+        finally:
+            self.result.delete_elapsed += time.perf_counter() - start
+            if self.progress is not None:
+                self.progress()
+
+    def _delete_batch(self, batch: list):
+        if self.test:
+            if self.report is not None:
+                with self._timer("report"):
+                    for record in batch:
+                        self.report.add(record)
+            if self.log_files:
+                with self._timer("log"):
+                    for record in batch:
+                        if record.is_dir:
+                            logger.info("Deleted empty directory test: %s",record.path)
+                        else:
+                            logger.info("delete test: %s",record.path)
+            return
+        delete = self._delete if self.profiler is None else self._timed_delete_path
+        if self.throttle is not None:
+            delete = self._throttled(delete)
+        if self.pool:
+            errors = list(self.pool.map(delete, batch))
+        else:
+            errors = list(map(delete, batch))
+        with self._timer("log"):
+            self._count_batch(batch, errors)
+
+    def _throttled(self, delete):
+        def throttled_delete(record: FileRecord):
+            self.throttle.wait(record)
+            if self.cancelled:
+                return _CANCELLED
+            return delete(record)
+        return throttled_delete
+
+    def _timer(self, stage: str):
+        return self.profiler.timer(stage) if self.profiler is not None else nullcontext()
+
+    def _delete(self, record: FileRecord):
+        if record.is_dir and self.trash is not None:
+            return self.trash.move(record.path)
+        return _delete_path(record)
+
+    def _timed_delete_path(self, record: FileRecord):
+        with self.profiler.timer("rmdir" if record.is_dir else "delete"):
+            return self._delete(record)
+
+    def _count_batch(self, batch: list, errors: list):
+        for record, error in zip(batch, errors):
+            if error is _CANCELLED:
+                continue
+            if isinstance(error, FileNotFoundError):
+                # 已被其他任务(如共享扫描中规则重叠的任务)删除
+                logger.debug("文件已不存在: %s", record.path)
+                continue
+            if error is not None:
+                self.result.failed += 1
+                logger.error("delete failed: %s, %s", record.path, error)
+                continue
+            if self.track_dirs:
+                self.touched_dirs.add(os.path.dirname(record.path))
+            if record.is_dir:
+                self.result.deleted += 1
+                self.result.dirs_deleted += 1
+                logger.info("Deleted directory: %s" if self.trash is not None else "Deleted empty directory: %s", record.path)
+            else:
+                self.result.deleted += 1
+                self.result.bytes_freed += record.size
+                logger.info("delete: %s",record.path)
+
+    def close(self):
+        self.flush()
+        if self.pool:
+            self.pool.shutdown()
+            self.pool = None
+
+
 class FileDelete():
-    """文件删除类"""
-    def main(self,root_path: str, pattern: str, recursive: bool=False, days: int=None,size: int=None,number: int=0,empty_dir: bool=False,test: bool=False):
-        if number:
-            self.delete_files_number(root_path, pattern,number,days,test)
+    """文件删除类
+
+    扫描、过滤、删除组成一条流式流水线：iter_candidates产出候选记录，
+    删除、测试运行和统计都消费同一个候选流，内存占用与目录树大小无关；
+    配额模式需要按修改时间排序所有文件，超过sort_buffer个时写入sort_tmp_dir下的临时文件
+    """
+    def __init__(self, index: 'FileIndex'=None, sort_buffer: int=100000, sort_tmp_dir: str=None) -> None:
+        self.index = index
+        self.sort_buffer = sort_buffer
+        self.sort_tmp_dir = sort_tmp_dir
+
+    def main(self,root_path: str, pattern: str, recursive: bool=False, days: int=None,size: int=None,number: int=0,empty_dir: bool=False,test: bool=False,
+             workers: int=1,delete_workers: int=1,batch_size: int=100,number_per_dir: bool=False) -> DeleteResult:
+        task = {
+            "root_path": root_path,
+            "pattern": pattern,
+            "recursive": recursive,
+            "days": days,
+            "size": size,
+            "number": number,
+            "number_per_dir": number_per_dir,
+            "empty_dir": empty_dir
+        }
+        return self.run(task,test,workers,delete_workers,batch_size)
+
+    def run(self,task: dict,test: bool=False,workers: int=1,delete_workers: int=1,batch_size: int=100,source=None,
+            progress=None,cancel_event=None,profiler=None,report_sample: int=1000,log_files: bool=False) -> DeleteResult:
+        """执行删除任务
+
+        Args:
+            task (dict): 任务配置，字段与config.json中的任务一致
+            test (bool, optional): 测试模式，只打印不删除. Defaults to False.
+            workers (int, optional): 同时列出的目录数，大于1时并发遍历子目录. Defaults to 1.
+            delete_workers (int, optional): 删除线程数. Defaults to 1.
+            batch_size (int, optional): 每批删除的数量. Defaults to 100.
+            source (Iterable[FileRecord], optional): 名称已匹配的记录来源，指定时不再扫描. Defaults to None.
+            progress (Callable[[DeleteResult], None], optional): 进度回调，扫描和删除过程中定期调用. Defaults to None.
+            cancel_event (threading.Event, optional): 设置后停止扫描，已开始的批次删除完后结束，不再删除其余文件. Defaults to None.
+            profiler (StageProfiler, optional): 性能分析，统计扫描、过滤、删除等各阶段的耗时，结束后写入日志和result.profile. Defaults to None.
+            report_sample (int, optional): 测试模式汇总报告result.report中保留的样例路径数. Defaults to 1000.
+            log_files (bool, optional): 测试模式下是否同时逐个文件写日志. Defaults to False.
+
+        Returns:
+            DeleteResult: 运行结果
+
+        Raises:
+            ValueError: 任务中有不能同时使用的条件，见check_task
+        """
+        error = check_task(task)
+        if error:
+            raise ValueError(error)
+        start = time.perf_counter()
+        result = DeleteResult()
+        empty_dir = bool(task.get("empty_dir")) and not test
+        reporter = _Progress(progress, result) if progress is not None else None
+        if test:
+            from dry_run_report import DryRunReport
+            result.report = DryRunReport(task.get("root_path"), report_sample)
+        throttle = None
+        if not test and (task.get("max_ops") or task.get("max_bytes")):
+            from throttle import Throttle
+            throttle = Throttle(task.get("max_ops") or 0, (task.get("max_bytes") or 0) * 1024 * 1024, cancel_event)
+        trash = None
+        if task.get("fast_delete") and not test:
+            from trash import Trash
+            trash = Trash(task.get("root_path"))
+        idle = bool(task.get("idle_io")) and not test
+        if idle:
+            from throttle import idle_io
+            io_priority = idle_io()
         else:
-            self.delete_files(root_path, pattern,recursive,days,size,empty_dir,test)
-    
+            io_priority = nullcontext()
+        with io_priority:
+            with DeleteExecutor(result, delete_workers, batch_size, test, track_dirs=empty_dir,
+                                cancel_event=cancel_event, progress=reporter, profiler=profiler,
+                                report=result.report, log_files=log_files, throttle=throttle, idle_io=idle,
+                                trash=trash) as executor:
+                candidates = self.iter_candidates(task, result, workers, source=source,
+                                                  cancel_event=cancel_event, progress=reporter, profiler=profiler,
+                                                  idle_io=idle)
+                for record in candidates:
+                    if executor.cancelled:
+                        break
+                    executor.submit(record)
+                candidates.close()
+            result.cancelled = executor.cancelled
+            if result.cancelled:
+                logger.warning("任务已取消")
+            elif empty_dir and executor.touched_dirs:
+                prune_start = time.perf_counter()
+                with executor._timer("rmdir"):
+                    self.prune_empty_dirs(task, executor.touched_dirs, result, throttle)
+                result.delete_elapsed += time.perf_counter() - prune_start
+        if result.quota_excess and not test and not result.cancelled and result.bytes_freed < result.quota_excess:
+            logger.warning("配额: 需要释放%s字节, 实际释放%s字节, 还差%s字节(部分文件删除失败或删除前已变化)",
+                           result.quota_excess, result.bytes_freed, result.quota_excess - result.bytes_freed)
+        if throttle is not None and throttle.waited:
+            logger.info("限速等待%.2f秒(各删除线程合计)", throttle.waited)
+        if not result.matched:
+            logger.info("没有匹配到文件")
+        elif result.report is not None:
+            logger.info("测试报告:\n%s", result.report.summary())
+        result.elapsed = time.perf_counter() - start
+        if profiler is not None:
+            result.profile = profiler.rows(result.elapsed)
+            logger.info("性能分析:\n%s", profiler.report(result.elapsed))
+        if reporter is not None:
+            reporter(force=True)
+        return result
+
+    def iter_candidates(self,task: dict,result: DeleteResult=None,workers: int=1,stages: list=None,source=None,
+                        cancel_event=None,progress=None,profiler=None,idle_io: bool=False) -> Iterator[FileRecord]:
+        """流式产出任务要删除的文件和目录
+
+        扫描得到的记录依次经过各个过滤阶段，每个阶段是一个接收记录迭代器、返回记录迭代器的函数
+
+        Args:
+            task (dict): 任务配置
+            result (DeleteResult, optional): 用于累计扫描条目数. Defaults to None.
+            workers (int, optional): 同时列出的目录数. Defaults to 1.
+            stages (list, optional): 过滤阶段，默认为build_stages(task)的结果. Defaults to None.
+            source (Iterable[FileRecord], optional): 名称已匹配的记录来源(如监听器的快照)，指定时不再扫描，
+                有scanned属性(如共享扫描)时作为扫描的条目数. Defaults to None.
+            cancel_event (threading.Event, optional): 设置后停止扫描. Defaults to None.
+            progress (Callable[[], None], optional): 每扫描完一个目录调用一次，调用时result.scanned为当前的扫描数. Defaults to None.
+            profiler (StageProfiler, optional): 统计各阶段的耗时，阶段名称取自函数的stage_name属性. Defaults to None.
+            idle_io (bool, optional): 并发扫描的线程使用最低的IO优先级. Defaults to False.
+
+        Yields:
+            FileRecord: 要删除的文件或空目录
+        """
+        index = self.index if task.get("incremental") else None
+        base_scanned = result.scanned if result is not None else 0
+
+        def on_scan(scanned: int):
+            if result is not None:
+                result.scanned = base_scanned + scanned
+            if progress is not None:
+                progress()
+
+        scanner = FileScanner(task.get("root_path"), task.get("pattern") or "*",
+                              recursive=bool(task.get("recursive")), workers=workers, index=index,
+                              exclude=task.get("exclude"), cancel_event=cancel_event,
+                              progress=on_scan if result is not None or progress is not None else None,
+                              profiler=profiler, idle_io=idle_io, dir_prune=bool(task.get("fast_delete")))
+        if stages is None:
+            stages = self.build_stages(task, result=result)
+        if index is not None or source is not None:
+            stages = stages + [_named_stage("verify", self.verify_cached)]
+        records = scanner.scan() if source is None else iter(source)
+        if profiler is not None:
+            records = profiler.wrap("scan", records)
+        for stage in stages:
+            records = stage(records)
+            if profiler is not None:
+                records = profiler.wrap(getattr(stage, "stage_name", "filter"), records)
+        try:
+            yield from records
+        finally:
+            if result is not None:
+                scanned = scanner.scanned if source is None else getattr(source, "scanned", 0)
+                result.scanned = base_scanned + scanned
+
+    def build_stages(self,task: dict,now: float=None,result: DeleteResult=None) -> list:
+        """根据任务配置生成过滤阶段：空目录、保留数量、天数、大小
+
+        保留数量在天数和大小之前，与原有逻辑一致：先在所有匹配的文件中保留最新的number个，其余文件再按天数和大小过滤；
+        设置了配额(quota)或剩余空间(free_space)时为配额模式，只按配额从最旧的文件开始删除，不再使用保留数量、天数和大小；
+        快速删除(fast_delete)时匹配的目录作为一个整体，与匹配的文件一起按目录的修改时间计算保留数量和天数，
+        匹配目录下的条目不再单独处理；目录的大小无法直接得到，不能同时使用大小和配额条件
+
+        Args:
+            task (dict): 任务配置
+            now (float, optional): 当前时间戳，默认为调用时间. Defaults to None.
+            result (DeleteResult, optional): 配额模式下记录需要释放的字节数. Defaults to None.
+
+        Returns:
+            list: 过滤阶段列表
+
+        Raises:
+            ValueError: 任务中有不能同时使用的条件，见check_task
+        """
+        error = check_task(task)
+        if error:
+            raise ValueError(error)
+        now = time.time() if now is None else now
+        days = task.get("days")
+        size = task.get("size")
+        number = task.get("number")
+        fast_delete = bool(task.get("fast_delete"))
+        stages = [_named_stage("filter", lambda records: self.filter_dirs(records, bool(task.get("empty_dir")), fast_delete))]
+        if fast_delete:
+            stages.append(_named_stage("filter", self.filter_trash))
+        quota = task.get("quota")
+        free_space = task.get("free_space")
+        if quota or free_space:
+            stages.append(_named_stage("quota", lambda records: self.iter_quota_expired(records, task.get("root_path"), quota, free_space, result)))
+        else:
+            if number:
+                stages.append(_named_stage("retain", lambda records: self.iter_number_expired(records, number, bool(task.get("number_per_dir")),
+                                                                                              fast_delete)))
+            if days:
+                stages.append(_named_stage("filter", lambda records: self.filter_days(records, days, now)))
+            if size:
+                stages.append(_named_stage("filter", lambda records: self.filter_size(records, size)))
+        return stages
+
+    def verify_cached(self,records) -> Iterator[FileRecord]:
+        """删除前重新stat来自索引或监听器的文件，元数据已变化的文件本次跳过，并让索引下次重新扫描所在目录
+
+        目录在filter_dirs中已经重新检查过，直接通过
+        """
+        for record in records:
+            if not record.cached or record.is_dir:
+                yield record
+                continue
+            try:
+                st = os.stat(record.path)
+            except OSError:
+                continue
+            if st.st_size == record.size and st.st_mtime == record.mtime:
+                yield record
+            else:
+                logger.debug("文件信息已过期，跳过: %s", record.path)
+                if self.index is not None:
+                    self.index.invalidate(os.path.dirname(record.path))
+
+    def filter_dirs(self,records,empty_dir: bool=False,fast_delete: bool=False) -> Iterator[FileRecord]:
+        """目录只在empty_dir为True且为空目录时保留；fast_delete为True时保留所有目录，并读取目录的修改时间"""
+        for record in records:
+            if not record.is_dir:
+                yield record
+            elif fast_delete:
+                try:
+                    record.mtime = os.stat(record.path).st_mtime
+                except OSError:
+                    continue
+                yield record
+            elif empty_dir and dir_is_empty(record.path):
+                yield record
+
+    def filter_trash(self,records) -> Iterator[FileRecord]:
+        """快速删除时跳过回收目录及其中的条目；匹配目录下的条目在扫描时已经跳过(dir_prune)"""
+        from trash import TRASH_NAME
+        for record in records:
+            if TRASH_NAME not in record.path.split(os.sep):
+                yield record
+
+    def prune_empty_dirs(self,task: dict,dirs: set,result: DeleteResult,throttle=None):
+        """自底向上删除本次运行中变为空的目录
+
+        从删除过条目的目录开始按深度从深到浅处理，目录为空时删除并继续检查其父目录，
+        一次运行内逐级删除，不会删除root_path本身和被排除规则匹配的目录
+
+        Args:
+            task (dict): 任务配置
+            dirs (set): 删除过条目的目录
+            result (DeleteResult): 运行结果
+            throttle (Throttle, optional): 每个目录删除前按每秒删除数限速等待. Defaults to None.
+        """
+        root_path = os.path.abspath(task.get("root_path"))
+        scanner = FileScanner(root_path, task.get("pattern") or "*", recursive=bool(task.get("recursive")),
+                              exclude=task.get("exclude"))
+        heap = []
+        for dir_path in dirs:
+            heapq.heappush(heap, (-dir_path.count(os.sep), dir_path))
+        seen = set()
+        while heap:
+            _, dir_path = heapq.heappop(heap)
+            if dir_path in seen:
+                continue
+            seen.add(dir_path)
+            abs_path = os.path.abspath(dir_path)
+            if abs_path == root_path or not abs_path.startswith(os.path.join(root_path, '')):
+                continue
+            if scanner.is_excluded(abs_path, True) or not dir_is_empty(dir_path):
+                continue
+            if throttle is not None:
+                throttle.wait(FileRecord(dir_path, True))
+                if throttle.cancel_event.is_set():
+                    break
+            try:
+                os.rmdir(dir_path)
+            except OSError as e:
+                result.failed += 1
+                logger.error("delete failed: %s, %s", dir_path, e)
+                continue
+            result.deleted += 1
+            result.dirs_deleted += 1
+            logger.info("Deleted empty directory: %s", dir_path)
+            parent = os.path.dirname(dir_path)
+            heapq.heappush(heap, (-parent.count(os.sep), parent))
+
+    def filter_days(self,records,days: int,now: float) -> Iterator[FileRecord]:
+        """保留修改时间超过days天的文件，目录直接通过；快速删除时目录已读取修改时间，同样按天数过滤"""
+        for record in records:
+            if (record.is_dir and not record.mtime) or self.is_expired(record.mtime, days, now):
+                yield record
+
+    def filter_size(self,records,size: int) -> Iterator[FileRecord]:
+        """保留大于等于size(M)的文件，目录直接通过"""
+        min_size = size * 1024 * 1024
+        for record in records:
+            if record.is_dir or record.size >= min_size:
+                yield record
+
     def get_number_files(self,files: list, number: int) -> Tuple[list,list]:
         """查找最新的number个文件
 
         Args:
             files (list): 文件路径列表
-            number (int): _description_
+            number (int): 保留数量
 
         Returns:
-            _type_: _description_
+            Tuple[list,list]: 最新的number个文件, 其余文件
         """
-        sort_files = sorted(files, 
-                            key=lambda x: datetime.fromtimestamp(os.path.getmtime(x)),reverse=False)
+        mtimes = {}
+        for file in files:
+            mtimes[file] = os.stat(file).st_mtime
+        sort_files = sorted(files, key=mtimes.__getitem__,reverse=False)
         
         files_size = len(sort_files)
         num_new_files = []
@@ -51,79 +580,158 @@ class FileDelete():
         Returns:
             list: days天前的文件
         """
+        now = time.time()
         old_days_files = []
         for file in files:
-            if os.path.isfile(file):
-                mod_time = datetime.fromtimestamp(os.path.getmtime(file))
-                if (datetime.now() - mod_time).days > days:
-                    old_days_files.append(file)
+            try:
+                st = os.stat(file)
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode) and self.is_expired(st.st_mtime, days, now):
+                old_days_files.append(file)
         return old_days_files
 
-    def delete_files_number(self,dir_path: str, pattern: str, number: int=None,days: int=None,test: bool=False):
-        """批量文件删除，支持保留数量, 名称匹配，日期匹配,不支持递归
+    def iter_number_expired(self, records, number: int, per_dir: bool=False, dirs: bool=False) -> Iterator[FileRecord]:
+        """保留最新的number个文件，依次产出超出保留数量的旧文件
+
+        每组使用大小为number的最小堆保存当前最新的文件，新文件入堆时挤出的最旧文件即为可删除文件，
+        内存占用为O(number)而不是O(文件数)
+
+        Args:
+            records (Iterable[FileRecord]): 文件记录，dirs为False时目录直接通过
+            number (int): 保留数量
+            per_dir (bool, optional): 是否按所在目录分别保留. Defaults to False.
+            dirs (bool, optional): 目录与文件一起按修改时间保留，用于快速删除. Defaults to False.
+
+        Yields:
+            FileRecord: 不在保留范围内的文件或目录
+        """
+        heaps = {}
+        for record in records:
+            if record.is_dir and not dirs:
+                yield record
+                continue
+            key = os.path.dirname(record.path) if per_dir else None
+            heap = heaps.setdefault(key, [])
+            item = (record.mtime, record.path, record)
+            if len(heap) < number:
+                heapq.heappush(heap, item)
+            else:
+                yield heapq.heappushpop(heap, item)[2]
+
+    def iter_quota_expired(self, records, root_path: str, quota: int=0, free_space: int=0,
+                           result: DeleteResult=None) -> Iterator[FileRecord]:
+        """配额模式，从最旧的文件开始产出，直到匹配文件的总大小不超过quota并且磁盘剩余空间不少于free_space
+
+        需要读完所有记录才能确定删除哪些文件，排序使用ExternalSorter，内存中最多保存sort_buffer个文件；
+        产出的文件按扫描时的大小计入释放量，删除前校验失败或删除失败的文件由run()按实际释放的字节数报告差额
+
+        Args:
+            records (Iterable[FileRecord]): 文件记录，目录直接通过
+            root_path (str): 匹配目录，用于查询所在磁盘的剩余空间
+            quota (int, optional): 匹配文件总大小的上限(M)，0为不限制. Defaults to 0.
+            free_space (int, optional): 磁盘剩余空间的目标(M)，0为不限制. Defaults to 0.
+            result (DeleteResult, optional): 保存需要释放的字节数result.quota_excess. Defaults to None.
+
+        Yields:
+            FileRecord: 要删除的文件，按修改时间从旧到新
+        """
+        from external_sort import ExternalSorter
+        usage = 0
+        with ExternalSorter(self.sort_buffer, self.sort_tmp_dir) as sorter:
+            for record in records:
+                if record.is_dir:
+                    yield record
+                    continue
+                usage += record.size
+                sorter.add((record.mtime, record.path, record.size, record.cached))
+            excess = usage - quota * 1024 * 1024 if quota else 0
+            if free_space:
+                import shutil
+                try:
+                    free = shutil.disk_usage(root_path).free
+                except OSError as e:
+                    logger.error("获取剩余空间失败: %s, %s", root_path, e)
+                else:
+                    excess = max(excess, free_space * 1024 * 1024 - free)
+            logger.info("配额: 匹配文件%s个, 共%s字节, 需要释放%s字节", sorter.count, usage, max(excess, 0))
+            if result is not None:
+                result.quota_excess = max(excess, 0)
+            freed = 0
+            for mtime, path, size, cached in sorter.sorted():
+                if freed >= excess:
+                    break
+                freed += size
+                yield FileRecord(path, False, size, mtime, cached)
+            if freed < excess:
+                logger.warning("删除所有匹配的文件后仍未达到配额，还差%s字节", excess - freed)
+
+    def is_expired(self, mtime: float, days: int, now: float) -> bool:
+        """修改时间是否超过days天，与(datetime.now() - mod_time).days > days一致
+
+        Args:
+            mtime (float): 文件修改时间戳
+            days (int): 天数
+            now (float): 本次运行的当前时间戳
+        """
+        return (now - mtime) // 86400 > days
+
+    def delete_files_number(self,dir_path: str, pattern: str, number: int=None,days: int=None,test: bool=False,
+                            delete_workers: int=1,batch_size: int=100,recursive: bool=False,per_dir: bool=False,
+                            workers: int=1) -> DeleteResult:
+        """批量文件删除，支持保留数量, 名称匹配，日期匹配，递归子目录匹配
 
         Args:
             dir_path (str): 目录路径
             pattern (str): 文件名匹配规则
             number (int, optional): 保留数量. Defaults to None.
             days (int, optional): 天数. Defaults to None.
+            test (bool, optional): 测试模式，只打印不删除. Defaults to False.
+            delete_workers (int, optional): 删除线程数. Defaults to 1.
+            batch_size (int, optional): 每批删除的数量. Defaults to 100.
             recursive (bool, optional): 是否递归. Defaults to False.
+            per_dir (bool, optional): 是否按所在目录分别保留number个文件. Defaults to False.
+            workers (int, optional): 同时列出的目录数，大于1时并发遍历子目录. Defaults to 1.
+
+        Returns:
+            DeleteResult: 运行结果
         """
-        pattern_files = glob.glob(pathname=os.path.join(dir_path,pattern),recursive=False)
-        if number and days:
-            num_new_files,num_old_files = self.get_number_files(pattern_files,number)
-            old_days_files = self.get_days_files(pattern_files,days)
-            del_files= set(old_days_files).difference(num_new_files)
-        elif number:
-            num_new_files,num_old_files = self.get_number_files(pattern_files,number)
-            del_files = num_old_files
-        elif days:
-            del_files = self.get_days_files(pattern_files,days)
-        else:
-            del_files = pattern_files
-        
-        if del_files:
-            for file in del_files:
-                if os.path.isfile(file) and not test:
-                    os.remove(file)
-                    logger.info("delete: %s",file)
-                else:
-                    logger.info("delete test: %s",file)
-        else:
-            logger.info("没有匹配到文件")
+        task = {
+            "root_path": dir_path,
+            "pattern": pattern,
+            "recursive": recursive,
+            "days": days,
+            "number": number,
+            "number_per_dir": per_dir
+        }
+        return self.run(task,test,workers,delete_workers,batch_size)
     
     
-    def delete_files(self,root_path: str, pattern: str, recursive: bool=False, days: int=None,size: int=None,empty_dir: bool=False,test: bool=False):
+    def delete_files(self,root_path: str, pattern: str, recursive: bool=False, days: int=None,size: int=None,empty_dir: bool=False,test: bool=False,
+                     workers: int=1,delete_workers: int=1,batch_size: int=100) -> DeleteResult:
         """批量文件删除，支持名称匹配，日期匹配，递归子目录匹配
 
         Args:
             root_path (str): 匹配目录
             pattern (str): 匹配的名称
+            recursive (bool, optional): 是否递归. Defaults to False.
+            days (int, optional): 天数. Defaults to None.
+            size (int, optional): 文件大小(M). Defaults to None.
+            empty_dir (bool, optional): 是否删除空目录. Defaults to False.
+            test (bool, optional): 测试模式，只打印不删除. Defaults to False.
+            workers (int, optional): 同时列出的目录数，大于1时并发遍历子目录. Defaults to 1.
+            delete_workers (int, optional): 删除线程数. Defaults to 1.
+            batch_size (int, optional): 每批删除的数量. Defaults to 100.
 
         Returns:
-            list: 文件绝对路径的列表
+            DeleteResult: 运行结果
         """
-        files = glob.iglob(pathname=pattern,root_dir=root_path,recursive=recursive)  # 返回相对路径
-        for file in files:
-            file_path = os.path.join(root_path,file)
-            if os.path.isfile(file_path):
-                if days:            
-                    mod_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-                    if (datetime.now() - mod_time).days <= days:
-                        continue
-                if size:
-                    if os.path.getsize(file_path) < size * 1024 * 1024:
-                        continue
-                
-                if not test:
-                    os.remove(file_path)
-                    logger.info("delete: %s",file_path)
-                else:
-                    logger.info("delete test: %s",file_path)
-            elif not os.listdir(file_path) and empty_dir:
-                if not test:
-                    os.rmdir(file_path)
-                    logger.info("Deleted empty directory: %s", file_path)
-                else:
-                    logger.info("Deleted empty directory test: %s",file_path)
-
+        task = {
+            "root_path": root_path,
+            "pattern": pattern,
+            "recursive": recursive,
+            "days": days,
+            "size": size,
+            "empty_dir": empty_dir
+        }
+        return self.run(task,test,workers,delete_workers,batch_size)
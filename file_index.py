@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import stat
+import time
+import sqlite3
+import threading
+import logging
+
+logger = logging.getLogger('logger')
+
+# 目录修改时间与上次列目录时间相差小于该值时不信任索引，避免同一时间粒度内的修改被漏掉
+RACY_SECONDS = 2
+
+KIND_FILE = 0
+KIND_DIR = 1
+KIND_OTHER = 2
+
+
+class _IndexStat():
+    """索引中保存的文件元数据，属性与os.stat_result一致"""
+    __slots__ = ('st_size', 'st_mtime')
+
+    def __init__(self, size: int, mtime: float) -> None:
+        self.st_size = size
+        self.st_mtime = mtime
+
+
+class IndexEntry():
+    """索引中的目录条目，接口与os.DirEntry一致"""
+    __slots__ = ('name', 'path', 'kind', '_stat', 'cached')
+
+    def __init__(self, dir_path: str, name: str, kind: int, size: int, mtime: float, cached: bool) -> None:
+        self.name = name
+        self.path = os.path.join(dir_path, name)
+        self.kind = kind
+        self._stat = _IndexStat(size, mtime)
+        self.cached = cached
+
+    def is_dir(self) -> bool:
+        return self.kind == KIND_DIR
+
+    def is_file(self) -> bool:
+        return self.kind == KIND_FILE
+
+    def stat(self) -> _IndexStat:
+        return self._stat
+
+
+class FileIndex():
+    """持久化的目录元数据索引，用于增量扫描
+
+    保存每个目录的修改时间以及目录下条目的类型、大小和修改时间。
+    目录的修改时间未变化时直接从索引返回条目，不再列目录和stat文件
+    """
+    def __init__(self, db_file: str) -> None:
+        self.db_file = db_file
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_file, timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime_ns INTEGER, listed_ns INTEGER)')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS entries (dir TEXT, name TEXT, kind INTEGER, size INTEGER, mtime REAL, '
+                          'PRIMARY KEY (dir, name)) WITHOUT ROWID')
+        self.conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def list_dir(self, dir_path: str) -> list:
+        """列出目录条目，目录修改时间未变化时使用索引
+
+        Args:
+            dir_path (str): 目录路径
+
+        Returns:
+            list: IndexEntry列表
+        """
+        try:
+            dir_mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            return []
+        with self.lock:
+            row = self.conn.execute('SELECT mtime_ns, listed_ns FROM dirs WHERE path=?', (dir_path,)).fetchone()
+            if row and row[0] == dir_mtime_ns and dir_mtime_ns < row[1] - RACY_SECONDS * 10**9:
+                rows = self.conn.execute('SELECT name, kind, size, mtime FROM entries WHERE dir=?', (dir_path,)).fetchall()
+                self.hits += 1
+                return [IndexEntry(dir_path, *row, cached=True) for row in rows]
+            self.misses += 1
+        return self._rescan(dir_path, dir_mtime_ns)
+
+    def invalidate(self, dir_path: str):
+        """下次扫描时重新列出该目录"""
+        with self.lock:
+            self.conn.execute('DELETE FROM dirs WHERE path=?', (dir_path,))
+
+    def close(self):
+        with self.lock:
+            self.conn.commit()
+            self.conn.close()
+
+    def _rescan(self, dir_path: str, dir_mtime_ns: int) -> list:
+        listed_ns = time.time_ns()
+        entries = []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir():
+                            entries.append(IndexEntry(dir_path, entry.name, KIND_DIR, 0, 0.0, False))
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    kind = KIND_FILE if stat.S_ISREG(st.st_mode) else KIND_OTHER
+                    entries.append(IndexEntry(dir_path, entry.name, kind, st.st_size, st.st_mtime, False))
+        except OSError:
+            return []
+        with self.lock:
+            old_dirs = self.conn.execute('SELECT name FROM entries WHERE dir=? AND kind=?', (dir_path, KIND_DIR)).fetchall()
+            new_dirs = {entry.name for entry in entries if entry.kind == KIND_DIR}
+            for (name,) in old_dirs:
+                if name not in new_dirs:
+                    self._forget(os.path.join(dir_path, name))
+            self.conn.execute('DELETE FROM entries WHERE dir=?', (dir_path,))
+            self.conn.executemany('INSERT INTO entries VALUES (?, ?, ?, ?, ?)',
+                                  ((dir_path, entry.name, entry.kind, entry.stat().st_size, entry.stat().st_mtime) for entry in entries))
+            self.conn.execute('INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)', (dir_path, dir_mtime_ns, listed_ns))
+        return entries
+
+    def _forget(self, dir_path: str):
+        """删除已不存在的目录及其子目录的索引"""
+        prefix = dir_path.rstrip('/\\') + os.sep
+        like = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        self.conn.execute("DELETE FROM dirs WHERE path=? OR path LIKE ? ESCAPE '\\'", (dir_path, like))
+        self.conn.execute("DELETE FROM entries WHERE dir=? OR dir LIKE ? ESCAPE '\\'", (dir_path, like))
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import stat
+import fnmatch
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Iterator
+
+_MAGIC_CHECK = re.compile('([*?[])')
+
+
+def has_magic(part: str) -> bool:
+    return _MAGIC_CHECK.search(part) is not None
+
+
+def is_hidden(name: str) -> bool:
+    return name[0] == '.'
+
+
+def split_patterns(patterns) -> list:
+    """把任务中的匹配规则转为列表，字符串可以用";"分隔多个规则"""
+    if not patterns:
+        return []
+    if isinstance(patterns, str):
+        patterns = patterns.split(';')
+    return [pattern.strip() for pattern in patterns if pattern and pattern.strip()]
+
+
+class FileRecord():
+    """扫描得到的文件记录，每个文件只stat一次，cached表示元数据来自索引"""
+    __slots__ = ('path', 'is_dir', 'size', 'mtime', 'cached')
+
+    def __init__(self, path: str, is_dir: bool, size: int=0, mtime: float=0.0, cached: bool=False) -> None:
+        self.path = path
+        self.is_dir = is_dir
+        self.size = size
+        self.mtime = mtime
+        self.cached = cached
+
+    def __repr__(self) -> str:
+        return f'FileRecord({self.path!r}, is_dir={self.is_dir})'
+
+
+class _PathEntry():
+    """按路径直接构造的条目，接口与os.DirEntry一致"""
+    __slots__ = ('name', 'path', '_stat')
+
+    def __init__(self, dir_path: str, name: str) -> None:
+        self.name = name
+        self.path = os.path.join(dir_path, name)
+        self._stat = os.stat(self.path)
+
+    def is_dir(self) -> bool:
+        return stat.S_ISDIR(self._stat.st_mode)
+
+    def is_file(self) -> bool:
+        return stat.S_ISREG(self._stat.st_mode)
+
+    def stat(self) -> os.stat_result:
+        return self._stat
+
+
+class FileScanner():
+    """基于os.scandir的文件扫描器，单个匹配规则时语义与glob.iglob(pattern, root_dir=root_path, recursive=recursive)一致
+
+    多个包含规则和排除规则编译成一个匹配器，在同一次遍历中计算，每个目录只列一次；
+    条目类型使用DirEntry缓存的结果，文件只调用一次stat()；
+    workers大于1时使用线程池并发列目录，适合NFS/SMB等单目录延迟高的存储；
+    指定index时通过FileIndex列目录，修改时间未变化的目录直接使用索引中的条目；
+    dir_prune为True时匹配的目录作为整体产出，不再进入该目录
+    """
+    def __init__(self, root_path: str, pattern, recursive: bool=False, workers: int=1, index=None, exclude=None,
+                 cancel_event=None, progress=None, profiler=None, idle_io: bool=False, dir_prune: bool=False) -> None:
+        """
+        Args:
+            root_path (str): 匹配目录
+            pattern (str | list): 包含规则，字符串可以用";"分隔多个规则
+            recursive (bool, optional): "**"是否匹配多层目录. Defaults to False.
+            workers (int, optional): 同时列出的目录数. Defaults to 1.
+            index (FileIndex, optional): 元数据索引. Defaults to None.
+            exclude (str | list, optional): 排除规则，匹配的文件不产出，匹配的目录不再进入. Defaults to None.
+            cancel_event (threading.Event, optional): 设置后在处理下一个目录前停止扫描. Defaults to None.
+            progress (Callable[[int], None], optional): 每处理完一个目录调用一次，参数为已扫描的条目数. Defaults to None.
+            profiler (StageProfiler, optional): 统计列目录和读取文件信息的耗时. Defaults to None.
+            idle_io (bool, optional): 并发扫描的线程使用最低的IO优先级. Defaults to False.
+            dir_prune (bool, optional): 匹配的目录产出后不再进入，其中的条目不再匹配. Defaults to False.
+        """
+        self.root_path = root_path
+        self.recursive = recursive
+        self.workers = workers or 1
+        self.index = index
+        self.patterns = []
+        for pattern_str in split_patterns(pattern):
+            self.patterns.append(self._compile(pattern_str, False))
+        for pattern_str in split_patterns(exclude):
+            self.patterns.append(self._compile(pattern_str, True))
+        self.cancel_event = cancel_event
+        self.progress = progress
+        self.profiler = profiler
+        self.idle_io = idle_io
+        self.dir_prune = dir_prune
+        self.scanned = 0
+
+    def _compile(self, pattern: str, exclude: bool) -> tuple:
+        dir_only = pattern.endswith(('/', os.sep))
+        parts = tuple(part for part in re.split(r'[\\/]', pattern) if part)
+        return parts, dir_only, exclude
+
+    def scan(self) -> Iterator[FileRecord]:
+        """扫描匹配的文件和目录
+
+        Yields:
+            FileRecord: 匹配到的文件或目录记录
+        """
+        root_states = self._root_states()
+        if not self._has_include(root_states):
+            return
+        root = (self.root_path, root_states)
+        if self.workers > 1:
+            yield from self._scan_parallel(root)
+            return
+        stack = [root]
+        while stack and not self._cancelled():
+            dir_path, states = stack.pop()
+            entries = self._entries(dir_path, states)
+            yield from self._match_entries(entries, states, stack)
+            if self.progress is not None:
+                self.progress(self.scanned)
+
+    def match_path(self, path: str, is_dir: bool=False) -> bool:
+        """判断root_path下的某个路径是否匹配，与scan()的结果一致
+
+        Args:
+            path (str): 文件或目录路径
+            is_dir (bool, optional): 是否为目录. Defaults to False.
+        """
+        include, exclude = self._match_path(path, is_dir)
+        return include and not exclude
+
+    def is_excluded(self, path: str, is_dir: bool=False) -> bool:
+        """路径本身或所在的目录是否被排除规则匹配"""
+        return self._match_path(path, is_dir, check_include=False)[1]
+
+    def _match_path(self, path: str, is_dir: bool, check_include: bool=True) -> tuple:
+        rel_path = os.path.relpath(path, self.root_path)
+        if rel_path.startswith(os.pardir) or rel_path == os.curdir:
+            return False, False
+        states = self._root_states()
+        names = re.split(r'[\\/]', rel_path)
+        include = False
+        for depth, name in enumerate(names):
+            last = depth == len(names) - 1
+            if check_include and not self._has_include(states):
+                return False, False
+            states = self._closure(self._next_states(name, states))
+            include, exclude = self._accepts(states, is_dir or not last)
+            if exclude:
+                return include, True
+            if self.dir_prune and include and not last:
+                # 所在的目录已作为整体匹配，扫描时不会进入
+                return False, False
+        return include, False
+
+    def make_record(self, path: str):
+        """按路径生成记录，路径不存在或不是普通文件和目录时返回None"""
+        try:
+            entry = _PathEntry(os.path.dirname(path), os.path.basename(path))
+            return self._make_record(entry, entry.is_dir())
+        except OSError:
+            return None
+
+    def _root_states(self) -> set:
+        return self._closure({(pattern_index, 0) for pattern_index, (parts, _, _) in enumerate(self.patterns) if parts})
+
+    def _has_include(self, states: set) -> bool:
+        return any(not self.patterns[pattern_index][2] for pattern_index, _ in states)
+
+    def _scan_parallel(self, root: tuple) -> Iterator[FileRecord]:
+        """多线程并发列目录和stat，同时最多有workers个目录在处理，结果与串行扫描一致(顺序不同)"""
+        initializer = None
+        if self.idle_io:
+            from throttle import set_idle_io_priority
+            initializer = set_idle_io_priority
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='scan', initializer=initializer)
+        backlog = deque([root])
+        pending = set()
+        try:
+            while (backlog or pending) and not self._cancelled():
+                while backlog and len(pending) < self.workers:
+                    pending.add(pool.submit(self._visit, *backlog.popleft()))
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    records, children, count = future.result()
+                    self.scanned += count
+                    backlog.extend(children)
+                    yield from records
+                if self.progress is not None:
+                    self.progress(self.scanned)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _cancelled(self) -> bool:
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def _visit(self, dir_path: str, states: set) -> tuple:
+        """在工作线程中处理一个目录，返回(匹配记录, 子目录, 条目数)"""
+        entries = self._entries(dir_path, states)
+        children = []
+        records = list(self._match_entries(entries, states, children, count=False))
+        return records, children, len(entries)
+
+    def _match_entries(self, entries: list, states: set, children, count: bool=True) -> Iterator[FileRecord]:
+        """匹配一个目录的条目，需要继续深入的子目录追加到children"""
+        if count:
+            self.scanned += len(entries)
+        for entry in entries:
+            next_states = self._next_states(entry.name, states)
+            if not next_states:
+                continue
+            closure = self._closure(next_states)
+            try:
+                is_dir = entry.is_dir()
+                include, exclude = self._accepts(closure, is_dir)
+                if exclude:
+                    continue
+                record = self._make_record(entry, is_dir) if include else None
+            except OSError:
+                continue
+            if record is not None:
+                yield record
+            if is_dir and not (include and self.dir_prune):
+                child_states = {(pattern_index, index) for pattern_index, index in closure
+                                if index < len(self.patterns[pattern_index][0])}
+                if self._has_include(child_states):
+                    children.append((entry.path, child_states))
+
+    def _accepts(self, states: set, is_dir: bool) -> tuple:
+        """返回(是否被包含规则匹配, 是否被排除规则匹配)"""
+        include = exclude = False
+        for pattern_index, index in states:
+            parts, dir_only, is_exclude = self.patterns[pattern_index]
+            if index == len(parts) and (is_dir or not dir_only):
+                if is_exclude:
+                    exclude = True
+                else:
+                    include = True
+        return include, exclude
+
+    def _is_recursive_part(self, part: str) -> bool:
+        return self.recursive and part == '**'
+
+    def _closure(self, states: set) -> set:
+        """补全"**"可以匹配零层目录的状态"""
+        closure = set(states)
+        for pattern_index, index in states:
+            parts = self.patterns[pattern_index][0]
+            while index < len(parts) and self._is_recursive_part(parts[index]):
+                index += 1
+                closure.add((pattern_index, index))
+        return closure
+
+    def _next_states(self, name: str, states: set) -> set:
+        next_states = set()
+        for pattern_index, index in states:
+            parts = self.patterns[pattern_index][0]
+            if index >= len(parts):
+                continue
+            part = parts[index]
+            if self._is_recursive_part(part):
+                if not is_hidden(name):
+                    next_states.add((pattern_index, index))
+            elif not has_magic(part):
+                if os.path.normcase(name) == os.path.normcase(part):
+                    next_states.add((pattern_index, index + 1))
+            elif (is_hidden(part) or not is_hidden(name)) and fnmatch.fnmatch(name, part):
+                next_states.add((pattern_index, index + 1))
+        return next_states
+
+    def _entries(self, dir_path: str, states: set) -> list:
+        if self.profiler is not None:
+            with self.profiler.timer("list"):
+                return self._list_entries(dir_path, states)
+        return self._list_entries(dir_path, states)
+
+    def _list_entries(self, dir_path: str, states: set) -> list:
+        """列出目录条目，包含规则全部为普通名称时直接按路径查找，不列目录"""
+        parts = set()
+        for pattern_index, index in states:
+            pattern_parts, _, is_exclude = self.patterns[pattern_index]
+            if not is_exclude and index < len(pattern_parts):
+                parts.add(pattern_parts[index])
+        if all(not has_magic(part) for part in parts):
+            entries = []
+            for name in parts:
+                try:
+                    entries.append(_PathEntry(dir_path, name))
+                except OSError:
+                    pass
+            return entries
+        if self.index is not None:
+            return self.index.list_dir(dir_path)
+        try:
+            with os.scandir(dir_path) as it:
+                return list(it)
+        except OSError:
+            return []
+
+    def _make_record(self, entry, is_dir: bool):
+        if is_dir:
+            return FileRecord(entry.path, True)
+        if not entry.is_file():
+            return None
+        if self.profiler is not None:
+            with self.profiler.timer("stat"):
+                st = entry.stat()
+        else:
+            st = entry.stat()
+        return FileRecord(entry.path, False, st.st_size, st.st_mtime, getattr(entry, 'cached', False))
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import errno
+import struct
+import select
+import threading
+import logging
+
+from file_scan import FileScanner
+
+logger = logging.getLogger('logger')
+
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class _Inotify():
+    """通过ctypes调用Linux inotify接口"""
+    def __init__(self) -> None:
+        import ctypes
+        import ctypes.util
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.get_errno = ctypes.get_errno
+
+    def add_watch(self, path: str, mask: int) -> int:
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = self.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def read_events(self, timeout: float) -> list:
+        """读取事件，返回(wd, mask, name)列表"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            events.append((wd, mask, name))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class CandidateWatcher():
+    """在定时任务的两次运行之间维护任务匹配的文件集合
+
+    Linux上使用inotify跟踪文件变化，其他系统或inotify不可用时每隔interval秒重新扫描一次。
+    添加监听和第一次扫描都在监听线程中进行，ready设置前任务仍按原来的方式扫描目录。
+    集合中只保存名称匹配的文件和目录，天数、大小、数量等条件在任务运行时再计算，
+    删除前会重新检查文件的大小和修改时间
+    """
+    def __init__(self, task: dict, interval: int=300) -> None:
+        self.task = task
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.scanner = FileScanner(task.get("root_path"), task.get("pattern") or "*",
+                                   recursive=bool(task.get("recursive")), exclude=task.get("exclude"),
+                                   cancel_event=self.stop_event, dir_prune=bool(task.get("fast_delete")))
+        self.records = {}
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.thread = None
+        self.inotify = None
+        self.wds = {}
+
+    def start(self):
+        """启动监听线程，立即返回"""
+        self.thread = threading.Thread(target=self._run, name='watch', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+        logger.info("停止监听: %s", self.scanner.root_path)
+
+    def available(self) -> bool:
+        """第一次扫描已完成并且监听线程仍在运行，此时snapshot()的结果可以代替扫描"""
+        return self.ready.is_set() and self.thread is not None and self.thread.is_alive()
+
+    def snapshot(self) -> list:
+        """当前匹配的文件和目录记录"""
+        with self.lock:
+            return list(self.records.values())
+
+    def _rescan(self):
+        records = {}
+        for record in self.scanner.scan():
+            record.cached = True
+            records[record.path] = record
+        with self.lock:
+            self.records = records
+
+    def _run(self):
+        if sys.platform.startswith('linux'):
+            try:
+                self.inotify = _Inotify()
+            except OSError as e:
+                logger.warning("inotify不可用，使用轮询: %s", e)
+        try:
+            if self.inotify:
+                try:
+                    self._watch_tree(self.scanner.root_path)
+                except OSError as e:
+                    logger.warning("inotify监听数量不足，使用轮询: %s", e)
+                    self.inotify.close()
+                    self.inotify = None
+                    self.wds = {}
+            self._rescan()
+            if self.stop_event.is_set():
+                return
+            self.ready.set()
+            logger.info("开始监听: %s, 匹配%s个", self.scanner.root_path, len(self.records))
+            if self.inotify:
+                self._inotify_loop()
+            else:
+                self._poll_loop()
+        except Exception:
+            logger.exception("监听失败: %s", self.scanner.root_path)
+        finally:
+            if self.inotify:
+                self.inotify.close()
+                self.inotify = None
+
+    def _poll_loop(self):
+        while not self.stop_event.wait(self.interval):
+            self._rescan()
+
+    def _inotify_loop(self):
+        while not self.stop_event.is_set():
+            try:
+                events = self.inotify.read_events(1.0)
+            except OSError as e:
+                logger.error("读取inotify事件失败: %s", e)
+                return
+            for wd, mask, name in events:
+                if mask & IN_Q_OVERFLOW:
+                    logger.warning("inotify事件队列溢出，重新扫描: %s", self.scanner.root_path)
+                    self._rescan()
+                    continue
+                dir_paths = self.wds.get(wd)
+                if dir_paths is None:
+                    continue
+                if mask & IN_IGNORED:
+                    del self.wds[wd]
+                    continue
+                if not name:
+                    continue
+                # 同一个目录可能通过符号链接出现在多个路径下
+                for dir_path in list(dir_paths):
+                    self._handle_event(os.path.join(dir_path, name), mask)
+
+    def _handle_event(self, path: str, mask: int):
+        if mask & (IN_DELETE | IN_MOVED_FROM):
+            self._remove(path, bool(mask & IN_ISDIR))
+            return
+        if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+            # 新目录在添加监听之前可能已经写入了文件，需要补扫一次
+            try:
+                self._watch_tree(path)
+            except OSError as e:
+                logger.warning("添加监听失败: %s", e)
+            for dir_path, dir_names, file_names in self._walk(path):
+                for name in dir_names + file_names:
+                    self._update(os.path.join(dir_path, name))
+        self._update(path)
+
+    def _update(self, path: str):
+        record = self.scanner.make_record(path)
+        if record is None or not self.scanner.match_path(path, record.is_dir):
+            self._remove(path)
+            return
+        record.cached = True
+        with self.lock:
+            self.records[path] = record
+
+    def _remove(self, path: str, is_dir: bool=False):
+        with self.lock:
+            self.records.pop(path, None)
+            if is_dir:
+                prefix = path + os.sep
+                for key in [key for key in self.records if key.startswith(prefix)]:
+                    del self.records[key]
+
+    def _watch_tree(self, top: str):
+        for dir_path, _, _ in self._walk(top):
+            try:
+                dir_paths = self.wds.setdefault(self.inotify.add_watch(dir_path, WATCH_MASK), [])
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    raise
+                logger.warning("添加监听失败: %s", e)
+                continue
+            if dir_path not in dir_paths:
+                dir_paths.append(dir_path)
+
+    def _walk(self, top: str):
+        """与扫描一致地进入符号链接指向的目录，跳过指向上级目录的链接避免循环，停止监听时中断"""
+        for dir_path, dir_names, file_names in os.walk(top, followlinks=True):
+            if self.stop_event.is_set():
+                return
+            real_path = os.path.realpath(dir_path)
+            dir_names[:] = [name for name in dir_names
+                            if not _is_ancestor(os.path.realpath(os.path.join(dir_path, name)), real_path)]
+            yield dir_path, dir_names, file_names
+
+
+def _is_ancestor(path: str, child: str) -> bool:
+    """path是否为child本身或child的上级目录"""
+    return child == path or child.startswith(path.rstrip(os.sep) + os.sep)
+
+
+class WatchManage():
+    """按定时任务id管理监听器，随任务的启动、暂停和删除开始或停止监听"""
+    def __init__(self) -> None:
+        self.watchers = {}
+        self.lock = threading.Lock()
+
+    def start(self, id: str, task: dict):
+        self.stop(id)
+        watcher = CandidateWatcher(task)
+        watcher.start()
+        with self.lock:
+            self.watchers[str(id)] = watcher
+
+    def stop(self, id: str):
+        with self.lock:
+            watcher = self.watchers.pop(str(id), None)
+        if watcher:
+            watcher.stop()
+
+    def get(self, id: str) -> CandidateWatcher:
+        with self.lock:
+            return self.watchers.get(str(id))
+
+
+WATCH_MANAGE = WatchManage()
@@ -1,11 +1,24 @@
 import os
 import sys
+import queue
+import atexit
 import logging
+import threading
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
-from PyQt6.QtWidgets import QTextEdit
+from typing import TYPE_CHECKING
 
+# 命令行模式不加载PyQt6，只在类型检查时导入
+if TYPE_CHECKING:
+    from PyQt6.QtWidgets import QTextEdit
 
-def init_logger():
+
+def init_logger(use_queue: bool=True):
+    """初始化日志，写入程序目录下的logs/log_YYYYMMDD.log
+
+    use_queue为True时文件写入在单独的线程中进行，记录日志的线程(如删除线程)不会因为磁盘写入而阻塞
+    """
     logger = logging.getLogger("logger")
     logger.setLevel(logging.DEBUG)
     formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
@@ -16,20 +29,74 @@ def init_logger():
     os.makedirs(os.path.dirname(log_file_name), exist_ok=True)
     file_handler = logging.FileHandler(log_file_name,encoding='utf-8')
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    if use_queue:
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        # 退出前写完队列中的日志
+        atexit.register(listener.stop)
+        logger.addHandler(QueueHandler(log_queue))
+    else:
+        logger.addHandler(file_handler)
     
     return logger
 
 class QTextEditHandler(logging.Handler):
-    def __init__(self, parent: QTextEdit):
+    """把日志显示到QTextEdit
+
+    任意线程记录的日志先放入队列，由界面线程的定时器每interval毫秒批量写入控件，每次最多batch_size条；
+    控件最多保留max_lines行，超出时删除最早的行；队列最多缓存max_pending条，界面来不及显示时丢弃较早的日志
+    """
+    def __init__(self, parent: 'QTextEdit', max_lines: int=5000, batch_size: int=500, interval: int=100,
+                 max_pending: int=20000):
+        from PyQt6.QtCore import QTimer
         super().__init__()
         self.text_edit = parent
+        self.text_edit.document().setMaximumBlockCount(max_lines)
         self.formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
+        self.batch_size = batch_size
+        self.pending = deque()
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.pending_lock = threading.Lock()
+        self.timer = QTimer(parent)
+        self.timer.timeout.connect(self.flush_pending)
+        self.timer.start(interval)
  
     def emit(self, record):
-        msg = self.format(record)
-        self.text_edit.append(msg)
-        self.text_edit.ensureCursorVisible()
+        try:
+            msg = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self.pending_lock:
+            if len(self.pending) >= self.max_pending:
+                self.pending.popleft()
+                self.dropped += 1
+            self.pending.append(msg)
+    
+    def flush_pending(self):
+        """在界面线程中把队列中的日志写入控件"""
+        with self.pending_lock:
+            if not self.pending:
+                return
+            count = min(len(self.pending), self.batch_size)
+            msgs = [self.pending.popleft() for _ in range(count)]
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            msgs.insert(0, f'<span style="color:orange">日志过多，省略了{dropped}条</span>')
+        
+        from PyQt6.QtGui import QTextCursor
+        cursor = QTextCursor(self.text_edit.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        for msg in msgs:
+            if not self.text_edit.document().isEmpty():
+                cursor.insertBlock()
+            cursor.insertHtml(msg)
+        cursor.endEditBlock()
+        scroll_bar = self.text_edit.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum())
  
     def format(self, record):
         if record.levelno == logging.DEBUG:
@@ -2,26 +2,24 @@
 # /usr/bin/env python3
 
 import sys
-import json
 import traceback
 import time
 import os
+import threading
+import multiprocessing
 
-from PyQt6.QtWidgets import QApplication, QWidget,QTableWidgetItem,QDialog,QMainWindow,QMessageBox,QFileDialog,QHeaderView, QSystemTrayIcon,QMenu
+from PyQt6.QtWidgets import QApplication, QWidget,QTableWidgetItem,QDialog,QMainWindow,QMessageBox,QFileDialog,QHeaderView, QSystemTrayIcon,QMenu,QProgressDialog
 from PyQt6.QtGui import QIcon,QAction
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt,QThread,pyqtSignal
 
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.schedulers.base import BaseScheduler
-from apscheduler.job import Job
-from apscheduler.triggers.interval import IntervalTrigger
-from apscheduler.triggers.date import DateTrigger
-from apscheduler.triggers.cron import CronTrigger
-from win32com.client import Dispatch
 
 from MainWindowUI  import Ui_MainWindow
 from InputDialogUI import Ui_InputDialog
-from file_delete import FileDelete
+from ReportDialogUI import Ui_ReportDialog
+from file_scan import split_patterns
+from file_delete import check_task
+from task_manage import taskModel,taskManager,ScheduleManage,ConfigManage,create_scheduler
+from run_history import TRIGGER_TEXT
 from logger_conf import init_logger,QTextEditHandler
 
 import resource_rc # type: ignore
@@ -52,6 +50,8 @@ class AutoStart():
         return shortcut_location
 
     def create_shortcut(self,shortcut_location):
+        # 只在Windows上修改开机自启时用到
+        from win32com.client import Dispatch
         shell = Dispatch("WScript.Shell")
         shortcut = shell.CreateShortCut(shortcut_location)
         shortcut.Targetpath = self.exe_path
@@ -67,238 +67,6 @@ class AutoStart():
             print("没有找到快捷方式")
     
 
-class taskModel():
-    name = None
-    root_path = None
-    pattern = "*"
-    recursive = False
-    days = 0
-    size = 0
-    number = 0
-    trigger_args = None
-    status = 0
-    
-    def __init__(self, name: str, root_path: str,pattern: str="*",recursive: bool=False,
-                 days: int=0,size: int =0,number: int=0,trigger_args: str=None,status: int=0) -> None:
-        self.name = name
-        self.root_path = root_path
-        self.pattern = pattern
-        self.recursive = recursive
-        self.days = days
-        self.size = size
-        self.number = number
-        self.trigger_args = trigger_args
-        self.status = status
-    
-    def task_data(self):
-        task = {
-            "name": self.name,
-            "root_path": self.root_path,
-            "pattern": self.pattern,
-            "recursive": self.recursive,
-            "days": self.days,
-            "size": self.size,
-            "number": self.number,
-            "trigger_args": self.trigger_args,
-            "status": self.status
-            }
-        
-        return task
-    
-
-class taskManager():
-    
-    @classmethod
-    def start_delete_task(cls,task,test: bool=False):
-        file_delete  = FileDelete()
-        file_delete.main(
-            root_path=task.get("root_path"),
-            pattern=task.get("pattern"),
-            recursive=task.get("recursive"),
-            days=task.get("days"),
-            size=task.get("size"),
-            test=test
-        )
-    
-    @classmethod
-    def start_delete_task_full(cls,index,test: bool=False):
-        config_ins = ConfigManage()
-        task = config_ins.get_config("tasks")[index]
-        cls.start_delete_task(task,test)
-    
-    @classmethod
-    def load_sched_job(cls):
-        """加载任务到定时器"""
-        sched_manage = ScheduleManage(SCHEDULER)
-        config_manage = ConfigManage()
-        tasks = config_manage.get_config("tasks")
-        for index,task in enumerate(tasks):
-            if task.get('status') == 1:
-                if not sched_manage.job_exists(str(index)):
-                    sched_manage.add_job(str(index),task['trigger_args'])
-            elif task.get('status') == 2:
-                if not sched_manage.job_exists(str(str(index))):
-                    sched_manage.add_job(str(index),task['trigger_args'])
-                sched_manage.pause_job(str(str(index)))
-
-
-class ScheduleManage():
-    def __init__(self, scheduler: BaseScheduler) -> None:
-        self.scheduler = scheduler
-    
-    
-    def str_schedule_task(self,job: Job):
-        """定时任务格式化"""        
-        next_run_time: time = job.next_run_time
-        next_run_time = next_run_time.strftime("%Y-%m-%d %H:%M:%S") if next_run_time else None
-        job_data = {
-            "id": job.id,
-            "next_run_time": next_run_time if next_run_time else ""
-        }
-        return job_data
-        
-    def get_schedule_tasks(self):
-        jobs: list = self.scheduler.get_jobs()
-        schedule_tasks: list = []
-        tasks = ConfigManage().get_config("tasks")
-        for job in jobs:
-            schedule_task = self.str_schedule_task(job)
-            id =  schedule_task.get('id')
-            task: dict = tasks[int(id)]
-            schedule_task['name'] = task.get("name")
-            schedule_task['trigger_args'] = task.get("trigger_args")
-            next_run_time = schedule_task.get('next_run_time')
-            if next_run_time:
-                schedule_task['status'] = "正在运行"
-            else:
-                schedule_task['status'] = "暂停"
-            
-            schedule_tasks.append(schedule_task)
-        return schedule_tasks
-    
-    def add_job(self,id:str,trigger_args:str):
-        
-        trigger = self.parse_trigger("cron",trigger_args)
-        if trigger is None:
-            return
-        self.scheduler.add_job(
-            func=taskManager.start_delete_task_full,
-            trigger=trigger,id=str(id),
-            replace_existing=True,args=[id],coalesce=True
-            )
-    
-    def parse_trigger(self, trigger, trigger_args):
-        if trigger == 'interval':
-            return IntervalTrigger(seconds=int(trigger_args))
-        elif trigger == 'date':
-            return DateTrigger(run_date=trigger_args)
-        elif trigger == 'cron':
-            trigger_args = trigger_args.strip()
-            try:
-                second,minute,hour,day, month, week = trigger_args.split()
-                return CronTrigger(second=second,minute=minute, hour=hour, day=day, month=month, day_of_week=week)
-            except ValueError:
-                logger.error(f'定时参数有误:{trigger_args}')
-                return None
-            # return CronTrigger.from_crontab(trigger_args)
-        else:
-            raise TypeError(f'unknown schedule policy: {trigger!r}')
-    
-    def resume_job(self,id: str):
-        job: Job = self.scheduler.get_job(job_id=str(id))
-        job.resume()
-    
-    def pause_job(self,id: str):
-        job: Job = self.scheduler.get_job(job_id=str(id))
-        job.pause()
-    
-    def remove_job(self,id: str):
-        job: Job = self.scheduler.get_job(job_id=str(id))
-        job.remove()
-    
-    def job_exists(self, job_id: str):
-        return job_id in self.scheduler.get_jobs()
-
-class ConfigManage():
-    def __init__(self, file: str=None) -> None:
-        if not file:
-            exe_path = sys.executable if getattr(sys, 'frozen', False) else sys.argv[0]
-            dir_path = os.path.dirname(exe_path)
-            self.file = os.path.join(dir_path,'config.json')
-        self.init_config()
-            
-    def init_config(self):
-        if os.path.exists(self.file):
-            return
-        
-        config = {
-            "auto_start": False,
-            "show_task_col": ["name","root_path","pattern","recursive","days","size","number","trigger_args","status"],
-            "tasks": []
-        }
-        with open(self.file, 'w',encoding="utf-8") as f:
-            json.dump(config,f,ensure_ascii=False,indent=2)
-
-    
-    def get_config(self, root_key: str=None):
-        with open(self.file, 'r',encoding='utf-8') as f:
-            config = json.load(f)
-        
-        if root_key:
-            config = config.get(root_key)
-        return config
-    
-    def add_task(self,task: taskModel):
-        config: dict = self.get_config()
-        tasks: list = config.get('tasks')
-        task_data = task.task_data()
-        tasks.append(task_data)
-        with open(self.file, 'w',encoding="utf-8") as f:
-            json.dump(config,f,ensure_ascii=False,indent=2)
-    
-    def change_task(self,index,task: taskModel):
-        config: dict = self.get_config()
-        tasks: list = config.get('tasks')
-        
-        task_data = task.task_data()
-        tasks[index] = task_data
-        with open(self.file, 'w',encoding="utf-8") as f:
-            json.dump(config,f,ensure_ascii=False,indent=2)
-    
-    def del_task(self,index):
-        config: dict = self.get_config()
-        tasks: list = config.get('tasks') 
-        del tasks[index]
-        with open(self.file, 'w',encoding="utf-8") as f:
-            json.dump(config,f,ensure_ascii=False,indent=2)
-    
-    def load_task_data(self,index):
-        config: dict = self.get_config()
-        task: dict = config.get('tasks')[index]
-        task_model = taskModel(**task)
-        
-        return task_model
-    
-    def change_task_status(self,index,status):
-        config: dict = self.get_config()
-        tasks: list = config.get('tasks') 
-        task: dict = tasks[index]
-        task['status'] = status
-        with open(self.file, 'w',encoding="utf-8") as f:
-            json.dump(config,f,ensure_ascii=False,indent=2)
-    
-    def change_auto_start(self,status: bool=False):
-        """修改开机自启状态"""
-        config: dict = self.get_config()
-        config['auto_start'] = status
-        with open(self.file, 'w',encoding="utf-8") as f:
-            json.dump(config,f,ensure_ascii=False,indent=2)
-    
-    def get_auto_start(self):
-        """获取开机自启状态"""
-        config: dict = self.get_config()
-        return config.get('auto_start',False)
-
 class MinimizeToTray():
     """最小化到托盘"""
     
@@ -354,6 +122,38 @@ class MinimizeToTray():
         
         
         
+class DeleteWorker(QThread):
+    """在后台线程中运行手动删除任务，避免界面卡住"""
+    # 扫描数、匹配数、删除数、释放的字节数
+    progress = pyqtSignal(int,int,int,int)
+    result_ready = pyqtSignal(object)
+    
+    def __init__(self,task: dict,test: bool=False,parent=None,profile: bool=False,profile_file: str=None) -> None:
+        super().__init__(parent)
+        self.task = task
+        self.test = test
+        self.profile = profile
+        self.profile_file = profile_file
+        self.cancel_event = threading.Event()
+    
+    def run(self):
+        result = None
+        try:
+            result = taskManager.start_delete_task(task=self.task,test=self.test,
+                                                   progress=self.report,cancel_event=self.cancel_event,
+                                                   profile=self.profile,profile_file=self.profile_file)
+        except Exception:
+            logger.exception("任务%s运行失败",self.task.get("name"))
+        self.result_ready.emit(result)
+    
+    def report(self,result):
+        self.progress.emit(result.scanned,result.matched,result.deleted,result.bytes_freed)
+    
+    def cancel(self):
+        """当前批次删除完后停止"""
+        self.cancel_event.set()
+
+
 class MainWindows(QMainWindow):
     def __init__(self, *args, **kwargs) -> None:
         super().__init__()
@@ -362,6 +162,10 @@ class MainWindows(QMainWindow):
         
         self.select_row = None
         self.sched_select_row = None
+        # 正在运行的手动任务
+        self.delete_workers = []
+        # 任务列表每一行对应的任务id
+        self.task_ids = []
         self.__ui = Ui_MainWindow()
         self.__ui.setupUi(self)
         self.setWindowIcon(QIcon(":/icon.ico"))
@@ -380,6 +184,7 @@ class MainWindows(QMainWindow):
         self.__ui.delButton.clicked.connect(self.show_del_dialog)
         self.__ui.fmdButton.clicked.connect(self.show_start_dialog)
         self.__ui.fmdtButton.clicked.connect(lambda: self.show_start_dialog(test=True))
+        self.__ui.profileButton.clicked.connect(self.show_profile_dialog)
         self.__ui.startTaskButton.clicked.connect(self.start_schedule_task)
         # 开机启动配置
         self.__ui.autoStartCheckBox.setChecked(self.config_manage.get_auto_start())
@@ -397,6 +202,16 @@ class MainWindows(QMainWindow):
         self.__ui.sched_stopButton.clicked.connect(self.stop_sched_job)
         self.__ui.sched_delButton.clicked.connect(self.remove_sched_job)
         
+        ## 运行记录tag
+        self.history_task_id = None
+        self.history_task_ids = []
+        self.__ui.history_horizontalLayout.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        self.__ui.history_summaryTable.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.__ui.history_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.__ui.history_summaryTable.itemSelectionChanged.connect(self.history_handleItemSelectionChanged)
+        self.__ui.history_refreshButton.clicked.connect(self.show_history)
+        self.__ui.history_allButton.clicked.connect(self.show_all_history)
+        
         ## 日志tag
         self.logger_conf()
         self.__ui.log_horizontalLayout.setAlignment(Qt.AlignmentFlag.AlignLeft)
@@ -412,6 +227,8 @@ class MainWindows(QMainWindow):
          index = self.__ui.tabWidget.currentIndex()
          if index == 1:
              self.show_schedule_table()
+         elif index == 2:
+             self.show_history()
     
     def logger_conf(self):
         log_edit = self.__ui.logEdit
@@ -429,10 +246,12 @@ class MainWindows(QMainWindow):
         config = self.config_manage.get_config()
         
         show_task_col = config.get("show_task_col")
+        self.task_ids = [task['id'] for task in config['tasks']]
         for index,task in enumerate(config['tasks']):
             table_list.insertRow(index)
             for col in range(col_count):
-                text = str(task.get(show_task_col[col]))
+                value = task.get(show_task_col[col])
+                text = ";".join(value) if isinstance(value,list) else str(value)
                 if show_task_col[col] == "recursive":
                     if text == "True":
                         text = "是"
@@ -462,39 +281,107 @@ class MainWindows(QMainWindow):
         if items:
             self.select_row = items[0].row()
     
+    def select_task_id(self):
+        """任务列表中选中行的任务id"""
+        if self.select_row is None or self.select_row >= len(self.task_ids):
+            return None
+        return self.task_ids[self.select_row]
+    
     def change_task(self):
-        if self.select_row is None:
+        task_id = self.select_task_id()
+        if task_id is None:
             return
-        dialog = InputDialog(self,mode="change",select_row=self.select_row)
-        dialog.set_input_text(self.select_row)
+        dialog = InputDialog(self,mode="change",task_id=task_id)
+        dialog.set_input_text(task_id)
         dialog.exec()
         self.show_tasks()
     
     def show_del_dialog(self):
-        if self.select_row is None:
+        task_id = self.select_task_id()
+        if task_id is None:
             return 
         
-        tasks = self.config_manage.get_config("tasks")
-        tasks_name = tasks[self.select_row]['name']
+        tasks_name = self.config_manage.get_task(task_id)['name']
         result = QMessageBox.warning(self, '任务删除', f'是否确认删除"{tasks_name}"任务？', QMessageBox.StandardButton.No | QMessageBox.StandardButton.Ok)
         if result == QMessageBox.StandardButton.Ok:
-            self.config_manage.del_task(self.select_row)
+            if self.sched_manage.job_exists(task_id):
+                self.sched_manage.remove_job(task_id)
+            self.config_manage.del_task(task_id)
+            self.select_row = None
             self.show_tasks()
     
     def show_start_dialog(self,test: bool=False):
-        if self.select_row is None:
+        task_id = self.select_task_id()
+        if task_id is None:
             return 
         
-        task = self.config_manage.get_config("tasks")[self.select_row]
+        task = self.config_manage.get_task(task_id)
         task_name = task['name']
         if test:
             result = QMessageBox.information(self, '删除任务启动测试', f'是否确认启动"{task_name}"任务？', QMessageBox.StandardButton.No | QMessageBox.StandardButton.Ok)
             if result == QMessageBox.StandardButton.Ok:
-                taskManager().start_delete_task(task=task,test=True)
+                self.start_manual_task(task,test=True)
         else:
             result = QMessageBox.information(self, '删除任务启动', f'是否确认启动"{task_name}"任务？', QMessageBox.StandardButton.No | QMessageBox.StandardButton.Ok)
             if result == QMessageBox.StandardButton.Ok:
-                taskManager().start_delete_task(task=task)
+                self.start_manual_task(task)
+    
+    def show_profile_dialog(self):
+        """以测试模式运行任务并统计各阶段耗时，cProfile结果保存到logs目录"""
+        task_id = self.select_task_id()
+        if task_id is None:
+            return 
+        
+        task = self.config_manage.get_task(task_id)
+        task_name = task['name']
+        result = QMessageBox.information(self, '性能分析', f'是否确认以测试模式运行"{task_name}"任务并统计耗时？', QMessageBox.StandardButton.No | QMessageBox.StandardButton.Ok)
+        if result == QMessageBox.StandardButton.Ok:
+            log_dir = os.path.join(os.path.dirname(os.path.abspath(sys.argv[0])), 'logs')
+            os.makedirs(log_dir, exist_ok=True)
+            profile_file = os.path.join(log_dir, f'profile_{task_id}_{time.strftime("%Y%m%d%H%M%S")}.prof')
+            self.start_manual_task(task,test=True,profile=True,profile_file=profile_file)
+    
+    def start_manual_task(self,task: dict,test: bool=False,profile: bool=False,profile_file: str=None):
+        """在后台线程中运行任务，显示进度，可以取消"""
+        title = '删除任务测试' if test else '删除任务'
+        if profile:
+            title = '性能分析'
+        dialog = QProgressDialog(f'"{task["name"]}"正在扫描...', '取消', 0, 0, self)
+        dialog.setWindowTitle(title)
+        dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(0)
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+        
+        worker = DeleteWorker(task,test,self,profile,profile_file)
+        self.delete_workers.append(worker)
+        
+        def on_progress(scanned: int,matched: int,deleted: int,bytes_freed: int):
+            dialog.setLabelText(f'"{task["name"]}"\n已扫描{scanned}个, 匹配{matched}个, 删除{deleted}个, 释放{bytes_freed}字节')
+        
+        def on_cancel():
+            dialog.setLabelText(f'"{task["name"]}"正在取消...')
+            worker.cancel()
+        
+        def on_result(result):
+            dialog.canceled.disconnect(on_cancel)
+            dialog.close()
+            self.delete_workers.remove(worker)
+            if result is None:
+                QMessageBox.critical(self, title, f'"{task["name"]}"运行失败，详见日志')
+            elif profile:
+                stages = "\n".join(f'{text}: {seconds:.3f}秒, {count}次' for _,text,seconds,count in result.profile or [])
+                QMessageBox.information(self, title, f'"{task["name"]}"完成: {result}\n\n{stages}\n\ncProfile结果: {profile_file}')
+            elif test and result.report is not None and result.matched:
+                report_dialog = ReportDialog(result.report,f'"{task["name"]}"完成: {result}',self)
+                report_dialog.exec()
+            else:
+                QMessageBox.information(self, title, f'"{task["name"]}"完成: {result}')
+        
+        worker.progress.connect(on_progress)
+        worker.result_ready.connect(on_result)
+        dialog.canceled.connect(on_cancel)
+        worker.start()
     
     def auto_start(self):
         """开机启动"""
@@ -508,19 +395,19 @@ class MainWindows(QMainWindow):
     
     def start_schedule_task(self):
         """启动定时删除任务"""
-        if self.select_row is None:
+        task_id = self.select_task_id()
+        if task_id is None:
             return 
         
-        config_ins = self.config_manage
-        task = config_ins.get_config("tasks")[self.select_row]
+        task = self.config_manage.get_task(task_id)
         task_name = task['name']
         task_trigger = task['trigger_args']
         result = QMessageBox.warning(self, '启动定时删除任务', f'是否确认启动"{task_name}"定时删除任务？', QMessageBox.StandardButton.No | QMessageBox.StandardButton.Ok)
         
         if result == QMessageBox.StandardButton.Ok:
-            self.sched_manage.add_job(self.select_row,task_trigger)
+            self.sched_manage.add_job(task_id,task_trigger)
             self.show_schedule_table()
-            self.config_manage.change_task_status(self.select_row,1)
+            self.config_manage.change_task_status(task_id,1)
     
     def show_schedule_table(self):
         table_list = self.__ui.sched_table
@@ -536,6 +423,57 @@ class MainWindows(QMainWindow):
                 item = QTableWidgetItem(text)
                 table_list.setItem(index, col, item)
     
+    def show_history(self):
+        """显示各任务的汇总和运行记录，选中汇总中的任务时只显示该任务的记录"""
+        with taskManager.open_history() as history:
+            summary = history.summary()
+            runs = history.list_runs(self.history_task_id)
+        
+        summary_table = self.__ui.history_summaryTable
+        summary_table.blockSignals(True)
+        summary_table.setRowCount(0)
+        self.history_task_ids = []
+        for index,item in enumerate(summary):
+            self.history_task_ids.append(item['task_id'])
+            values = [item['task_name'],item['runs'],f"{item['avg_duration']:.2f}",f"{item['last_duration']:.2f}",
+                      item['files_deleted'],item['dirs_deleted'],format_bytes(item['bytes_freed']),item['errors'],
+                      format_time(item['last_started'])]
+            summary_table.insertRow(index)
+            for col,value in enumerate(values):
+                summary_table.setItem(index,col,QTableWidgetItem(str(value)))
+            if item['task_id'] == self.history_task_id:
+                summary_table.selectRow(index)
+        summary_table.blockSignals(False)
+        
+        run_table = self.__ui.history_table
+        run_table.setRowCount(0)
+        for index,item in enumerate(runs):
+            notes = []
+            if item['test']:
+                notes.append("测试")
+            if item['cancelled']:
+                notes.append("已取消")
+            if item.get('error'):
+                notes.append(f"运行失败: {item['error']}")
+            values = [item['task_name'],TRIGGER_TEXT.get(item['trigger'],item['trigger']),format_time(item['started']),
+                      f"{item['duration']:.2f}",item['scanned'],item['files_deleted'],item['dirs_deleted'],
+                      format_bytes(item['bytes_freed']),item['errors'],",".join(notes)]
+            run_table.insertRow(index)
+            for col,value in enumerate(values):
+                run_table.setItem(index,col,QTableWidgetItem(str(value)))
+    
+    def history_handleItemSelectionChanged(self):
+        """选中汇总表中的任务时只显示该任务的运行记录"""
+        items = self.__ui.history_summaryTable.selectedItems()
+        if items:
+            self.history_task_id = self.history_task_ids[items[0].row()]
+            self.show_history()
+    
+    def show_all_history(self):
+        self.history_task_id = None
+        self.__ui.history_summaryTable.clearSelection()
+        self.show_history()
+    
     def sched_handleItemSelectionChanged(self):
         """定时器表格选中行改变事件
         """
@@ -549,7 +487,7 @@ class MainWindows(QMainWindow):
         sched_task = self.sched_manage.get_schedule_tasks()[self.sched_select_row]
         
         self.sched_manage.resume_job(str(sched_task.get('id')))
-        self.config_manage.change_task_status(int(sched_task.get('id')),1)
+        self.config_manage.change_task_status(sched_task.get('id'),1)
         self.show_schedule_table()
         self.show_tasks()
     
@@ -558,7 +496,7 @@ class MainWindows(QMainWindow):
             return
         sched_task = self.sched_manage.get_schedule_tasks()[self.sched_select_row]
         self.sched_manage.pause_job(str(sched_task.get('id')))
-        self.config_manage.change_task_status(int(sched_task.get('id')),2)
+        self.config_manage.change_task_status(sched_task.get('id'),2)
         self.show_schedule_table()
         self.show_tasks()
     
@@ -567,68 +505,138 @@ class MainWindows(QMainWindow):
             return
         sched_task = self.sched_manage.get_schedule_tasks()[self.sched_select_row]
         self.sched_manage.remove_job(str(sched_task.get('id')))
-        self.config_manage.change_task_status(int(sched_task.get('id')),0)
+        self.config_manage.change_task_status(sched_task.get('id'),0)
         self.show_schedule_table()
         self.show_tasks()
     
     
 
+class ReportDialog(QDialog):
+    """显示测试模式的汇总报告，可以导出为CSV或JSON"""
+    def __init__(self,report,summary: str,parent=None) -> None:
+        super().__init__(parent)
+        self.report = report
+        self.__ui = Ui_ReportDialog()
+        self.__ui.setupUi(self)
+        self.__ui.summaryLabel.setText(f'{summary}\n将删除文件{report.files}个, 目录{report.dirs}个, 共{format_bytes(report.bytes)}')
+        self.__ui.reportTable.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.__ui.exportButton.clicked.connect(self.export_report)
+        self.__ui.closeButton.clicked.connect(self.close)
+        self.show_report()
+    
+    def show_report(self):
+        table = self.__ui.reportTable
+        rows = self.report.rows()
+        table.setRowCount(len(rows))
+        for index,(section,name,files,size,mtime) in enumerate(rows):
+            values = [section,name,files,format_bytes(size) if size != "" else "",mtime]
+            for col,value in enumerate(values):
+                table.setItem(index,col,QTableWidgetItem(str(value)))
+    
+    def export_report(self):
+        file,_ = QFileDialog.getSaveFileName(self,'导出测试报告','report.csv','CSV (*.csv);;JSON (*.json)')
+        if not file:
+            return
+        try:
+            self.report.save(file)
+        except OSError as e:
+            QMessageBox.critical(self,'导出测试报告',f'保存失败: {e}')
+
+
 class InputDialog(QDialog):  
-    def __init__(self,parent=None,mode: str="add",select_row: int=None) -> None:
+    def __init__(self,parent=None,mode: str="add",task_id: str=None) -> None:
         super().__init__(parent)
         self.config_manage = ConfigManage()
         
         self.__ui = Ui_InputDialog()
         self.__ui.setupUi(self)
-        self.select_row = select_row
+        self.task_id = task_id
+        self.max_instances = 1
         if mode == "add":
             self.setWindowTitle('任务添加')
-            self.__ui.okButton.clicked.connect(self.add_task)
+            self.save_task = self.add_task
         else:
             self.setWindowTitle('任务编辑')
-            self.__ui.okButton.clicked.connect(self.change_task)
+            self.save_task = self.change_task
         
-        self.__ui.okButton.clicked.connect(self.close)
+        self.__ui.okButton.clicked.connect(self.accept_task)
         self.__ui.cancelButton.clicked.connect(self.close)
         self.__ui.fileSelectButton.clicked.connect(self.file_select)
     
-    def set_input_text(self,index):
-        task = self.config_manage.load_task_data(index)
+    def set_input_text(self,task_id):
+        task = self.config_manage.load_task_data(task_id)
+        # 界面上没有的配置项，修改任务时保持不变
+        self.max_instances = task.max_instances
         
         self.__ui.nameEdit.setText(task.name)
         self.__ui.pathEdit.setText(task.root_path)
-        self.__ui.patternEdit.setText(task.pattern)
+        self.__ui.patternEdit.setText(";".join(split_patterns(task.pattern)))
+        self.__ui.excludeEdit.setText(";".join(task.exclude))
         self.__ui.yes_recursiveRadioButton.setChecked(task.recursive)
         self.__ui.day_spinBox.setValue(task.days)
         self.__ui.size_spinBox.setValue(task.size)
         self.__ui.number_spinBox.setValue(task.number)
+        self.__ui.number_perDirCheckBox.setChecked(task.number_per_dir)
+        self.__ui.quota_spinBox.setValue(task.quota)
+        self.__ui.free_spinBox.setValue(task.free_space)
+        self.__ui.maxOps_spinBox.setValue(task.max_ops)
+        self.__ui.maxBytes_spinBox.setValue(task.max_bytes)
+        self.__ui.emptyDirCheckBox.setChecked(task.empty_dir)
+        self.__ui.incrementalCheckBox.setChecked(task.incremental)
+        self.__ui.watchCheckBox.setChecked(task.watch)
+        self.__ui.idleIoCheckBox.setChecked(task.idle_io)
+        self.__ui.fastDeleteCheckBox.setChecked(task.fast_delete)
         self.__ui.timeEdit.setText(task.trigger_args)
     
     
     def get_input_text(self):
         name = self.__ui.nameEdit.text()
         root_path = self.__ui.pathEdit.text()
-        pattern = self.__ui.patternEdit.text()
+        patterns = split_patterns(self.__ui.patternEdit.text())
+        pattern = patterns if len(patterns) > 1 else (patterns[0] if patterns else "*")
+        exclude = split_patterns(self.__ui.excludeEdit.text())
         recursive = self.__ui.yes_recursiveRadioButton.isChecked()
         day = self.__ui.day_spinBox.value()
         size = self.__ui.size_spinBox.value()
         number = self.__ui.number_spinBox.value()
+        number_per_dir = self.__ui.number_perDirCheckBox.isChecked()
+        quota = self.__ui.quota_spinBox.value()
+        free_space = self.__ui.free_spinBox.value()
+        max_ops = self.__ui.maxOps_spinBox.value()
+        max_bytes = self.__ui.maxBytes_spinBox.value()
+        idle_io = self.__ui.idleIoCheckBox.isChecked()
+        fast_delete = self.__ui.fastDeleteCheckBox.isChecked()
+        empty_dir = self.__ui.emptyDirCheckBox.isChecked()
+        incremental = self.__ui.incrementalCheckBox.isChecked()
+        watch = self.__ui.watchCheckBox.isChecked()
         trigger_args = self.__ui.timeEdit.text()
         
-        task = taskModel(name,root_path,pattern,recursive,day,size,number,trigger_args)
+        task = taskModel(name,root_path,pattern,recursive,day,size,number,trigger_args,
+                         number_per_dir=number_per_dir,incremental=incremental,watch=watch,exclude=exclude,
+                         empty_dir=empty_dir,max_instances=self.max_instances,quota=quota,free_space=free_space,
+                         max_ops=max_ops,max_bytes=max_bytes,idle_io=idle_io,fast_delete=fast_delete)
         return task
     
+    def accept_task(self):
+        """检查任务配置，有不能同时使用的条件时提示并保留对话框"""
+        error = check_task(self.get_input_text().task_data())
+        if error:
+            QMessageBox.warning(self,self.windowTitle(),error)
+            return
+        self.save_task()
+        self.close()
+    
     def add_task(self):
         task = self.get_input_text()
         
         self.config_manage.add_task(task)
     
     def change_task(self):
-        if self.select_row is None:
+        if self.task_id is None:
             return
         
         task = self.get_input_text()
-        self.config_manage.change_task(self.select_row,task)
+        self.config_manage.change_task(self.task_id,task)
     
     def file_select(self):
         fd = QFileDialog()
@@ -636,6 +644,18 @@ class InputDialog(QDialog):
         if file_path:
             self.__ui.pathEdit.setText(file_path)
 
+def format_bytes(size: int) -> str:
+    """字节数转为便于阅读的大小"""
+    size = float(size or 0)
+    for unit in ("B","KB","MB","GB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.2f}{unit}"
+        size /= 1024
+    return f"{size:.2f}TB"
+
+def format_time(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S",time.localtime(timestamp)) if timestamp else ""
+
 def error_handler(exc_type, exc_value, exc_tb):
     """崩溃弹窗"""
     error_message = "".join(traceback.format_exception(exc_type, exc_value, exc_tb))
@@ -648,11 +668,13 @@ def error_handler(exc_type, exc_value, exc_tb):
     
     
 if __name__ == '__main__':
+    # 打包成exe后进程池需要
+    multiprocessing.freeze_support()
     sys.excepthook = error_handler
     logger = init_logger()
-    SCHEDULER = BackgroundScheduler(timezone='Asia/Shanghai')
+    SCHEDULER = create_scheduler()
     SCHEDULER.start()
-    taskManager.load_sched_job()
+    taskManager.load_sched_job(SCHEDULER)
     app = QApplication(sys.argv)
     window = MainWindows()
     window.show()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""删除任务和定时器的运行指标，输出为Prometheus文本格式
+
+可以在每次运行后写入node_exporter的textfile目录，也可以开启本地HTTP端口供Prometheus抓取
+"""
+
+import os
+import time
+import bisect
+import threading
+import logging
+
+logger = logging.getLogger('logger')
+
+DURATION_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600)
+LAG_BUCKETS = (0.01, 0.1, 0.5, 1, 5, 30, 60, 300)
+
+# 指标名称: (类型, 说明)
+METRIC_HELP = {
+    "file_delete_runs_total": ("counter", "删除任务运行次数"),
+    "file_delete_scanned_total": ("counter", "扫描的目录条目数"),
+    "file_delete_files_deleted_total": ("counter", "删除的文件数"),
+    "file_delete_dirs_deleted_total": ("counter", "删除的目录数"),
+    "file_delete_bytes_freed_total": ("counter", "释放的字节数"),
+    "file_delete_errors_total": ("counter", "删除失败数"),
+    "file_delete_scan_duration_seconds": ("histogram", "扫描和过滤耗时"),
+    "file_delete_delete_duration_seconds": ("histogram", "删除耗时"),
+    "file_delete_run_duration_seconds": ("histogram", "任务总耗时"),
+    "file_delete_last_run_timestamp_seconds": ("gauge", "最近一次运行结束的时间"),
+    "file_delete_job_lag_seconds": ("histogram", "定时任务实际提交时间与计划时间的差"),
+    "file_delete_job_misfires_total": ("counter", "错过运行时间而没有执行的定时任务次数"),
+    "file_delete_job_max_instances_total": ("counter", "因上一次运行未结束而跳过的定时任务次数"),
+    "file_delete_job_errors_total": ("counter", "定时任务抛出异常的次数"),
+}
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: tuple, extra: str=None) -> str:
+    items = [f'{name}="{_escape(value)}"' for name, value in labels]
+    if extra:
+        items.append(extra)
+    return '{' + ','.join(items) + '}' if items else ''
+
+
+class _Histogram():
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: tuple) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics():
+    """线程安全的指标集合，标签按(名称, 值)元组保存"""
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.values = {}
+        self.histograms = {}
+        self.server = None
+
+    def inc(self, name: str, value: float=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels):
+        with self.lock:
+            self.values[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name: str, value: float, buckets: tuple=DURATION_BUCKETS, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = _Histogram(buckets)
+            histogram.observe(value)
+
+    def observe_run(self, task: dict, trigger: str, result):
+        """记录一次删除任务的运行结果"""
+        labels = {"task_id": task.get("id") or "", "task": task.get("name") or ""}
+        self.inc("file_delete_runs_total", trigger=trigger,
+                 status="cancelled" if result.cancelled else ("failed" if result.failed else "ok"), **labels)
+        self.inc("file_delete_scanned_total", result.scanned, **labels)
+        self.inc("file_delete_files_deleted_total", result.deleted - result.dirs_deleted, **labels)
+        self.inc("file_delete_dirs_deleted_total", result.dirs_deleted, **labels)
+        self.inc("file_delete_bytes_freed_total", result.bytes_freed, **labels)
+        self.inc("file_delete_errors_total", result.failed, **labels)
+        self.observe("file_delete_scan_duration_seconds", max(result.elapsed - result.delete_elapsed, 0.0), **labels)
+        self.observe("file_delete_delete_duration_seconds", result.delete_elapsed, **labels)
+        self.observe("file_delete_run_duration_seconds", result.elapsed, **labels)
+        self.set("file_delete_last_run_timestamp_seconds", time.time(), **labels)
+
+    def render(self) -> str:
+        """Prometheus文本格式"""
+        with self.lock:
+            values = sorted(self.values.items())
+            histograms = sorted((key, (h.buckets, list(h.counts), h.sum, h.count)) for key, h in self.histograms.items())
+        lines = []
+        written = set()
+
+        def header(name):
+            if name not in written:
+                written.add(name)
+                kind, help_text = METRIC_HELP.get(name, ("untyped", name))
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+
+        for (name, labels), value in values:
+            header(name)
+            lines.append(f'{name}{_format_labels(labels)} {value}')
+        for (name, labels), (buckets, counts, total, count) in histograms:
+            header(name)
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels(labels, 'le="%s"' % bound)
+                lines.append(f'{name}_bucket{bucket_labels} {cumulative}')
+            bucket_labels = _format_labels(labels, 'le="+Inf"')
+            lines.append(f'{name}_bucket{bucket_labels} {count}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {total}')
+            lines.append(f'{name}_count{_format_labels(labels)} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str):
+        """写入node_exporter textfile目录，先写临时文件再替换，避免被读到一半"""
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def start_http_server(self, port: int, addr: str='127.0.0.1'):
+        """在后台线程中提供/metrics"""
+        if self.server is not None:
+            return
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((addr, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name='metrics', daemon=True).start()
+        logger.info("指标地址: http://%s:%s/metrics", addr, port)
+
+    def install_scheduler_listeners(self, scheduler, task_name=None):
+        """监听定时器事件，记录错过的运行、跳过的运行、异常和提交延迟
+
+        Args:
+            scheduler (BaseScheduler): 定时器
+            task_name (Callable[[str], str], optional): 根据任务id返回任务名称. Defaults to None.
+        """
+        from apscheduler.events import (EVENT_JOB_SUBMITTED, EVENT_JOB_MISSED, EVENT_JOB_MAX_INSTANCES,
+                                        EVENT_JOB_ERROR)
+
+        def listener(event):
+            labels = {"task_id": event.job_id, "task": task_name(event.job_id) if task_name else ""}
+            if event.code == EVENT_JOB_SUBMITTED:
+                if event.scheduled_run_times:
+                    now = time.time()
+                    lag = now - max(run_time.timestamp() for run_time in event.scheduled_run_times)
+                    self.observe("file_delete_job_lag_seconds", max(lag, 0.0), LAG_BUCKETS, **labels)
+            elif event.code == EVENT_JOB_MISSED:
+                self.inc("file_delete_job_misfires_total", **labels)
+            elif event.code == EVENT_JOB_MAX_INSTANCES:
+                self.inc("file_delete_job_max_instances_total", **labels)
+            elif event.code == EVENT_JOB_ERROR:
+                self.inc("file_delete_job_errors_total", **labels)
+
+        scheduler.add_listener(listener, EVENT_JOB_SUBMITTED | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES | EVENT_JOB_ERROR)
+
+
+METRICS = Metrics()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import threading
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger('logger')
+
+
+def normalize_path(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def paths_overlap(a: str, b: str) -> bool:
+    """两个已经规范化的目录是否相同或互相包含"""
+    if a == b:
+        return True
+    a_prefix = a.rstrip('/\\') + os.sep
+    b_prefix = b.rstrip('/\\') + os.sep
+    return a.startswith(b_prefix) or b.startswith(a_prefix)
+
+
+class PathLockManager():
+    """按任务目录加锁
+
+    目录相同或互相包含的任务依次运行，避免同时删除同一批文件；不相关的目录可以同时运行。
+    等待的任务按先后顺序获取锁，后来的任务不会越过与它目录重叠的先到任务
+    """
+    def __init__(self) -> None:
+        self.cond = threading.Condition()
+        self.held = []
+        self.waiting = []
+
+    def acquire(self, path: str, timeout: float=None) -> bool:
+        """获取目录锁，timeout秒内没有获取到时返回False"""
+        path = normalize_path(path)
+        ticket = [path]
+        with self.cond:
+            self.waiting.append(ticket)
+            try:
+                if not self._can_acquire(ticket):
+                    logger.info("等待目录解锁: %s", path)
+                    if not self.cond.wait_for(lambda: self._can_acquire(ticket), timeout):
+                        return False
+                self.held.append(path)
+                return True
+            finally:
+                self.waiting.remove(ticket)
+                self.cond.notify_all()
+
+    def release(self, path: str):
+        path = normalize_path(path)
+        with self.cond:
+            self.held.remove(path)
+            self.cond.notify_all()
+
+    @contextmanager
+    def lock(self, path: str):
+        self.acquire(path)
+        try:
+            yield
+        finally:
+            self.release(path)
+
+    def _can_acquire(self, ticket: list) -> bool:
+        path = ticket[0]
+        if any(paths_overlap(path, held) for held in self.held):
+            return False
+        for waiting in self.waiting:
+            if waiting is ticket:
+                return True
+            if paths_overlap(path, waiting[0]):
+                return False
+        return True
+
+
+PATH_LOCKS = PathLockManager()
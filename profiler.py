@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+import logging
+
+logger = logging.getLogger('logger')
+
+# 阶段名称和说明，按流水线顺序输出
+STAGES = {
+    "list": "列目录",
+    "stat": "读取文件信息",
+    "scan": "匹配规则",
+    "verify": "删除前复查",
+    "filter": "过滤(目录、天数、大小)",
+    "retain": "保留数量排序",
+    "quota": "配额排序",
+    "delete": "删除文件",
+    "rmdir": "删除目录",
+    "report": "汇总测试报告",
+    "log": "写日志",
+}
+
+
+class _Timer():
+    __slots__ = ('profiler', 'stage', 'start')
+
+    def __init__(self, profiler: 'StageProfiler', stage: str) -> None:
+        self.profiler = profiler
+        self.stage = stage
+
+    def __enter__(self):
+        self.profiler._push()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.profiler._pop(self.stage, time.perf_counter() - self.start)
+
+
+class StageProfiler():
+    """按阶段统计FileDelete各部分的耗时
+
+    各阶段统计的是独占时间：外层阶段的耗时不包括其中嵌套的阶段，例如"scan"不包括"list"和"stat"；
+    多线程扫描或删除时，工作线程中的耗时会累加，总和可能超过运行时间
+    """
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.seconds = {}
+        self.counts = {}
+        self.local = threading.local()
+
+    def timer(self, stage: str) -> _Timer:
+        """统计with语句块的耗时"""
+        return _Timer(self, stage)
+
+    def wrap(self, stage: str, records):
+        """统计迭代器每次产出记录的耗时，不包括其上游迭代器中已统计的阶段"""
+        it = iter(records)
+        while True:
+            self._push()
+            start = time.perf_counter()
+            try:
+                record = next(it)
+            except StopIteration:
+                self._pop(stage, time.perf_counter() - start, 0)
+                return
+            except BaseException:
+                self._pop(stage, time.perf_counter() - start, 0)
+                raise
+            self._pop(stage, time.perf_counter() - start)
+            yield record
+
+    def add(self, stage: str, seconds: float, count: int=1):
+        with self.lock:
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+            self.counts[stage] = self.counts.get(stage, 0) + count
+
+    def rows(self, elapsed: float=None) -> list:
+        """返回[(阶段, 说明, 秒, 次数)]，指定总耗时时追加"其他"一行"""
+        with self.lock:
+            seconds = dict(self.seconds)
+            counts = dict(self.counts)
+        names = [name for name in STAGES if name in seconds] + sorted(name for name in seconds if name not in STAGES)
+        rows = [(name, STAGES.get(name, name), seconds[name], counts.get(name, 0)) for name in names]
+        if elapsed is not None:
+            rows.append(("other", "其他", max(elapsed - sum(seconds.values()), 0.0), 0))
+        return rows
+
+    def report(self, elapsed: float=None) -> str:
+        # 中文字符占两列，表头按显示宽度对齐
+        lines = ["阶段" + " " * 10 + "耗时(秒)" + " " * 8 + "次数" + " " * 5 + "占比  说明"]
+        total = elapsed or sum(row[2] for row in self.rows()) or 1.0
+        for name, text, seconds, count in self.rows(elapsed):
+            lines.append(f"{name:<10}{seconds:>12.4f}{count:>12}{seconds / total:>9.1%}  {text}")
+        return "\n".join(lines)
+
+    def _push(self):
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        stack.append(0.0)
+
+    def _pop(self, stage: str, elapsed: float, count: int=1):
+        stack = self.local.stack
+        child = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        self.add(stage, elapsed - child, count)
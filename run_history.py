@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+import logging
+
+logger = logging.getLogger('logger')
+
+TRIGGER_SCHEDULE = 'schedule'
+TRIGGER_MANUAL = 'manual'
+TRIGGER_CLI = 'cli'
+
+TRIGGER_TEXT = {
+    TRIGGER_SCHEDULE: '定时',
+    TRIGGER_MANUAL: '手动',
+    TRIGGER_CLI: '命令行',
+}
+
+
+class RunHistory():
+    """任务运行记录，每次运行保存一条，用于查看任务耗时的变化和释放的空间
+
+    多个进程(界面、命令行)可以同时写入同一个数据库
+    """
+    def __init__(self, db_file: str) -> None:
+        # 只在保存或查看运行记录时加载sqlite3，导入本模块不影响启动速度
+        import sqlite3
+        self.db_file = db_file
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_file, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY AUTOINCREMENT, task_id TEXT, task_name TEXT, '
+                          'trigger TEXT, test INTEGER, started REAL, duration REAL, scanned INTEGER, matched INTEGER, '
+                          'files_deleted INTEGER, dirs_deleted INTEGER, bytes_freed INTEGER, errors INTEGER, cancelled INTEGER, '
+                          'error TEXT)')
+        # 旧版本的数据库没有error列
+        columns = [row[1] for row in self.conn.execute('PRAGMA table_info(runs)')]
+        if 'error' not in columns:
+            self.conn.execute('ALTER TABLE runs ADD COLUMN error TEXT')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS runs_task ON runs (task_id, started)')
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def add(self, task: dict, trigger: str, started: float, result, test: bool=False):
+        """保存一次运行的结果
+
+        Args:
+            task (dict): 任务配置
+            trigger (str): 触发方式，TRIGGER_SCHEDULE、TRIGGER_MANUAL或TRIGGER_CLI
+            started (float): 开始时间戳
+            result (DeleteResult): 运行结果，任务异常结束时result.error为异常信息
+            test (bool, optional): 是否为测试模式. Defaults to False.
+        """
+        with self.lock:
+            self.conn.execute('INSERT INTO runs (task_id, task_name, trigger, test, started, duration, scanned, matched, '
+                              'files_deleted, dirs_deleted, bytes_freed, errors, cancelled, error) '
+                              'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                              (task.get('id'), task.get('name'), trigger, int(test), started, result.elapsed, result.scanned,
+                               result.matched, result.deleted - result.dirs_deleted, result.dirs_deleted, result.bytes_freed,
+                               result.failed, int(result.cancelled), result.error))
+            self.conn.commit()
+
+    def list_runs(self, task_id: str=None, limit: int=500) -> list:
+        """按开始时间倒序返回运行记录"""
+        sql = 'SELECT * FROM runs'
+        args = []
+        if task_id is not None:
+            sql += ' WHERE task_id=?'
+            args.append(task_id)
+        sql += ' ORDER BY started DESC LIMIT ?'
+        args.append(limit)
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(sql, args)]
+
+    def summary(self) -> list:
+        """按任务汇总非测试运行：运行次数、平均和最近一次耗时、删除的文件和目录数、释放的字节数、错误数"""
+        sql = ('SELECT task_id, task_name, COUNT(*) AS runs, AVG(duration) AS avg_duration, '
+               'SUM(files_deleted) AS files_deleted, SUM(dirs_deleted) AS dirs_deleted, '
+               'SUM(bytes_freed) AS bytes_freed, SUM(errors) AS errors, MAX(started) AS last_started, '
+               '(SELECT duration FROM runs AS last WHERE last.task_id=runs.task_id AND last.test=0 '
+               'ORDER BY started DESC LIMIT 1) AS last_duration '
+               'FROM runs WHERE test=0 GROUP BY task_id ORDER BY last_started DESC')
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(sql)]
+
+    def prune(self, keep_days: int):
+        """删除keep_days天之前的记录"""
+        with self.lock:
+            self.conn.execute('DELETE FROM runs WHERE started < ?', (time.time() - keep_days * 86400,))
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
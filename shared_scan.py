@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import time
+import queue
+import threading
+import logging
+
+from file_scan import FileScanner, split_patterns
+from path_lock import PATH_LOCKS, normalize_path, paths_overlap
+
+logger = logging.getLogger('logger')
+
+_MAGIC = re.compile('([*?[])')
+# 每个任务的记录队列长度，任务处理较慢时扫描线程等待
+QUEUE_SIZE = 10000
+_END = None
+
+
+def escape_part(part: str) -> str:
+    """转义目录名中的通配符，作为匹配规则的普通前缀"""
+    return _MAGIC.sub(r'[\1]', part)
+
+
+class _Member():
+    """共享扫描中的一个任务，扫描线程把匹配该任务的记录放入queue，任务所在的线程读取"""
+    def __init__(self, task: dict, test: bool=False) -> None:
+        self.task = task
+        self.test = test
+        self.root = normalize_path(task.get("root_path"))
+        self.prefix = self.root.rstrip('/\\') + os.sep
+        self.queue = None
+        self.filter = None
+        self.batch = None
+        self.closed = False
+        self.ready = threading.Event()
+
+    def covers(self, path: str) -> bool:
+        return os.path.normcase(path).startswith(self.prefix)
+
+    def put(self, record):
+        """放入记录，任务已结束时丢弃，避免扫描线程一直等待"""
+        while not self.closed:
+            try:
+                self.queue.put(record, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    @property
+    def scanned(self) -> int:
+        """共享扫描已遍历的条目数，记录读完后为整次遍历的条目数"""
+        return self.batch.scanned if self.batch is not None else 0
+
+    def __iter__(self):
+        while True:
+            record = self.queue.get()
+            if record is _END:
+                return
+            yield record
+
+
+class _Batch():
+    """一组目录重叠的任务，在最外层目录上只遍历一次，记录按各任务的规则分发"""
+    def __init__(self, members: list, workers: int=1) -> None:
+        self.members = members
+        self.workers = workers
+        self.root = min((member.root for member in members), key=len)
+        self.root_path = next(member.task.get("root_path") for member in members if member.root == self.root)
+        self.remaining = len(members)
+        self.lock = threading.Lock()
+        self.scanned = 0
+        # 与单独运行一致，只有测试模式的组不加锁
+        self.locked = any(not member.test for member in members)
+        # 有任务要求低IO优先级时扫描线程使用最低的IO优先级
+        self.idle_io = any(member.task.get("idle_io") and not member.test for member in members)
+
+    def start(self):
+        """锁住最外层目录并启动扫描线程，所有任务结束后解锁；全部为测试模式时不加锁"""
+        for member in self.members:
+            member.queue = queue.Queue(QUEUE_SIZE)
+            # 快速删除的任务只接收匹配的目录本身，共享扫描仍需为其他任务进入这些目录
+            member.filter = FileScanner(member.task.get("root_path"), member.task.get("pattern") or "*",
+                                        recursive=bool(member.task.get("recursive")), exclude=member.task.get("exclude"),
+                                        dir_prune=bool(member.task.get("fast_delete")))
+        if self.locked:
+            PATH_LOCKS.acquire(self.root_path)
+        for member in self.members:
+            member.batch = self
+        threading.Thread(target=self._scan, name='shared_scan', daemon=True).start()
+        logger.info("共享扫描: %s, 任务: %s", self.root_path, ", ".join(member.task.get("name") for member in self.members))
+
+    def finish(self, member: _Member):
+        member.closed = True
+        with self.lock:
+            self.remaining -= 1
+            if self.remaining:
+                return
+        if self.locked:
+            PATH_LOCKS.release(self.root_path)
+
+    def patterns(self) -> list:
+        """各任务的包含规则加上任务目录相对于最外层目录的前缀"""
+        patterns = []
+        for member in self.members:
+            rel_path = os.path.relpath(member.root, self.root)
+            prefix = [] if rel_path == os.curdir else [escape_part(part) for part in re.split(r'[\\/]', rel_path)]
+            for pattern in split_patterns(member.task.get("pattern") or "*"):
+                patterns.append("/".join(prefix + [pattern]))
+        return patterns
+
+    def _scan(self):
+        from throttle import idle_io
+        start = time.perf_counter()
+        scanner = FileScanner(self.root_path, self.patterns(),
+                              recursive=any(member.task.get("recursive") for member in self.members),
+                              workers=self.workers, progress=self._on_scan, idle_io=self.idle_io)
+        try:
+            with idle_io(self.idle_io):
+                for record in scanner.scan():
+                    for member in self.members:
+                        if not member.closed and member.covers(record.path) and member.filter.match_path(record.path, record.is_dir):
+                            member.put(record)
+        except Exception:
+            logger.exception("共享扫描失败: %s", self.root_path)
+        finally:
+            self.scanned = scanner.scanned
+            for member in self.members:
+                member.put(_END)
+        logger.info("共享扫描完成: %s, 扫描%s个, 耗时%.2f秒", self.root_path, scanner.scanned, time.perf_counter() - start)
+
+    def _on_scan(self, scanned: int):
+        self.scanned = scanned
+
+
+class SharedScanManage():
+    """合并同时触发、目录重叠的定时任务的扫描
+
+    第一个到达的任务等待window秒，期间到达的任务一起按目录是否重叠分组；
+    多个任务的组在最外层目录上只遍历一次，每个任务在自己的线程中过滤和删除，结果和日志分别记录；
+    只有一个任务的组按原来的方式单独扫描。共享扫描不使用元数据索引，开启了增量扫描的任务应单独运行
+    """
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.pending = []
+
+    def run(self, task: dict, window: float, run, workers: int=1, test: bool=False):
+        """运行任务，返回run的结果
+
+        Args:
+            task (dict): 任务配置
+            window (float): 等待其他任务加入的秒数
+            run (Callable[[dict, Iterable | None], Any]): 运行任务，第二个参数为共享扫描的记录来源，单独扫描时为None；
+                记录来源的scanned属性为共享扫描遍历的条目数
+            workers (int, optional): 共享扫描同时列出的目录数. Defaults to 1.
+            test (bool, optional): 是否为测试模式，组内全部为测试模式时不锁目录. Defaults to False.
+        """
+        member = _Member(task, test)
+        with self.lock:
+            self.pending.append(member)
+            leader = len(self.pending) == 1
+        if leader:
+            time.sleep(window)
+            with self.lock:
+                members, self.pending = self.pending, []
+            self._start(members, workers)
+        member.ready.wait()
+        if member.batch is None:
+            return run(task, None)
+        try:
+            return run(task, member)
+        finally:
+            member.batch.finish(member)
+
+    def _start(self, members: list, workers: int):
+        for group in self._group(members):
+            if len(group) > 1:
+                try:
+                    _Batch(group, workers).start()
+                except Exception:
+                    logger.exception("共享扫描启动失败，任务单独运行")
+                    for member in group:
+                        member.batch = None
+            for member in group:
+                member.ready.set()
+
+    def _group(self, members: list) -> list:
+        """按目录是否重叠分组，互相重叠的目录中最短的一个包含组内其他目录"""
+        groups = []
+        for member in members:
+            overlapped = [group for group in groups if any(paths_overlap(member.root, other.root) for other in group)]
+            merged = [member]
+            for group in overlapped:
+                groups.remove(group)
+                merged.extend(group)
+            groups.append(merged)
+        return groups
+
+
+SHARED_SCANS = SharedScanManage()
@@ -0,0 +1,698 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""任务配置和定时任务管理，不依赖图形界面，图形界面和命令行共用"""
+
+import os
+import sys
+import json
+import time
+import copy
+import uuid
+import atexit
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+from file_delete import FileDelete,DeleteResult,check_task
+from file_watch import WATCH_MANAGE
+from path_lock import PATH_LOCKS
+from run_history import TRIGGER_SCHEDULE,TRIGGER_MANUAL
+
+# APScheduler和sqlite3在用到时才导入，只运行一次任务时不加载定时器
+if TYPE_CHECKING:
+    from apscheduler.schedulers.base import BaseScheduler
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from apscheduler.job import Job
+    from run_history import RunHistory
+
+logger = logging.getLogger('logger')
+
+# 定时任务使用的时区
+TIMEZONE = 'Asia/Shanghai'
+
+
+def create_scheduler() -> 'BackgroundScheduler':
+    """按配置文件中的scheduler_workers创建定时器，为同时运行的定时任务数；开启了指标时监听定时器事件"""
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from apscheduler.executors.pool import ThreadPoolExecutor
+    config = ConfigManage().get_config()
+    workers = config.get("scheduler_workers") or 10
+    scheduler = BackgroundScheduler(executors={'default': ThreadPoolExecutor(workers)},timezone=TIMEZONE)
+    if config.get("metrics_textfile") or config.get("metrics_port"):
+        from metrics import METRICS
+        METRICS.install_scheduler_listeners(scheduler,task_name)
+        if config.get("metrics_port"):
+            try:
+                METRICS.start_http_server(int(config["metrics_port"]),config.get("metrics_addr") or "127.0.0.1")
+            except OSError as e:
+                logger.error("指标端口启动失败: %s",e)
+    return scheduler
+
+
+def task_name(id: str) -> str:
+    task = ConfigManage().get_task(id)
+    return task.get("name") if task else ""
+
+
+def _init_process():
+    """进程池中子进程的初始化，只写日志文件"""
+    from logger_conf import init_logger
+    logger = logging.getLogger('logger')
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    # 子进程退出时不执行atexit，直接写文件避免丢失队列中的日志
+    init_logger(use_queue=False)
+
+
+def _run_in_process(config_file: str,task: dict,test: bool,source) -> DeleteResult:
+    ConfigManage.default_file = config_file
+    return taskManager.run_task(task,test,source)
+
+
+def new_task_id() -> str:
+    """生成任务id，任务删除或调整顺序后id不变"""
+    return uuid.uuid4().hex
+
+
+class taskModel():
+    id = None
+    name = None
+    root_path = None
+    pattern = "*"
+    exclude = []
+    recursive = False
+    days = 0
+    size = 0
+    number = 0
+    number_per_dir = False
+    quota = 0
+    free_space = 0
+    max_ops = 0
+    max_bytes = 0
+    idle_io = False
+    fast_delete = False
+    empty_dir = False
+    incremental = False
+    watch = False
+    trigger_args = None
+    status = 0
+    max_instances = 1
+    
+    def __init__(self, name: str, root_path: str,pattern: str="*",recursive: bool=False,
+                 days: int=0,size: int =0,number: int=0,trigger_args: str=None,status: int=0,
+                 number_per_dir: bool=False,incremental: bool=False,watch: bool=False,exclude: list=None,
+                 empty_dir: bool=False,id: str=None,max_instances: int=1,quota: int=0,free_space: int=0,
+                 max_ops: int=0,max_bytes: int=0,idle_io: bool=False,fast_delete: bool=False) -> None:
+        self.id = id or new_task_id()
+        self.name = name
+        self.root_path = root_path
+        self.pattern = pattern
+        self.exclude = exclude or []
+        self.recursive = recursive
+        self.days = days
+        self.size = size
+        self.number = number
+        self.number_per_dir = number_per_dir
+        self.quota = quota
+        self.free_space = free_space
+        self.max_ops = max_ops
+        self.max_bytes = max_bytes
+        self.idle_io = idle_io
+        self.fast_delete = fast_delete
+        self.empty_dir = empty_dir
+        self.incremental = incremental
+        self.watch = watch
+        self.trigger_args = trigger_args
+        self.status = status
+        self.max_instances = max_instances
+    
+    def task_data(self):
+        task = {
+            "id": self.id,
+            "name": self.name,
+            "root_path": self.root_path,
+            "pattern": self.pattern,
+            "exclude": self.exclude,
+            "recursive": self.recursive,
+            "days": self.days,
+            "size": self.size,
+            "number": self.number,
+            "number_per_dir": self.number_per_dir,
+            "quota": self.quota,
+            "free_space": self.free_space,
+            "max_ops": self.max_ops,
+            "max_bytes": self.max_bytes,
+            "idle_io": self.idle_io,
+            "fast_delete": self.fast_delete,
+            "empty_dir": self.empty_dir,
+            "incremental": self.incremental,
+            "watch": self.watch,
+            "trigger_args": self.trigger_args,
+            "status": self.status,
+            "max_instances": self.max_instances
+            }
+        
+        return task
+    
+
+class taskManager():
+    # process_workers大于0时使用的进程池
+    process_pool = None
+    process_pool_lock = threading.Lock()
+    
+    @classmethod
+    def start_delete_task(cls,task,test: bool=False,source=None,progress=None,cancel_event=None,
+                          trigger: str=TRIGGER_MANUAL,profile: bool=False,profile_file: str=None,
+                          report_file: str=None,locked: bool=False) -> DeleteResult:
+        """运行删除任务，目录重叠的任务依次运行；测试模式不删除文件，不加锁
+
+        指定progress、cancel_event或profile时(界面上手动运行、性能分析)总是在当前进程中运行；
+        运行结果按trigger(触发方式)保存到运行记录；测试模式下report_file不为空时把汇总报告保存为CSV或JSON；
+        locked为True表示调用方已经锁住了包含任务目录的目录(共享扫描)，记录来源source在当前进程中读取
+        """
+        started = time.time()
+        config_manage = ConfigManage()
+        process_workers = config_manage.get_config("process_workers") or 0
+        if progress is not None or cancel_event is not None or profile or locked:
+            process_workers = 0
+        run_args = (config_manage,process_workers,task,test,source,progress,cancel_event,profile,profile_file)
+        try:
+            if test or locked:
+                result = cls.dispatch_task(*run_args)
+            else:
+                with PATH_LOCKS.lock(task.get("root_path")):
+                    result = cls.dispatch_task(*run_args)
+        except Exception as e:
+            # 异常结束的运行同样保存运行记录和指标，计为一次失败
+            result = DeleteResult()
+            result.failed = 1
+            result.error = f"{type(e).__name__}: {e}"
+            result.elapsed = time.time() - started
+            logger.error("任务%s运行失败: %s",task.get("name"),result.error)
+            cls.record_run(config_manage,task,trigger,started,result,test)
+            if not test:
+                cls.record_metrics(config_manage,task,trigger,result)
+            raise
+        logger.info("任务%s完成: %s",task.get("name"),result)
+        if report_file and result.report is not None:
+            try:
+                result.report.save(report_file)
+            except OSError as e:
+                logger.error("保存测试报告失败: %s",e)
+        cls.record_run(config_manage,task,trigger,started,result,test)
+        if not test:
+            cls.record_metrics(config_manage,task,trigger,result)
+        return result
+    
+    @classmethod
+    def record_metrics(cls,config_manage,task: dict,trigger: str,result: DeleteResult):
+        """开启了指标时记录运行结果，并写入metrics_textfile"""
+        config = config_manage.get_config()
+        textfile = config.get("metrics_textfile")
+        if not textfile and not config.get("metrics_port"):
+            return
+        from metrics import METRICS
+        METRICS.observe_run(task,trigger,result)
+        if textfile:
+            try:
+                METRICS.write_textfile(textfile)
+            except OSError as e:
+                logger.error("写入指标文件失败: %s",e)
+    
+    @classmethod
+    def history_file(cls,config_manage) -> str:
+        history_file = config_manage.get_config("history_file") or "run_history.db"
+        return os.path.join(os.path.dirname(os.path.abspath(config_manage.file)),history_file)
+    
+    @classmethod
+    def open_history(cls) -> 'RunHistory':
+        """打开配置文件中的运行记录数据库"""
+        from run_history import RunHistory
+        return RunHistory(cls.history_file(ConfigManage()))
+    
+    @classmethod
+    def record_run(cls,config_manage,task: dict,trigger: str,started: float,result: DeleteResult,test: bool):
+        """保存运行记录，失败时只记录日志，不影响任务"""
+        import sqlite3
+        from run_history import RunHistory
+        try:
+            with RunHistory(cls.history_file(config_manage)) as history:
+                history.add(task,trigger,started,result,test)
+        except sqlite3.Error as e:
+            logger.error("保存运行记录失败: %s",e)
+    
+    @classmethod
+    def prune_history(cls):
+        """删除超过history_keep_days天的运行记录"""
+        import sqlite3
+        keep_days = ConfigManage().get_config("history_keep_days") or 0
+        if keep_days <= 0:
+            return
+        try:
+            with cls.open_history() as history:
+                history.prune(keep_days)
+        except sqlite3.Error as e:
+            logger.error("清理运行记录失败: %s",e)
+    
+    @classmethod
+    def dispatch_task(cls,config_manage,process_workers: int,task: dict,test: bool,source,progress=None,cancel_event=None,
+                      profile: bool=False,profile_file: str=None) -> DeleteResult:
+        """在当前线程或进程池中运行任务"""
+        if process_workers <= 0:
+            return cls.run_task(task,test,source,progress,cancel_event,profile,profile_file)
+        pool = cls.get_process_pool(process_workers)
+        return pool.submit(_run_in_process,os.path.abspath(config_manage.file),task,test,source).result()
+    
+    @classmethod
+    def get_process_pool(cls,workers: int):
+        with cls.process_pool_lock:
+            if cls.process_pool is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                cls.process_pool = ProcessPoolExecutor(max_workers=workers,mp_context=multiprocessing.get_context('spawn'),
+                                                       initializer=_init_process)
+            return cls.process_pool
+    
+    @classmethod
+    def run_task(cls,task,test: bool=False,source=None,progress=None,cancel_event=None,
+                 profile: bool=False,profile_file: str=None) -> DeleteResult:
+        """扫描并删除，不加锁
+
+        profile为True时统计各阶段耗时，profile_file不为空时同时用cProfile记录当前线程的调用并保存到该文件
+        """
+        config_manage = ConfigManage()
+        config = config_manage.get_config()
+        index = None
+        if task.get("incremental"):
+            index_file = os.path.join(os.path.dirname(config_manage.file),config.get("index_file") or "file_index.db")
+            from file_index import FileIndex
+            index = FileIndex(index_file)
+        file_delete  = FileDelete(index,config.get("sort_buffer") or 100000,config.get("sort_tmp_dir") or None)
+        profiler = None
+        c_profile = None
+        if profile:
+            from profiler import StageProfiler
+            profiler = StageProfiler()
+            if profile_file:
+                import cProfile
+                c_profile = cProfile.Profile()
+                c_profile.enable()
+        try:
+            result = file_delete.run(
+                task=task,
+                test=test,
+                workers=config.get("scan_workers") or 1,
+                delete_workers=config.get("delete_workers") or 1,
+                batch_size=config.get("delete_batch_size") or 100,
+                source=source,
+                progress=progress,
+                cancel_event=cancel_event,
+                profiler=profiler,
+                report_sample=config.get("report_sample_size",1000),
+                log_files=bool(config.get("dry_run_log_files"))
+            )
+        finally:
+            if c_profile is not None:
+                c_profile.disable()
+                c_profile.dump_stats(profile_file)
+                logger.info("cProfile结果已保存: %s",profile_file)
+            if index is not None:
+                index.close()
+        return result
+    
+    @classmethod
+    def start_delete_task_full(cls,id: str,test: bool=False):
+        task = ConfigManage().get_task(id)
+        if task is None:
+            logger.warning("任务不存在: %s",id)
+            return
+        watcher = WATCH_MANAGE.get(id)
+        # 监听器还在做第一次扫描或已经退出时按原来的方式扫描
+        if watcher and watcher.available():
+            cls.start_delete_task(task,test,watcher.snapshot(),trigger=TRIGGER_SCHEDULE)
+            return
+        config = ConfigManage().get_config()
+        window = config.get("shared_scan_window",1)
+        # 共享扫描不使用元数据索引，增量扫描的任务单独运行；快速删除的任务单独扫描时不进入匹配的目录，同样单独运行
+        if not window or window <= 0 or task.get("incremental") or task.get("fast_delete"):
+            cls.start_delete_task(task,test,trigger=TRIGGER_SCHEDULE)
+            return
+        # 同时触发、目录重叠的任务共用一次扫描
+        from shared_scan import SHARED_SCANS
+        SHARED_SCANS.run(task,window,
+                         lambda task,source: cls.start_delete_task(task,test,source,trigger=TRIGGER_SCHEDULE,
+                                                                   locked=source is not None),
+                         config.get("scan_workers") or 1,test)
+    
+    @classmethod
+    def purge_trash(cls,tasks: list):
+        """在后台清理快速删除任务上次没有清理完的回收目录"""
+        root_paths = [task.get("root_path") for task in tasks if task.get("fast_delete")]
+        if not root_paths:
+            return
+        from trash import TRASH_PURGER
+        TRASH_PURGER.purge_leftovers(root_paths)
+    
+    @classmethod
+    def load_sched_job(cls,scheduler: 'BaseScheduler'):
+        """加载任务到定时器"""
+        cls.prune_history()
+        sched_manage = ScheduleManage(scheduler)
+        config_manage = ConfigManage()
+        tasks = config_manage.get_config("tasks")
+        cls.purge_trash(tasks)
+        for task in tasks:
+            id = task['id']
+            if task.get('status') == 1:
+                if not sched_manage.job_exists(id):
+                    sched_manage.add_job(id,task['trigger_args'])
+            elif task.get('status') == 2:
+                if not sched_manage.job_exists(id):
+                    sched_manage.add_job(id,task['trigger_args'],watch=False)
+                sched_manage.pause_job(id)
+
+
+class ScheduleManage():
+    def __init__(self, scheduler: 'BaseScheduler') -> None:
+        self.scheduler = scheduler
+    
+    
+    def str_schedule_task(self,job: 'Job'):
+        """定时任务格式化"""        
+        next_run_time: time = job.next_run_time
+        next_run_time = next_run_time.strftime("%Y-%m-%d %H:%M:%S") if next_run_time else None
+        job_data = {
+            "id": job.id,
+            "next_run_time": next_run_time if next_run_time else ""
+        }
+        return job_data
+        
+    def get_schedule_tasks(self):
+        jobs: list = self.scheduler.get_jobs()
+        schedule_tasks: list = []
+        config_manage = ConfigManage()
+        for job in jobs:
+            schedule_task = self.str_schedule_task(job)
+            id =  schedule_task.get('id')
+            task: dict = config_manage.get_task(id)
+            if task is None:
+                continue
+            schedule_task['name'] = task.get("name")
+            schedule_task['trigger_args'] = task.get("trigger_args")
+            next_run_time = schedule_task.get('next_run_time')
+            if next_run_time:
+                schedule_task['status'] = "正在运行"
+            else:
+                schedule_task['status'] = "暂停"
+            
+            schedule_tasks.append(schedule_task)
+        return schedule_tasks
+    
+    def add_job(self,id:str,trigger_args:str,watch: bool=True):
+        
+        trigger = self.parse_trigger("cron",trigger_args)
+        if trigger is None:
+            return
+        self.scheduler.add_job(
+            func=taskManager.start_delete_task_full,
+            trigger=trigger,id=str(id),
+            replace_existing=True,args=[str(id)],coalesce=True,
+            max_instances=self.get_max_instances(id)
+            )
+        if watch:
+            self.start_watch(id)
+    
+    def get_max_instances(self,id: str) -> int:
+        """同一个任务最多同时运行的次数，目录锁仍会让它们依次删除"""
+        task = ConfigManage().get_task(id)
+        return max(int((task or {}).get("max_instances") or 1),1)
+    
+    def start_watch(self,id: str):
+        """任务开启了实时监听时开始监听"""
+        task = ConfigManage().get_task(id)
+        if task and task.get("watch"):
+            WATCH_MANAGE.start(id,task)
+    
+    def parse_trigger(self, trigger, trigger_args):
+        from apscheduler.triggers.interval import IntervalTrigger
+        from apscheduler.triggers.date import DateTrigger
+        from apscheduler.triggers.cron import CronTrigger
+        if trigger == 'interval':
+            return IntervalTrigger(seconds=int(trigger_args))
+        elif trigger == 'date':
+            return DateTrigger(run_date=trigger_args)
+        elif trigger == 'cron':
+            trigger_args = trigger_args.strip()
+            try:
+                second,minute,hour,day, month, week = trigger_args.split()
+                return CronTrigger(second=second,minute=minute, hour=hour, day=day, month=month, day_of_week=week)
+            except ValueError:
+                logger.error(f'定时参数有误:{trigger_args}')
+                return None
+            # return CronTrigger.from_crontab(trigger_args)
+        else:
+            raise TypeError(f'unknown schedule policy: {trigger!r}')
+    
+    def resume_job(self,id: str):
+        job: 'Job' = self.scheduler.get_job(job_id=str(id))
+        job.resume()
+        self.start_watch(id)
+    
+    def pause_job(self,id: str):
+        job: 'Job' = self.scheduler.get_job(job_id=str(id))
+        job.pause()
+        WATCH_MANAGE.stop(id)
+    
+    def remove_job(self,id: str):
+        job: 'Job' = self.scheduler.get_job(job_id=str(id))
+        job.remove()
+        WATCH_MANAGE.stop(id)
+    
+    def job_exists(self, job_id: str):
+        return self.scheduler.get_job(job_id=str(job_id)) is not None
+
+class ConfigStore():
+    """config.json的共享内存缓存
+
+    同一个配置文件只解析一次，文件修改时间变化时重新加载；
+    修改先写入内存，延迟flush_delay秒后合并写入文件，写入时先写临时文件再替换，避免配置文件写坏
+    """
+    _stores = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self, file: str, flush_delay: float=0.5) -> None:
+        self.file = file
+        self.flush_delay = flush_delay
+        self.lock = threading.RLock()
+        self.config = None
+        self.tasks = {}
+        self.mtime_ns = None
+        self.dirty = False
+        self.timer = None
+
+    @classmethod
+    def get(cls, file: str) -> 'ConfigStore':
+        """获取配置文件对应的共享缓存"""
+        file = os.path.abspath(file)
+        with cls._stores_lock:
+            store = cls._stores.get(file)
+            if store is None:
+                store = cls._stores[file] = ConfigStore(file)
+            return store
+
+    @classmethod
+    def flush_all(cls):
+        with cls._stores_lock:
+            stores = list(cls._stores.values())
+        for store in stores:
+            store.flush()
+
+    def read(self, root_key: str=None):
+        """返回配置的副本，修改返回值不影响缓存"""
+        with self.lock:
+            self._revalidate()
+            config = self.config.get(root_key) if root_key else self.config
+            return copy.deepcopy(config)
+
+    def get_task(self, id: str):
+        """按任务id返回任务配置的副本，任务不存在时返回None"""
+        with self.lock:
+            self._revalidate()
+            return copy.deepcopy(self.tasks.get(str(id)))
+
+    def update(self, func):
+        """在锁内用func修改配置，稍后写入文件"""
+        with self.lock:
+            self._revalidate()
+            func(self.config)
+            self._index_tasks()
+            self._mark_dirty()
+
+    def _mark_dirty(self):
+        with self.lock:
+            self.dirty = True
+            if self.timer is None:
+                self.timer = threading.Timer(self.flush_delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def write(self, config: dict):
+        """立即替换整个配置并写入文件"""
+        with self.lock:
+            self.config = config
+            self._index_tasks()
+            self.dirty = True
+            self.flush()
+
+    def flush(self):
+        """把未保存的修改写入文件"""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if not self.dirty:
+                return
+            import shutil
+            import tempfile
+            dir_path = os.path.dirname(self.file)
+            fd, tmp_file = tempfile.mkstemp(prefix='.config_', suffix='.tmp', dir=dir_path)
+            try:
+                if os.path.exists(self.file):
+                    shutil.copymode(self.file, tmp_file)
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(self.config, f, ensure_ascii=False, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.file)
+            except BaseException:
+                try:
+                    os.remove(tmp_file)
+                except OSError:
+                    pass
+                raise
+            self.mtime_ns = os.stat(self.file).st_mtime_ns
+            self.dirty = False
+
+    def _revalidate(self):
+        # 有未保存的修改时以内存为准
+        if self.dirty and self.config is not None:
+            return
+        mtime_ns = os.stat(self.file).st_mtime_ns
+        if self.config is None or mtime_ns != self.mtime_ns:
+            with open(self.file, 'r', encoding='utf-8') as f:
+                self.config = json.load(f)
+            self.mtime_ns = mtime_ns
+            if self._index_tasks():
+                self._mark_dirty()
+
+    def _index_tasks(self) -> bool:
+        """重建任务id到任务配置的映射，给没有id的任务(旧版本配置)补上id，有补充时返回True"""
+        self.tasks = {}
+        changed = False
+        for task in self.config.setdefault('tasks', []):
+            id = task.get('id')
+            if not id or id in self.tasks:
+                task['id'] = id = new_task_id()
+                changed = True
+            self.tasks[id] = task
+        return changed
+
+
+atexit.register(ConfigStore.flush_all)
+
+
+class ConfigManage():
+    # 未指定配置文件时使用的路径，默认为程序目录下的config.json
+    default_file = None
+    
+    def __init__(self, file: str=None) -> None:
+        file = file or ConfigManage.default_file
+        if not file:
+            exe_path = sys.executable if getattr(sys, 'frozen', False) else sys.argv[0]
+            dir_path = os.path.dirname(exe_path)
+            file = os.path.join(dir_path,'config.json')
+        self.file = file
+        self.store = ConfigStore.get(file)
+        self.init_config()
+            
+    def init_config(self):
+        if os.path.exists(self.file):
+            return
+        
+        config = {
+            "auto_start": False,
+            "show_task_col": ["name","root_path","pattern","recursive","days","size","number","trigger_args","status"],
+            "scan_workers": 1,
+            "delete_workers": 1,
+            "delete_batch_size": 100,
+            "index_file": "file_index.db",
+            "scheduler_workers": 10,
+            "process_workers": 0,
+            "history_file": "run_history.db",
+            "history_keep_days": 90,
+            "metrics_textfile": "",
+            "metrics_port": 0,
+            "metrics_addr": "127.0.0.1",
+            "report_sample_size": 1000,
+            "dry_run_log_files": False,
+            "sort_buffer": 100000,
+            "sort_tmp_dir": "",
+            "shared_scan_window": 1,
+            "tasks": []
+        }
+        self.store.write(config)
+
+    
+    def get_config(self, root_key: str=None):
+        return self.store.read(root_key)
+    
+    def get_task(self, id: str):
+        """按任务id获取任务配置，不存在时返回None"""
+        return self.store.get_task(id)
+    
+    def add_task(self,task: taskModel):
+        task_data = task.task_data()
+        error = check_task(task_data)
+        if error:
+            raise ValueError(error)
+        self.store.update(lambda config: config.get('tasks').append(task_data))
+    
+    def change_task(self,id,task: taskModel):
+        """修改任务配置，任务id和运行状态不变"""
+        task_data = task.task_data()
+        error = check_task(task_data)
+        if error:
+            raise ValueError(error)
+        def change(config: dict):
+            old_task: dict = self.store.tasks[id]
+            task_data['id'] = id
+            task_data['status'] = old_task.get('status',0)
+            old_task.clear()
+            old_task.update(task_data)
+        self.store.update(change)
+    
+    def del_task(self,id):
+        def delete(config: dict):
+            config.get('tasks').remove(self.store.tasks[id])
+        self.store.update(delete)
+    
+    def load_task_data(self,id):
+        task: dict = self.get_task(id)
+        task_model = taskModel(**task)
+        
+        return task_model
+    
+    def change_task_status(self,id,status):
+        def change(config: dict):
+            self.store.tasks[id]['status'] = status
+        self.store.update(change)
+    
+    def change_auto_start(self,status: bool=False):
+        """修改开机自启状态"""
+        def change(config: dict):
+            config['auto_start'] = status
+        self.store.update(change)
+    
+    def get_auto_start(self):
+        """获取开机自启状态"""
+        return self.get_config('auto_start') or False
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import tempfile
+import unittest
+
+from external_sort import ExternalSorter
+
+
+class ExternalSorterTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_in_memory(self):
+        with ExternalSorter(max_items=10, tmp_dir=self.tmp.name) as sorter:
+            for item in (3, 1, 2):
+                sorter.add(item)
+            self.assertEqual(list(sorter.sorted()), [1, 2, 3])
+            self.assertEqual(sorter.runs, [])
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_spill_and_merge(self):
+        items = [(random.Random(index).random(), f"path{index}") for index in range(50)]
+        with ExternalSorter(max_items=4, tmp_dir=self.tmp.name) as sorter:
+            for item in items:
+                sorter.add(item)
+            self.assertEqual(sorter.count, 50)
+            self.assertEqual(len(sorter.runs), 12)
+            self.assertEqual(len(os.listdir(self.tmp.name)), 1)
+            self.assertEqual(list(sorter.sorted()), sorted(items))
+        # 临时文件所在的目录在close()时删除
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_partial_read_then_close(self):
+        sorter = ExternalSorter(max_items=2, tmp_dir=self.tmp.name)
+        for item in range(10, 0, -1):
+            sorter.add(item)
+        merged = sorter.sorted()
+        self.assertEqual([next(merged), next(merged)], [1, 2])
+        sorter.close()
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import tempfile
+import unittest
+from unittest import mock
+
+from file_delete import FileDelete, DeleteResult, check_task
+from file_scan import FileRecord, FileScanner
+from trash import TRASH_PURGER
+
+
+class SelectionTest(unittest.TestCase):
+    """流式过滤的结果与原有的get_number_files、get_days_files逐个计算的结果一致"""
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.file_delete = FileDelete()
+        now = time.time()
+        self.dirs = [self.root, os.path.join(self.root, "a"), os.path.join(self.root, "b")]
+        for dir_index, dir_path in enumerate(self.dirs):
+            os.makedirs(dir_path, exist_ok=True)
+            for index in range(6):
+                path = os.path.join(dir_path, f"f{dir_index}_{index}.log")
+                with open(path, "wb") as f:
+                    # 每个目录中一半的文件为2M(稀疏文件)
+                    f.truncate(2 * 1024 * 1024 if index % 2 else 10)
+                # 修改时间互不相同，避开整天的边界
+                mtime = now - (index * 3 + dir_index + 0.5) * 86400
+                os.utime(path, (mtime, mtime))
+            open(os.path.join(dir_path, "skip.txt"), "w").close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def files(self, dir_path: str) -> list:
+        return [os.path.join(dir_path, name) for name in os.listdir(dir_path) if name.endswith(".log")]
+
+    def select(self, **kwargs) -> set:
+        task = {"root_path": self.root, "pattern": "*.log"}
+        task.update(kwargs)
+        return {record.path for record in self.file_delete.iter_candidates(task)}
+
+    def test_number(self):
+        _, old_files = self.file_delete.get_number_files(self.files(self.root), 2)
+        self.assertEqual(self.select(number=2), set(old_files))
+
+    def test_number_larger_than_files(self):
+        self.assertEqual(self.select(number=100), set())
+
+    def test_days(self):
+        self.assertEqual(self.select(days=7), set(self.file_delete.get_days_files(self.files(self.root), 7)))
+
+    def test_number_and_days(self):
+        files = self.files(self.root)
+        new_files, _ = self.file_delete.get_number_files(files, 4)
+        expected = set(self.file_delete.get_days_files(files, 4)) - set(new_files)
+        self.assertTrue(expected)
+        self.assertEqual(self.select(number=4, days=4), expected)
+
+    def test_number_and_size(self):
+        _, old_files = self.file_delete.get_number_files(self.files(self.root), 2)
+        expected = {path for path in old_files if os.path.getsize(path) >= 1024 * 1024}
+        self.assertTrue(expected)
+        self.assertEqual(self.select(number=2, size=1), expected)
+
+    def test_number_recursive(self):
+        files = [path for dir_path in self.dirs for path in self.files(dir_path)]
+        _, old_files = self.file_delete.get_number_files(files, 5)
+        self.assertEqual(self.select(pattern="**/*.log", recursive=True, number=5), set(old_files))
+
+    def test_number_per_dir(self):
+        expected = set()
+        for dir_path in self.dirs:
+            _, old_files = self.file_delete.get_number_files(self.files(dir_path), 2)
+            expected.update(old_files)
+        self.assertEqual(self.select(pattern="**/*.log", recursive=True, number=2, number_per_dir=True), expected)
+
+
+class QuotaTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "root")
+        self.sort_dir = os.path.join(self.tmp.name, "sort")
+        os.makedirs(self.root)
+        os.makedirs(self.sort_dir)
+        now = time.time()
+        # 10个1M的文件，f0最旧
+        self.paths = []
+        for index in range(10):
+            path = os.path.join(self.root, f"f{index}.log")
+            with open(path, "wb") as f:
+                f.truncate(1024 * 1024)
+            mtime = now - (10 - index) * 3600
+            os.utime(path, (mtime, mtime))
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_oldest_first_with_spill(self):
+        # 排序缓冲区只有3个，需要写临时文件再合并
+        file_delete = FileDelete(sort_buffer=3, sort_tmp_dir=self.sort_dir)
+        task = {"root_path": self.root, "pattern": "*.log", "quota": 6}
+        result = DeleteResult()
+        selected = [record.path for record in file_delete.iter_candidates(task, result)]
+        self.assertEqual(selected, self.paths[:4])
+        self.assertEqual(result.quota_excess, 4 * 1024 * 1024)
+        self.assertEqual(os.listdir(self.sort_dir), [])
+
+    def test_under_quota(self):
+        task = {"root_path": self.root, "pattern": "*.log", "quota": 10}
+        self.assertEqual(list(FileDelete(sort_buffer=3).iter_candidates(task)), [])
+
+    def test_shortfall_is_reported(self):
+        # 来自监听器的记录大小已变化，删除前校验时跳过，实际释放的空间少于需要释放的空间
+        source = [FileRecord(path, False, 1024 * 1024 if index else 1, os.stat(path).st_mtime, True)
+                  for index, path in enumerate(self.paths)]
+        task = {"root_path": self.root, "pattern": "*.log", "quota": 9}
+        with self.assertLogs("logger", "WARNING") as logs:
+            result = FileDelete().run(task, source=source)
+        self.assertEqual(result.deleted, 0)
+        self.assertTrue(any("还差" in line for line in logs.output))
+        self.assertTrue(os.path.exists(self.paths[0]))
+
+
+class PruneEmptyDirsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_file(self, *parts) -> str:
+        path = os.path.join(self.root, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "w").close()
+        return path
+
+    def run_task(self, **kwargs):
+        task = {"root_path": self.root, "pattern": "**/*.log", "recursive": True, "empty_dir": True}
+        task.update(kwargs)
+        return FileDelete().run(task)
+
+    def test_cascade_removes_emptied_parents(self):
+        self.make_file("a", "b", "c", "x.log")
+        self.make_file("a", "y.log")
+        self.make_file("d", "keep.txt")
+        result = self.run_task()
+        self.assertEqual(result.failed, 0)
+        self.assertEqual(result.dirs_deleted, 3)
+        self.assertEqual(sorted(os.listdir(self.root)), ["d"])
+
+    def test_cascade_stops_at_non_empty_dir(self):
+        self.make_file("a", "b", "x.log")
+        self.make_file("a", "keep.txt")
+        self.run_task()
+        self.assertEqual(os.listdir(os.path.join(self.root, "a")), ["keep.txt"])
+
+    def test_recursive_exclude_is_kept(self):
+        keep_dir = os.path.join(self.root, "x", "y", "keep", "a")
+        os.makedirs(keep_dir)
+        task = {"root_path": self.root, "pattern": "**/*.log", "recursive": True, "exclude": ["**/keep/**"]}
+        result = DeleteResult()
+        FileDelete().prune_empty_dirs(task, {keep_dir}, result)
+        # "**"在递归时匹配多层目录，x/y/keep/a被排除规则匹配，不删除
+        self.assertTrue(os.path.isdir(keep_dir))
+        self.assertEqual(result.dirs_deleted, 0)
+
+
+class FastDeleteRetentionTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "root")
+        self.trash_dir = os.path.join(self.tmp.name, "trash")
+        now = time.time()
+        # backup_0最旧，backup_4最新
+        self.names = [f"backup_{index}" for index in range(5)]
+        for index, name in enumerate(self.names):
+            path = os.path.join(self.root, name)
+            os.makedirs(path)
+            with open(os.path.join(path, "data.bin"), "wb") as f:
+                f.write(b"x" * 10)
+            mtime = now - (5 - index) * 86400
+            os.utime(path, (mtime, mtime))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def task(self, **kwargs) -> dict:
+        task = {"root_path": self.root, "pattern": "backup_*", "fast_delete": True}
+        task.update(kwargs)
+        return task
+
+    def test_number_keeps_newest_dirs(self):
+        with mock.patch("trash.trash_candidates", return_value=[self.trash_dir]):
+            result = FileDelete().run(self.task(number=2))
+        TRASH_PURGER.join()
+        self.assertEqual(result.matched, 3)
+        self.assertEqual(sorted(os.listdir(self.root)), ["backup_3", "backup_4"])
+
+    def test_days_uses_dir_mtime(self):
+        selected = [record.path for record in FileDelete().iter_candidates(self.task(days=3))]
+        self.assertEqual(sorted(os.path.basename(path) for path in selected), ["backup_0", "backup_1"])
+
+    def test_size_and_quota_rejected(self):
+        for kwargs in ({"size": 100}, {"quota": 1}, {"free_space": 1}):
+            self.assertTrue(check_task(self.task(**kwargs)))
+            with self.assertRaises(ValueError):
+                FileDelete().run(self.task(**kwargs), test=True)
+        self.assertEqual(sorted(os.listdir(self.root)), self.names)
+        self.assertFalse(check_task(self.task(number=2, days=1)))
+
+
+class FastDeleteScanTest(unittest.TestCase):
+    """快速删除时扫描不进入匹配的目录，扫描数只与匹配目录之外的条目数有关"""
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.dirs = [os.path.join(self.root, f"build_{index}") for index in range(3)]
+        self.dirs.append(os.path.join(self.root, "src", "build_3"))
+        for dir_path in self.dirs:
+            os.makedirs(os.path.join(dir_path, "build_nested"))
+            for index in range(400):
+                open(os.path.join(dir_path, f"f{index}.o"), "w").close()
+        self.task = {"root_path": self.root, "pattern": "**/build_*", "recursive": True, "fast_delete": True}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scanned_stays_small(self):
+        for workers in (1, 4):
+            with self.subTest(workers=workers):
+                result = DeleteResult()
+                selected = {record.path for record in FileDelete().iter_candidates(self.task, result, workers)}
+                self.assertEqual(selected, set(self.dirs))
+                # 根目录下的build_0~2和src，src下的build_3
+                self.assertEqual(result.scanned, 5)
+
+    def test_match_path_skips_selected_dirs(self):
+        scanner = FileScanner(self.root, "**/build_*", recursive=True, dir_prune=True)
+        self.assertTrue(scanner.match_path(self.dirs[0], True))
+        self.assertFalse(scanner.match_path(os.path.join(self.dirs[0], "build_nested"), True))
+        self.assertFalse(scanner.match_path(os.path.join(self.dirs[0], "f0.o")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import tempfile
+import unittest
+
+from file_watch import CandidateWatcher
+
+
+def wait_until(predicate, timeout: float=5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return predicate()
+
+
+class CandidateWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        os.makedirs(os.path.join(self.root, "sub"))
+        self.watcher = CandidateWatcher({"root_path": self.root, "pattern": "**/*.log", "recursive": True},
+                                        interval=0.2)
+
+    def tearDown(self):
+        self.watcher.stop()
+        self.tmp.cleanup()
+
+    def paths(self) -> set:
+        return {record.path for record in self.watcher.snapshot()}
+
+    def test_new_file_appears_in_snapshot(self):
+        self.watcher.start()
+        self.assertTrue(self.watcher.ready.wait(5))
+        path = os.path.join(self.root, "sub", "new.log")
+        with open(path, "w") as f:
+            f.write("x")
+        self.assertTrue(wait_until(lambda: path in self.paths()))
+        self.assertTrue(self.watcher.available())
+        os.remove(path)
+        self.assertTrue(wait_until(lambda: path not in self.paths()))
+
+    def test_unmatched_file_is_ignored(self):
+        self.watcher.start()
+        self.assertTrue(self.watcher.ready.wait(5))
+        matched = os.path.join(self.root, "b.log")
+        unmatched = os.path.join(self.root, "a.txt")
+        open(unmatched, "w").close()
+        open(matched, "w").close()
+        self.assertTrue(wait_until(lambda: matched in self.paths()))
+        self.assertNotIn(unmatched, self.paths())
+
+
+if __name__ == "__main__":
+    unittest.main()
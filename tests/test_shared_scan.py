@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import tempfile
+import threading
+import unittest
+
+from file_delete import FileDelete, DeleteResult
+from path_lock import PATH_LOCKS
+from shared_scan import SHARED_SCANS
+
+
+class SharedScanTest(unittest.TestCase):
+    """目录重叠的任务通过共享扫描得到的候选与各自单独扫描的结果一致"""
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.file_delete = FileDelete()
+        now = time.time()
+        for dir_name in ("", "sub", os.path.join("sub", "deep"), "other"):
+            dir_path = os.path.join(self.root, dir_name)
+            os.makedirs(dir_path, exist_ok=True)
+            for index in range(5):
+                for ext in (".log", ".tmp"):
+                    path = os.path.join(dir_path, f"f{index}{ext}")
+                    open(path, "w").close()
+                    mtime = now - (index * 2 + 0.5) * 86400
+                    os.utime(path, (mtime, mtime))
+        self.tasks = [
+            {"name": "all_logs", "root_path": self.root, "pattern": "*.log", "recursive": True, "days": 3},
+            {"name": "sub_tmp", "root_path": os.path.join(self.root, "sub"), "pattern": "*.tmp", "recursive": True},
+            {"name": "other_number", "root_path": os.path.join(self.root, "other"), "pattern": "*", "number": 4},
+        ]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_same_candidates(self):
+        expected = {task["name"]: {record.path for record in self.file_delete.iter_candidates(task)} for task in self.tasks}
+        results = {}
+        held = []
+
+        def run(task, source):
+            self.assertIsNotNone(source)
+            held.append(list(PATH_LOCKS.held))
+            result = DeleteResult()
+            paths = {record.path for record in self.file_delete.iter_candidates(task, result, source=source)}
+            results[task["name"]] = (paths, result.scanned)
+
+        threads = [threading.Thread(target=SHARED_SCANS.run, args=(task, 0.3, run), kwargs={"test": True})
+                   for task in self.tasks]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+        self.assertEqual(set(results), set(expected))
+        for name, (paths, scanned) in results.items():
+            self.assertTrue(expected[name])
+            self.assertEqual(paths, expected[name], name)
+            self.assertGreater(scanned, 0)
+        # 测试运行的组不锁目录
+        self.assertEqual(held, [[], [], []])
+        self.assertEqual(PATH_LOCKS.held, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from benchmark import STARTUP_MODULES, HEAVY_MODULES, STARTUP_BUDGET_MS, bench_startup
+
+
+class StartupTest(unittest.TestCase):
+    """命令行和定时任务的入口模块不加载图形界面、定时器等依赖，冷启动耗时不超过上限"""
+    def test_startup_modules(self):
+        self.assertEqual(set(STARTUP_MODULES), {"file_delete", "task_manage", "cli"})
+        self.assertTrue({"PyQt6", "apscheduler", "win32com", "sqlite3"} <= set(HEAVY_MODULES))
+        for module in STARTUP_MODULES:
+            with self.subTest(module=module):
+                result = bench_startup(module, repeat=5)
+                self.assertEqual(result["heavy"], [])
+                self.assertLessEqual(result["ms"], STARTUP_BUDGET_MS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+
+from task_manage import taskManager, ConfigManage
+
+
+class RunHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.default_file = ConfigManage.default_file
+        ConfigManage.default_file = os.path.join(self.tmp.name, "config.json")
+        ConfigManage()
+
+    def tearDown(self):
+        ConfigManage.default_file = self.default_file
+        self.tmp.cleanup()
+
+    def test_failed_run_is_recorded(self):
+        # 快速删除不能与大小条件同时使用，运行时抛出ValueError
+        task = {"id": "t1", "name": "T1", "root_path": self.tmp.name, "pattern": "*", "fast_delete": True, "size": 1}
+        with self.assertRaises(ValueError):
+            taskManager.start_delete_task(task)
+        with taskManager.open_history() as history:
+            runs = history.list_runs("t1")
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(runs[0]["errors"], 1)
+        self.assertIn("ValueError", runs[0]["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
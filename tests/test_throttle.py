@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import throttle as throttle_module
+from throttle import TokenBucket, Throttle
+from file_delete import FileDelete, DeleteResult
+from file_scan import FileRecord
+
+
+class FakeClock():
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TokenBucketTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(throttle_module.time, "monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst(self):
+        bucket = TokenBucket(10, burst=5)
+        for _ in range(5):
+            self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+
+    def test_refill_capped_by_burst(self):
+        bucket = TokenBucket(10, burst=5)
+        bucket.reserve(5)
+        self.clock.now += 100
+        self.assertEqual(bucket.reserve(5), 0.0)
+        self.assertAlmostEqual(bucket.reserve(1), 0.1)
+
+    def test_debt_larger_than_burst(self):
+        bucket = TokenBucket(100)
+        # 单次请求超过burst时欠账，等待时间为欠下的令牌数除以速度
+        self.assertAlmostEqual(bucket.reserve(300), 2.0)
+        self.clock.now += 1
+        self.assertAlmostEqual(bucket.reserve(50), 1.5)
+        self.clock.now += 1.5
+        self.assertEqual(bucket.reserve(0), 0.0)
+
+
+class ThrottleTest(unittest.TestCase):
+    def test_ops_rate(self):
+        throttle = Throttle(ops_per_sec=50)
+        start = time.monotonic()
+        for index in range(60):
+            throttle.wait(FileRecord(f"f{index}", False, 1))
+        elapsed = time.monotonic() - start
+        # 前50个令牌立即可用，剩余10个按每秒50个补充
+        self.assertGreaterEqual(elapsed, 0.15)
+        self.assertLess(elapsed, 2)
+        self.assertGreater(throttle.waited, 0)
+
+    def test_bytes_ignore_dirs(self):
+        throttle = Throttle(bytes_per_sec=1000)
+        with mock.patch.object(throttle.cancel_event, "wait") as wait:
+            throttle.wait(FileRecord("d", True, 10 ** 9))
+            throttle.wait(FileRecord("f", False, 500))
+            wait.assert_not_called()
+            throttle.wait(FileRecord("f", False, 1500))
+            self.assertAlmostEqual(wait.call_args[0][0], 1.0, places=1)
+
+    def test_cancel(self):
+        cancel_event = threading.Event()
+        throttle = Throttle(ops_per_sec=1, cancel_event=cancel_event)
+        throttle.wait(FileRecord("f", False))
+        threading.Timer(0.05, cancel_event.set).start()
+        start = time.monotonic()
+        # 本应等待1秒，取消后立即返回
+        throttle.wait(FileRecord("f", False))
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_prune_empty_dirs(self):
+        with tempfile.TemporaryDirectory() as root:
+            dirs = set()
+            for index in range(3):
+                dir_path = os.path.join(root, f"d{index}")
+                os.makedirs(dir_path)
+                dirs.add(dir_path)
+            throttle = Throttle(ops_per_sec=1000)
+            with mock.patch.object(throttle, "wait", wraps=throttle.wait) as wait:
+                result = DeleteResult()
+                FileDelete().prune_empty_dirs({"root_path": root}, dirs, result, throttle)
+            self.assertEqual(result.dirs_deleted, 3)
+            self.assertEqual(sorted(call[0][0].path for call in wait.call_args_list), sorted(dirs))
+            self.assertTrue(all(call[0][0].is_dir for call in wait.call_args_list))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+import threading
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger('logger')
+
+# Linux ioprio_set/ioprio_get的系统调用号
+_IOPRIO_SYSCALLS = {
+    "x86_64": (251, 252),
+    "amd64": (251, 252),
+    "i386": (289, 290),
+    "i686": (289, 290),
+    "aarch64": (30, 31),
+    "arm64": (30, 31),
+}
+_IOPRIO_WHO_PROCESS = 1
+_IOPRIO_CLASS_SHIFT = 13
+_IOPRIO_CLASS_IDLE = 3
+# Windows SetThreadPriority的后台模式，同时降低线程的IO优先级
+_THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+_THREAD_MODE_BACKGROUND_END = 0x00020000
+
+
+class TokenBucket():
+    """令牌桶，每秒补充rate个令牌，最多积累burst个
+
+    令牌不足时允许欠账，调用方等待欠下的令牌补齐，单次请求超过burst(如很大的文件)也不会一直阻塞
+    """
+    def __init__(self, rate: float, burst: float=None) -> None:
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else rate)
+        self.tokens = self.burst
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, amount: float=1) -> float:
+        """取出amount个令牌，返回需要等待的秒数"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            self.tokens -= amount
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+
+class Throttle():
+    """按任务限制删除速度：每秒删除的文件数和每秒释放的字节数，多个删除线程共用"""
+    def __init__(self, ops_per_sec: float=0, bytes_per_sec: float=0, cancel_event=None) -> None:
+        self.ops = TokenBucket(ops_per_sec) if ops_per_sec else None
+        self.bytes = TokenBucket(bytes_per_sec) if bytes_per_sec else None
+        self.cancel_event = cancel_event or threading.Event()
+        self.lock = threading.Lock()
+        self.waited = 0.0
+
+    def wait(self, record):
+        """删除记录前调用，超出速度时等待，取消时立即返回"""
+        delay = 0.0
+        if self.ops is not None:
+            delay = self.ops.reserve(1)
+        if self.bytes is not None and not record.is_dir and record.size:
+            delay = max(delay, self.bytes.reserve(record.size))
+        if delay > 0:
+            with self.lock:
+                self.waited += delay
+            self.cancel_event.wait(delay)
+
+
+def set_idle_io_priority() -> bool:
+    """把当前线程的IO调度设为最低优先级，Linux上为idle类，Windows上为后台模式；不支持时返回False"""
+    if sys.platform.startswith('linux'):
+        return _set_ioprio(_IOPRIO_CLASS_IDLE << _IOPRIO_CLASS_SHIFT) is not None
+    if sys.platform == 'win32':
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        return bool(kernel32.SetThreadPriority(kernel32.GetCurrentThread(), _THREAD_MODE_BACKGROUND_BEGIN))
+    return False
+
+
+@contextmanager
+def idle_io(enabled: bool=True):
+    """在with语句块中使用最低的IO优先级，结束后恢复，用于定时器等会复用的线程"""
+    if not enabled:
+        yield
+        return
+    old = None
+    if sys.platform.startswith('linux'):
+        old = _get_ioprio()
+    if not set_idle_io_priority():
+        logger.warning("当前系统不支持设置IO优先级")
+    try:
+        yield
+    finally:
+        if sys.platform.startswith('linux'):
+            if old is not None:
+                _set_ioprio(old)
+        elif sys.platform == 'win32':
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), _THREAD_MODE_BACKGROUND_END)
+
+
+def _ioprio_syscall(index: int, *args):
+    """调用ioprio_set(index=0)或ioprio_get(index=1)，which为0表示当前线程，失败时返回None"""
+    import ctypes
+    import ctypes.util
+    import platform
+    numbers = _IOPRIO_SYSCALLS.get(platform.machine().lower())
+    if numbers is None:
+        return None
+    libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    ret = libc.syscall(numbers[index], _IOPRIO_WHO_PROCESS, 0, *args)
+    if ret < 0:
+        logger.warning("ioprio系统调用失败: %s", os.strerror(ctypes.get_errno()))
+        return None
+    return ret
+
+
+def _set_ioprio(prio: int):
+    return _ioprio_syscall(0, prio)
+
+
+def _get_ioprio():
+    return _ioprio_syscall(1)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import stat
+import time
+import uuid
+import errno
+import queue
+import threading
+import logging
+
+logger = logging.getLogger('logger')
+
+# 回收目录名称，位于磁盘(挂载点)根目录或任务目录下
+TRASH_NAME = '.file_delete_trash'
+
+
+def volume_root(path: str) -> str:
+    """路径所在磁盘的挂载点：向上查找直到上级目录的st_dev不同"""
+    path = os.path.abspath(path)
+    dev = os.stat(path).st_dev
+    while True:
+        parent = os.path.dirname(path)
+        if parent == path:
+            return path
+        try:
+            if os.stat(parent).st_dev != dev:
+                return path
+        except OSError:
+            return path
+        path = parent
+
+
+def trash_candidates(root_path: str) -> list:
+    """任务可以使用的回收目录，优先使用挂载点下的，不可写时使用任务目录下的"""
+    candidates = []
+    try:
+        candidates.append(os.path.join(volume_root(root_path), TRASH_NAME))
+    except OSError:
+        pass
+    local = os.path.join(os.path.abspath(root_path), TRASH_NAME)
+    if local not in candidates:
+        candidates.append(local)
+    return candidates
+
+
+def purge_tree(path: str) -> tuple:
+    """自底向上删除目录树，边遍历边删除，同时打开的目录数等于目录深度，不跟随符号链接
+
+    Returns:
+        tuple: (删除的文件数, 释放的字节数, 失败数)
+    """
+    files = size = errors = 0
+    dirs = [path]
+    stack = [os.scandir(path)]
+    while stack:
+        entry = next(stack[-1], None)
+        if entry is None:
+            stack.pop().close()
+            dir_path = dirs.pop()
+            try:
+                os.rmdir(dir_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                errors += 1
+                logger.error("delete failed: %s, %s", dir_path, e)
+            continue
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(os.scandir(entry.path))
+                dirs.append(entry.path)
+                continue
+            st = entry.stat(follow_symlinks=False)
+            _unlink(entry.path, st)
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            errors += 1
+            logger.error("delete failed: %s, %s", entry.path, e)
+            continue
+        files += 1
+        size += st.st_size
+    return files, size, errors
+
+
+def _unlink(path: str, st: os.stat_result):
+    try:
+        os.unlink(path)
+    except PermissionError:
+        # Windows上只读文件不能直接删除
+        if st.st_mode & stat.S_IWRITE:
+            raise
+        os.chmod(path, stat.S_IWRITE)
+        os.unlink(path)
+
+
+class Trash():
+    """快速删除：把匹配的目录重命名到同一磁盘上的回收目录，由后台线程清理
+
+    重命名只修改目录项，任务可以立即返回；回收目录与原目录不在同一文件系统时直接删除
+    """
+    def __init__(self, root_path: str, purger: 'TrashPurger'=None) -> None:
+        self.root_path = root_path
+        self.candidates = trash_candidates(root_path)
+        self.purger = purger or TRASH_PURGER
+
+    def move(self, path: str):
+        """移动目录到回收目录，返回异常，成功时返回None"""
+        name = f'{time.strftime("%Y%m%d%H%M%S")}_{uuid.uuid4().hex[:8]}_{os.path.basename(path.rstrip(os.sep))}'
+        for trash_dir in self.candidates:
+            target = os.path.join(trash_dir, name)
+            try:
+                os.makedirs(trash_dir, exist_ok=True)
+                os.rename(path, target)
+            except OSError as e:
+                if e.errno in (errno.EXDEV, errno.EACCES, errno.EPERM, errno.EROFS):
+                    continue
+                return e
+            logger.info("Moved directory to trash: %s -> %s", path, target)
+            self.purger.submit(target)
+            return None
+        logger.warning("无法移动到回收目录，直接删除: %s", path)
+        _, _, errors = purge_tree(path)
+        return OSError(f"{errors}个文件或目录删除失败") if errors else None
+
+
+class TrashPurger():
+    """在后台线程中依次清理回收目录中的目录树"""
+    def __init__(self) -> None:
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def submit(self, path: str):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='trash_purge', daemon=True)
+                self.thread.start()
+        self.queue.put(path)
+
+    def purge_leftovers(self, root_paths: list):
+        """清理上次运行没有清理完的回收目录，程序启动时调用"""
+        trash_dirs = set()
+        for root_path in root_paths:
+            if root_path and os.path.isdir(root_path):
+                trash_dirs.update(trash_candidates(root_path))
+        for trash_dir in sorted(trash_dirs):
+            try:
+                names = os.listdir(trash_dir)
+            except OSError:
+                continue
+            for name in names:
+                self.submit(os.path.join(trash_dir, name))
+
+    def join(self):
+        """等待已提交的目录清理完成"""
+        self.queue.join()
+
+    def _run(self):
+        while True:
+            path = self.queue.get()
+            try:
+                start = time.perf_counter()
+                if os.path.isdir(path) and not os.path.islink(path):
+                    files, size, errors = purge_tree(path)
+                else:
+                    files, size, errors = 1, 0, 0
+                    os.unlink(path)
+                logger.info("回收目录已清理: %s, 删除文件%s个, 释放%s字节, 失败%s个, 耗时%.2f秒",
+                            path, files, size, errors, time.perf_counter() - start)
+            except FileNotFoundError:
+                pass
+            except Exception:
+                logger.exception("清理回收目录失败: %s", path)
+            finally:
+                self.queue.task_done()
+
+
+TRASH_PURGER = TrashPurger()